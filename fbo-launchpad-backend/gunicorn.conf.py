@@ -0,0 +1,108 @@
+"""
+Gunicorn settings: ``gunicorn -c gunicorn.conf.py "src.app:create_app()"``.
+
+Every setting can be overridden from the environment. With preload_app (the
+default unless GUNICORN_RELOAD is on) the master imports the app and loads
+the in-memory indexes once; workers are forked from it and share those pages
+copy-on-write. To keep them shared:
+
+* the garbage collector is off while the app loads and everything loaded is
+  then moved to the permanent generation (gc.freeze), so collections in the
+  workers do not write to (and thereby copy) the shared objects;
+* the master closes its database connections and stops its invalidation
+  listener before forking, and every worker drops the inherited connection
+  pool and starts its own listener.
+
+scripts/worker_memory.py measures per-worker memory with and without preload.
+"""
+import gc
+import multiprocessing
+import os
+import shutil
+
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', str(min(2 * multiprocessing.cpu_count() + 1, 8))))
+# More than one thread switches to the gthread worker; keep threads within the
+# per-worker connection pool (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+# The pool telemetry computes the connection budget from WEB_CONCURRENCY
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+# Development only: restart workers when code changes (cannot work with preload)
+reload = _env_bool('GUNICORN_RELOAD', False)
+preload_app = _env_bool('GUNICORN_PRELOAD', not reload)
+
+# Recycle workers now and then so slow leaks cannot grow without bound; the
+# jitter keeps them from all restarting at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# A worker silent for `timeout` seconds is killed; on shutdown or reload,
+# workers get `graceful_timeout` seconds to finish their requests
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Worker heartbeat files in memory rather than on the (possibly overlay) disk
+worker_tmp_dir = os.getenv('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+# Workers share their Prometheus metrics through files in this directory (see
+# src/utils/metrics.py). This file runs in the master before the app is imported.
+prometheus_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/fbo-launchpad-metrics')
+# It has to exist before the app is preloaded (prometheus_client opens its files
+# on import) and start empty, or a previous run's files would be added to this
+# run's totals. Only once per master: gunicorn reads this file again on SIGHUP,
+# when the master's own files are in use.
+if os.environ.get('FBO_METRICS_DIR_OWNER') != str(os.getpid()):
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir)
+    os.environ['FBO_METRICS_DIR_OWNER'] = str(os.getpid())
+
+from prometheus_client import multiprocess  # noqa: E402  (reads PROMETHEUS_MULTIPROC_DIR on import)
+
+if preload_app:
+    # No collections while the app loads; when_ready freezes what it allocated
+    gc.disable()
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from src.extensions import db
+    from src.utils.invalidation import invalidation_bus
+
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # Workers run their own listeners
+    invalidation_bus.stop()
+    gc.freeze()
+    gc.enable()
+    server.log.info(f"Preloaded the app; {gc.get_freeze_count()} objects frozen for the workers")
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from src.extensions import db
+    from src.utils.invalidation import invalidation_bus
+
+    app = server.app.wsgi()
+    with app.app_context():
+        # Connections are not safe to share between processes; leave the
+        # parent's sockets alone and open new ones on demand
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    invalidation_bus.ensure_started()
+
+
+def child_exit(server, worker):
+    # Drop the in-flight and checked-out gauges of the exited worker
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,46 @@
+"""Add full-text search index over fuel order notes, tail numbers and locations
+
+Revision ID: 3f9a1c2b7d10
+Revises: cd7344a46b7f
+Create Date: 2026-10-19 09:12:44.301245
+
+"""
+from alembic import op
+
+from src.models.fuel_order_search import (
+    POSTGRES_SEARCH_DDL,
+    POSTGRES_SEARCH_DROP_DDL,
+    SQLITE_SEARCH_DDL,
+    SQLITE_SEARCH_DROP_DDL,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2b7d10'
+down_revision = 'cd7344a46b7f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+    elif dialect == 'sqlite':
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        # Index rows that existed before the triggers were created
+        op.execute("INSERT INTO fuel_orders_fts(fuel_orders_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRES_SEARCH_DROP_DDL:
+            op.execute(statement)
+    elif dialect == 'sqlite':
+        for statement in ['DROP TRIGGER IF EXISTS fuel_orders_fts_ai',
+                          'DROP TRIGGER IF EXISTS fuel_orders_fts_ad',
+                          'DROP TRIGGER IF EXISTS fuel_orders_fts_au'] + SQLITE_SEARCH_DROP_DDL:
+            op.execute(statement)
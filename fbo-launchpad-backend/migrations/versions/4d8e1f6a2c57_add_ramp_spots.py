@@ -0,0 +1,59 @@
+"""Add ramp_spots, fuel_orders.ramp_spot_id and last known truck positions
+
+Revision ID: 4d8e1f6a2c57
+Revises: 9c4f2a7e1b36
+Create Date: 2026-10-19 18:12:44.390127
+
+On SQLite the fuel_orders.ramp_spot_id foreign key is not created, since
+adding one would mean rebuilding the table (and dropping its search triggers).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d8e1f6a2c57'
+down_revision = '9c4f2a7e1b36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ramp_spots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=20), nullable=False),
+    sa.Column('zone', sa.String(length=50), nullable=True),
+    sa.Column('x', sa.Float(), nullable=False),
+    sa.Column('y', sa.Float(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('code')
+    )
+    op.create_index(op.f('ix_ramp_spots_zone'), 'ramp_spots', ['zone'], unique=False)
+
+    op.add_column('fuel_orders', sa.Column('ramp_spot_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_fuel_orders_ramp_spot_id'), 'fuel_orders', ['ramp_spot_id'], unique=False)
+    if op.get_bind().dialect.name != 'sqlite':
+        op.create_foreign_key('fuel_orders_ramp_spot_id_fkey', 'fuel_orders', 'ramp_spots', ['ramp_spot_id'], ['id'])
+
+    op.add_column('fuel_trucks', sa.Column('last_x', sa.Float(), nullable=True))
+    op.add_column('fuel_trucks', sa.Column('last_y', sa.Float(), nullable=True))
+    op.add_column('fuel_trucks', sa.Column('position_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('fuel_trucks', schema=None) as batch_op:
+        batch_op.drop_column('position_updated_at')
+        batch_op.drop_column('last_y')
+        batch_op.drop_column('last_x')
+
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fuel_orders_ramp_spot_id_fkey', 'fuel_orders', type_='foreignkey')
+    op.drop_index(op.f('ix_fuel_orders_ramp_spot_id'), table_name='fuel_orders')
+    op.drop_column('fuel_orders', 'ramp_spot_id')
+
+    op.drop_index(op.f('ix_ramp_spots_zone'), table_name='ramp_spots')
+    op.drop_table('ramp_spots')
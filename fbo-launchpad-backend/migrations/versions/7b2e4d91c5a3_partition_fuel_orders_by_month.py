@@ -0,0 +1,102 @@
+"""Partition fuel_orders by month on created_at
+
+Revision ID: 7b2e4d91c5a3
+Revises: 3f9a1c2b7d10
+Create Date: 2026-10-19 14:03:27.518904
+
+On Postgres the existing table is rebuilt as a range-partitioned table with
+one partition per month covering the existing rows through
+DEFAULT_PARTITIONS_AHEAD months from now, plus a default partition. The
+primary key becomes (id, created_at). On SQLite only the created_at index is
+added.
+
+"""
+from alembic import op
+
+from src.models.fuel_order_partitioning import (
+    DEFAULT_PARTITIONS_AHEAD,
+    POSTGRES_DEFAULT_PARTITION_DDL,
+    POSTGRES_PARTITION_DROP_DDL,
+    POSTGRES_PARTITION_FUNCTION_DDL,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4d91c5a3'
+down_revision = '3f9a1c2b7d10'
+branch_labels = None
+depends_on = None
+
+# Stored columns of fuel_orders at this revision (search_vector is generated)
+COLUMNS = ', '.join([
+    'id', 'status', 'tail_number', 'customer_id', 'fuel_type', 'additive_requested',
+    'requested_amount', 'assigned_lst_user_id', 'assigned_truck_id', 'location_on_ramp',
+    'csr_notes', 'lst_notes', 'start_meter_reading', 'end_meter_reading', 'created_at',
+    'updated_at', 'dispatch_timestamp', 'acknowledge_timestamp', 'en_route_timestamp',
+    'fueling_start_timestamp', 'completion_timestamp', 'reviewed_timestamp',
+    'reviewed_by_csr_user_id',
+])
+
+FOREIGN_KEYS = [
+    ('fuel_orders_tail_number_fkey', 'tail_number', 'aircraft', 'tail_number'),
+    ('fuel_orders_customer_id_fkey', 'customer_id', 'customers', 'id'),
+    ('fuel_orders_assigned_lst_user_id_fkey', 'assigned_lst_user_id', 'users', 'id'),
+    ('fuel_orders_assigned_truck_id_fkey', 'assigned_truck_id', 'fuel_trucks', 'id'),
+    ('fuel_orders_reviewed_by_csr_user_id_fkey', 'reviewed_by_csr_user_id', 'users', 'id'),
+]
+
+INDEXES = [
+    ('ix_fuel_orders_assigned_lst_user_id', 'assigned_lst_user_id'),
+    ('ix_fuel_orders_assigned_truck_id', 'assigned_truck_id'),
+    ('ix_fuel_orders_status', 'status'),
+    ('ix_fuel_orders_tail_number', 'tail_number'),
+]
+
+
+def _rebuild(partitioned):
+    """Copy fuel_orders into a new (partitioned or plain) table and swap it in."""
+    op.execute("ALTER TABLE fuel_orders RENAME TO fuel_orders_old")
+    op.execute(
+        "CREATE TABLE fuel_orders (LIKE fuel_orders_old INCLUDING DEFAULTS INCLUDING GENERATED)"
+        + (" PARTITION BY RANGE (created_at)" if partitioned else "")
+    )
+    if partitioned:
+        op.execute(POSTGRES_PARTITION_FUNCTION_DDL)
+        op.execute(f"""
+            SELECT fuel_orders_ensure_partition(month)
+            FROM generate_series(
+                date_trunc('month', coalesce((SELECT min(created_at) FROM fuel_orders_old), now() AT TIME ZONE 'utc')),
+                date_trunc('month', now() AT TIME ZONE 'utc') + interval '{DEFAULT_PARTITIONS_AHEAD} months',
+                interval '1 month'
+            ) AS month
+        """)
+        op.execute(POSTGRES_DEFAULT_PARTITION_DDL)
+    op.execute(f"INSERT INTO fuel_orders ({COLUMNS}) SELECT {COLUMNS} FROM fuel_orders_old")
+    op.execute("ALTER SEQUENCE fuel_orders_id_seq OWNED BY fuel_orders.id")
+    op.execute("DROP TABLE fuel_orders_old")
+
+    op.execute(
+        "ALTER TABLE fuel_orders ADD CONSTRAINT fuel_orders_pkey PRIMARY KEY "
+        + ("(id, created_at)" if partitioned else "(id)")
+    )
+    for name, column, referred_table, referred_column in FOREIGN_KEYS:
+        op.create_foreign_key(name, 'fuel_orders', referred_table, [column], [referred_column])
+    for name, column in INDEXES:
+        op.create_index(name, 'fuel_orders', [column], unique=False)
+    op.execute("CREATE INDEX ix_fuel_orders_search_vector ON fuel_orders USING GIN (search_vector)")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        _rebuild(partitioned=True)
+    op.create_index('ix_fuel_orders_created_at', 'fuel_orders', ['created_at'], unique=False)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    op.drop_index('ix_fuel_orders_created_at', table_name='fuel_orders')
+    if dialect == 'postgresql':
+        _rebuild(partitioned=False)
+        for statement in POSTGRES_PARTITION_DROP_DDL:
+            op.execute(statement)
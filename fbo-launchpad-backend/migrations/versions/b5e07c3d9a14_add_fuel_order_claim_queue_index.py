@@ -0,0 +1,35 @@
+"""Add partial index for the fuel order claim queue
+
+Revision ID: b5e07c3d9a14
+Revises: 4d8e1f6a2c57
+Create Date: 2026-10-19 19:03:27.518204
+
+Covers unassigned DISPATCHED orders in created_at order, so claim-next reads
+the oldest waiting order without scanning assigned or finished ones. On
+Postgres the index is created on the partitioned parent and cascades to
+every monthly partition.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e07c3d9a14'
+down_revision = '4d8e1f6a2c57'
+branch_labels = None
+depends_on = None
+
+CLAIM_QUEUE_PREDICATE = "status = 'DISPATCHED' AND assigned_lst_user_id IS NULL"
+
+
+def upgrade():
+    op.create_index(
+        'ix_fuel_orders_claim_queue', 'fuel_orders', ['created_at', 'id'], unique=False,
+        postgresql_where=sa.text(CLAIM_QUEUE_PREDICATE),
+        sqlite_where=sa.text(CLAIM_QUEUE_PREDICATE)
+    )
+
+
+def downgrade():
+    op.drop_index('ix_fuel_orders_claim_queue', table_name='fuel_orders')
@@ -0,0 +1,42 @@
+"""Add lst_shifts roster table
+
+Revision ID: e2a6d0f4b871
+Revises: b5e07c3d9a14
+Create Date: 2026-10-19 19:48:52.061735
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6d0f4b871'
+down_revision = 'b5e07c3d9a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('lst_shifts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('breaks', sa.JSON(), nullable=False),
+    sa.Column('notes', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('lst_shifts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_lst_shifts_end_time'), ['end_time'], unique=False)
+        batch_op.create_index('ix_lst_shifts_user_id_start_time', ['user_id', 'start_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('lst_shifts', schema=None) as batch_op:
+        batch_op.drop_index('ix_lst_shifts_user_id_start_time')
+        batch_op.drop_index(batch_op.f('ix_lst_shifts_end_time'))
+
+    op.drop_table('lst_shifts')
@@ -0,0 +1,30 @@
+"""Add lower(username) and lower(email) indexes for user prefix search
+
+Revision ID: f71c3b9e5d20
+Revises: e2a6d0f4b871
+Create Date: 2026-10-19 20:27:13.804115
+
+On Postgres the indexes use text_pattern_ops so LIKE 'prefix%' can use them
+whatever the database collation.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f71c3b9e5d20'
+down_revision = 'e2a6d0f4b871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    ops = ' text_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    op.create_index('ix_users_username_lower', 'users', [sa.text(f'lower(username){ops}')], unique=False)
+    op.create_index('ix_users_email_lower', 'users', [sa.text(f'lower(email){ops}')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.drop_index('ix_users_username_lower', table_name='users')
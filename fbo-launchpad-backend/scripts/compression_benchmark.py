@@ -0,0 +1,98 @@
+"""
+Compare the CPU cost and the bytes saved of response compression settings on
+fuel order list pages.
+
+    python scripts/compression_benchmark.py [--per-page 20 50 100] [--repeat 50]
+
+Fetches ``GET /api/fuel-orders`` pages through the app's test client as a
+System Administrator (or --user), uncompressed, then compresses each body
+with gzip and brotli at several levels and prints, per page size and
+setting: the compressed size, the share of bytes saved, the median time to
+compress one page and the transfer time saved on a 10 Mbit/s link (a ramp
+tablet on Wi-Fi or LTE). COMPRESS_GZIP_LEVEL and COMPRESS_BROTLI_QUALITY are
+the settings the app uses.
+
+The app config comes from the environment as usual (FLASK_ENV,
+SQLALCHEMY_DATABASE_URI, ...); the database should hold a realistic number
+of orders.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from src.app import create_app  # noqa: E402
+from src.models import Role, User  # noqa: E402
+from src.utils.compression import Compression, available_algorithms  # noqa: E402
+
+SETTINGS = [('gzip', 1), ('gzip', 6), ('gzip', 9), ('br', 1), ('br', 4), ('br', 6), ('br', 11)]
+LINK_BYTES_PER_SECOND = 10_000_000 / 8
+
+
+def _fetch_pages(app, username, per_page, pages):
+    with app.app_context():
+        query = User.query.filter_by(username=username) if username else \
+            User.query.filter(User.roles.any(Role.name == 'System Administrator'))
+        user = query.first()
+        if user is None:
+            sys.exit('No such user; pass --user')
+        token = create_access_token(identity=str(user.id))
+    client = app.test_client()
+    bodies = []
+    for page in range(1, pages + 1):
+        response = client.get(f'/api/fuel-orders?page={page}&per_page={per_page}',
+                              headers={'Authorization': f'Bearer {token}', 'Accept-Encoding': 'identity'})
+        if response.status_code != 200:
+            sys.exit(f'GET /api/fuel-orders returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+        if not response.get_json().get('orders'):
+            break
+        bodies.append(response.get_data())
+    return bodies
+
+
+def _measure(compressor, algorithm, bodies, repeat):
+    size = sum(len(compressor.compress(body, algorithm)) for body in bodies) / len(bodies)
+    timings = []
+    for _ in range(repeat):
+        for body in bodies:
+            started = time.perf_counter()
+            compressor.compress(body, algorithm)
+            timings.append(time.perf_counter() - started)
+    return size, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--per-page', type=int, nargs='+', default=[20, 50, 100])
+    parser.add_argument('--pages', type=int, default=5, help='pages fetched per page size')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--user', help='username to fetch the pages as')
+    args = parser.parse_args()
+
+    app = create_app()
+    print(f"{'per_page':>8} {'setting':>8} {'bytes':>9} {'saved':>7} {'cpu ms':>8} {'10Mbit ms saved':>16}")
+    for per_page in args.per_page:
+        bodies = _fetch_pages(app, args.user, per_page, args.pages)
+        if not bodies:
+            sys.exit('No fuel orders to page through')
+        raw = sum(len(body) for body in bodies) / len(bodies)
+        print(f"{per_page:>8} {'identity':>8} {raw:>9.0f} {'':>7} {'':>8} {'':>16}")
+        for algorithm, level in SETTINGS:
+            if algorithm not in available_algorithms():
+                continue
+            compressor = Compression()
+            compressor.gzip_level = compressor.brotli_quality = level
+            size, seconds = _measure(compressor, algorithm, bodies, args.repeat)
+            saved_ms = (raw - size) / LINK_BYTES_PER_SECOND * 1000
+            print(f"{per_page:>8} {f'{algorithm}-{level}':>8} {size:>9.0f} {1 - size / raw:>7.1%} "
+                  f"{seconds * 1000:>8.3f} {saved_ms:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure the memory of gunicorn workers with and without preload_app.
+
+    python scripts/worker_memory.py [--workers 4] [--requests 200]
+
+Starts gunicorn with gunicorn.conf.py twice (GUNICORN_PRELOAD=false, then
+true), sends some requests to warm the workers up, and prints per-worker
+memory from /proc/<pid>/smaps_rollup (Linux only):
+
+* RSS counts every resident page, shared or not, so it hardly changes;
+* PSS splits shared pages between the processes sharing them;
+* private (USS) is what each worker adds on its own, i.e. what a further
+  worker costs.
+
+The app config comes from the environment as usual (FLASK_ENV,
+SQLALCHEMY_DATABASE_URI, ...).
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'private', 'Private_Dirty': 'private'}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _memory_kb(pid: int) -> dict:
+    usage = {'rss': 0, 'pss': 0, 'private': 0}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in FIELDS:
+                usage[FIELDS[key]] += int(rest.split()[0])
+    return usage
+
+
+def _children(pid: int) -> list:
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(p) for p in f.read().split()]
+
+
+def measure(preload: bool, workers: int, requests: int) -> list:
+    port = _free_port()
+    env = dict(os.environ, GUNICORN_PRELOAD=str(preload).lower(), WEB_CONCURRENCY=str(workers),
+               GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_LOG_LEVEL='warning')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'src.app:create_app()'],
+                              cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1).read()
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.2)
+        for path in ['/health', '/api/swagger.json'] * (requests // 2):
+            urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=5).read()
+        time.sleep(0.5)
+        return [_memory_kb(pid) for pid in _children(server.pid)]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'preload':<8} {'worker':>6} {'RSS MiB':>9} {'PSS MiB':>9} {'private MiB':>12}")
+    for preload in (False, True):
+        usages = measure(preload, args.workers, args.requests)
+        for i, usage in enumerate(usages):
+            print(f"{str(preload):<8} {i:>6} {usage['rss'] / 1024:>9.1f} {usage['pss'] / 1024:>9.1f} "
+                  f"{usage['private'] / 1024:>12.1f}")
+        n = len(usages) or 1
+        print(f"{str(preload):<8} {'mean':>6} {sum(u['rss'] for u in usages) / n / 1024:>9.1f} "
+              f"{sum(u['pss'] for u in usages) / n / 1024:>9.1f} "
+              f"{sum(u['private'] for u in usages) / n / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,5 +13,6 @@ setup(
         "apispec",
         "apispec-webframeworks",
         "marshmallow",
+        "prometheus-client",
     ],
 ) 
\ No newline at end of file
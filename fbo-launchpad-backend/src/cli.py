@@ -48,7 +48,147 @@ def run_seed():
     seed_data()
     click.echo("Database seeding process finished.")
 
+@click.group()
+def orders_cli():
+    """Fuel order maintenance commands."""
+    pass
+
+@orders_cli.command('ensure-partitions')
+@click.option('--months-ahead', type=int, default=None,
+              help='Months to create ahead of the current one (default: FUEL_ORDER_PARTITIONS_AHEAD).')
+@with_appcontext
+def ensure_partitions_command(months_ahead):
+    """Create upcoming monthly fuel_orders partitions (Postgres only). Safe to run from cron."""
+    from datetime import datetime
+    from flask import current_app
+    from .models.fuel_order_partitioning import ensure_partitions
+
+    if months_ahead is None:
+        months_ahead = current_app.config.get('FUEL_ORDER_PARTITIONS_AHEAD', 3)
+    with db.engine.begin() as connection:
+        names = ensure_partitions(connection, datetime.utcnow(), months_ahead)
+    if not names:
+        click.echo("Database does not use partitioning; nothing to do.")
+        return
+    click.echo(f"Partitions ensured: {', '.join(names)}")
+
+def _parse_age(value):
+    """Parse an age such as '180d', '26w' or '180' (days) into a timedelta."""
+    import re
+    from datetime import timedelta
+
+    match = re.fullmatch(r'(\d+)([dw]?)', value.strip().lower())
+    if not match:
+        raise click.BadParameter(f"'{value}' is not an age like 180d or 26w.")
+    amount, unit = int(match.group(1)), match.group(2)
+    return timedelta(weeks=amount) if unit == 'w' else timedelta(days=amount)
+
+def _archive_dir(archive_dir):
+    import os
+    from flask import current_app
+
+    return archive_dir or current_app.config.get('FUEL_ORDER_ARCHIVE_DIR') or \
+        os.path.join(current_app.instance_path, 'archive')
+
+@orders_cli.command('archive')
+@click.option('--older-than', required=True, help='Archive REVIEWED orders created longer ago than this, e.g. 180d.')
+@click.option('--archive-dir', default=None, help='Archive root directory (default: FUEL_ORDER_ARCHIVE_DIR).')
+@click.option('--chunk-size', type=int, default=1000, show_default=True, help='Rows read per query.')
+@click.option('--batch-size', type=int, default=500, show_default=True, help='Rows deleted per transaction.')
+@click.option('--pause', type=float, default=0.0, show_default=True, help='Seconds to sleep between delete batches.')
+@click.option('--dry-run', is_flag=True, help='Only report how many orders would be archived.')
+@with_appcontext
+def archive_orders_command(older_than, archive_dir, chunk_size, batch_size, pause, dry_run):
+    """Move old REVIEWED orders into compressed monthly archive files."""
+    from datetime import datetime
+    from .services.fuel_order_archive_service import FuelOrderArchiveService
+
+    cutoff = datetime.utcnow() - _parse_age(older_than)
+    summary, message, status_code = FuelOrderArchiveService.archive_orders(
+        cutoff, _archive_dir(archive_dir), chunk_size=chunk_size, batch_size=batch_size,
+        pause=pause, dry_run=dry_run
+    )
+    if status_code != 200:
+        raise click.ClickException(message)
+    for name in summary['files']:
+        click.echo(f"  {name}")
+    click.echo(message)
+
+@orders_cli.command('restore')
+@click.option('--from', 'date_from', required=True, type=click.DateTime(), help='Restore orders created on or after this date.')
+@click.option('--to', 'date_to', required=True, type=click.DateTime(), help='Restore orders created before this date.')
+@click.option('--archive-dir', default=None, help='Archive root directory (default: FUEL_ORDER_ARCHIVE_DIR).')
+@click.option('--batch-size', type=int, default=500, show_default=True, help='Rows inserted per transaction.')
+@with_appcontext
+def restore_orders_command(date_from, date_to, archive_dir, batch_size):
+    """Re-insert archived orders created in a date range. Already present orders are skipped."""
+    from .services.fuel_order_archive_service import FuelOrderArchiveService
+
+    summary, message, status_code = FuelOrderArchiveService.restore_orders(
+        date_from, date_to, _archive_dir(archive_dir), batch_size=batch_size
+    )
+    if status_code != 200:
+        raise click.ClickException(message)
+    if summary['skipped']:
+        click.echo(f"Skipped {summary['skipped']} orders that are already present.")
+    click.echo(message)
+
+@orders_cli.command('purge-idempotency-keys')
+@with_appcontext
+def purge_idempotency_keys_command():
+    """Delete expired Idempotency-Key records."""
+    from .utils.idempotency import purge_expired_idempotency_keys
+
+    click.echo(f"Deleted {purge_expired_idempotency_keys()} expired idempotency keys.")
+
+@click.group()
+def ramp_cli():
+    """Ramp spot map commands."""
+    pass
+
+@ramp_cli.command('import-spots')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--deactivate-missing', is_flag=True, help='Deactivate active spots that are not in the file.')
+@click.option('--dry-run', is_flag=True, help='Validate the file and report changes without writing them.')
+@with_appcontext
+def import_spots_command(path, deactivate_missing, dry_run):
+    """Create or update ramp spots from a CSV (code,x,y,zone) or JSON spot map."""
+    from .services.ramp_spot_service import RampSpotService
+
+    try:
+        rows = RampSpotService.read_spot_map(path)
+    except (ValueError, OSError) as e:
+        raise click.ClickException(str(e))
+    summary, message, status_code = RampSpotService.import_spots(
+        rows, deactivate_missing=deactivate_missing, dry_run=dry_run
+    )
+    if status_code != 200:
+        raise click.ClickException(message)
+    click.echo(', '.join(f"{key}: {value}" for key, value in summary.items()))
+    click.echo(message)
+
+@click.group()
+def openapi_cli():
+    """OpenAPI document commands."""
+    pass
+
+@openapi_cli.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@with_appcontext
+def export_openapi_command(path):
+    """Write the OpenAPI document to PATH (serve it by setting OPENAPI_SPEC_PATH)."""
+    from flask import current_app
+    from .openapi import serialize_spec
+
+    body = serialize_spec(current_app)
+    with open(path, 'wb') as f:
+        f.write(body)
+    click.echo(f"Wrote {len(body)} bytes to {path}.")
+
 def init_app(app):
     """Register CLI commands."""
     app.cli.add_command(create_admin)
-    app.cli.add_command(seed_cli, name='seed') 
\ No newline at end of file
+    app.cli.add_command(seed_cli, name='seed')
+    app.cli.add_command(orders_cli, name='orders')
+    app.cli.add_command(ramp_cli, name='ramp')
+    app.cli.add_command(openapi_cli, name='openapi') 
\ No newline at end of file
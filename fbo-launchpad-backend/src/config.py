@@ -22,10 +22,103 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('SQLALCHEMY_DATABASE_URI')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'False').lower() == 'true'
+    # Connection pool per worker process, turned into SQLALCHEMY_ENGINE_OPTIONS by
+    # src/utils/db_pool.py. Keep workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) per host
+    # within what the database (or PgBouncer) accepts.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '10'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))
+    # PgBouncer in transaction pooling mode: no pooling or session state in the app
+    DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() == 'true'
+    # Checkouts waiting at least this long are counted as slow in the pool stats
+    DB_POOL_SLOW_WAIT_MS = int(os.getenv('DB_POOL_SLOW_WAIT_MS', '50'))
 
     # Application specific
     APP_NAME = os.getenv('APP_NAME', 'FBO LaunchPad')
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+    # Log every registered route at startup (debugging aid)
+    LOG_URL_MAP = os.getenv('LOG_URL_MAP', 'False').lower() == 'true'
+    # Pre-built OpenAPI document (`flask openapi export`); built on first request when unset
+    OPENAPI_SPEC_PATH = os.getenv('OPENAPI_SPEC_PATH')
+
+    # Read replica: GET requests and read-only services read from it while its lag
+    # is at most REPLICA_MAX_LAG_SECONDS (see src/utils/db_routing.py). A user's
+    # reads stay on the primary for REPLICA_READ_YOUR_WRITES_SECONDS after a write;
+    # keep that above REPLICA_MAX_LAG_SECONDS + REPLICA_LAG_CHECK_SECONDS.
+    SQLALCHEMY_BINDS = {'replica': os.environ['REPLICA_DATABASE_URL']} if os.getenv('REPLICA_DATABASE_URL') else {}
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5'))
+    REPLICA_LAG_CHECK_SECONDS = float(os.getenv('REPLICA_LAG_CHECK_SECONDS', '1'))
+    REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv('REPLICA_READ_YOUR_WRITES_SECONDS', '10'))
+    # An unreachable or stuck replica fails within these and reads fall back to the primary
+    REPLICA_CONNECT_TIMEOUT_SECONDS = int(os.getenv('REPLICA_CONNECT_TIMEOUT_SECONDS', '2'))
+    REPLICA_STATEMENT_TIMEOUT_MS = int(os.getenv('REPLICA_STATEMENT_TIMEOUT_MS', '10000'))
+
+    # Per-request SQL instrumentation (see src/utils/query_stats.py): X-DB-Queries and
+    # Server-Timing response headers, the slow query log and N+1 warnings
+    SQL_QUERY_HEADERS = os.getenv('SQL_QUERY_HEADERS', 'True').lower() == 'true'
+    SQL_SLOW_QUERY_MS = float(os.getenv('SQL_SLOW_QUERY_MS', '200'))
+    # Warn when one statement shape runs this many times in a request (0 disables)
+    SQL_REPEATED_QUERY_THRESHOLD = int(os.getenv('SQL_REPEATED_QUERY_THRESHOLD', '5'))
+
+    # GET /metrics (see src/utils/metrics.py) requires `Authorization: Bearer <token>`
+    # when this is set. Without it the endpoint is open and must only be reachable
+    # from the internal network (block /metrics at the proxy).
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+    # Response compression (see src/utils/compression.py). Algorithms in order of
+    # preference; 'br' needs the Brotli package and is skipped without it.
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_ALGORITHMS = [a.strip() for a in os.getenv('COMPRESS_ALGORITHMS', 'br,gzip').split(',') if a.strip()]
+    COMPRESS_MIMETYPES = [m.strip() for m in os.getenv(
+        'COMPRESS_MIMETYPES', 'application/json,text/csv,text/plain,text/html').split(',') if m.strip()]
+    # Complete bodies smaller than this are sent as they are
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    # Levels measured with scripts/compression_benchmark.py
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+
+    # Fuel orders: lists and counts leave out completed, reviewed and cancelled
+    # orders older than this unless a date range or window=all is given; open
+    # orders are always included
+    FUEL_ORDER_ACTIVE_WINDOW_DAYS = int(os.getenv('FUEL_ORDER_ACTIVE_WINDOW_DAYS', '90'))
+    # Monthly fuel_orders partitions to keep created ahead of the current month
+    FUEL_ORDER_PARTITIONS_AHEAD = int(os.getenv('FUEL_ORDER_PARTITIONS_AHEAD', '3'))
+    # Where `flask orders archive` writes archived orders (default: <instance>/archive)
+    FUEL_ORDER_ARCHIVE_DIR = os.getenv('FUEL_ORDER_ARCHIVE_DIR')
+
+    # Idempotency-Key support on mutating fuel order endpoints
+    IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_KEY_TTL_SECONDS', str(24 * 60 * 60)))
+    # Responses kept in each worker's in-process LRU in front of the table
+    IDEMPOTENCY_CACHE_SIZE = int(os.getenv('IDEMPOTENCY_CACHE_SIZE', '1024'))
+    # How long a retry waits for the original request running in the same worker
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', '10'))
+    # An in-progress key older than this is assumed abandoned (worker died) and can be taken over
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT_SECONDS', '60'))
+
+    # Effective permissions are cached per worker process; other workers see a
+    # role/permission change once their entry is this old
+    PERMISSION_CACHE_TTL_SECONDS = int(os.getenv('PERMISSION_CACHE_TTL_SECONDS', '60'))
+
+    # Serialized truck, aircraft, customer, permission and role lists (see
+    # src/utils/reference_cache.py); changes are picked up through the invalidation
+    # bus, the TTL only bounds staleness when an event is lost
+    REFERENCE_LIST_CACHE_TTL_SECONDS = int(os.getenv('REFERENCE_LIST_CACHE_TTL_SECONDS', '300'))
+    REFERENCE_LIST_CACHE_MAX_ENTRIES = int(os.getenv('REFERENCE_LIST_CACHE_MAX_ENTRIES', '256'))
+
+    # Cross-worker cache invalidation (see src/utils/invalidation.py):
+    # 'local' (single worker), 'ipc' (unix sockets, one host) or 'postgres' (LISTEN/NOTIFY)
+    INVALIDATION_BACKEND = os.getenv('INVALIDATION_BACKEND', 'local')
+    INVALIDATION_IPC_DIR = os.getenv('INVALIDATION_IPC_DIR', '/tmp/fbo-launchpad-invalidation')
+    INVALIDATION_CHANNEL = os.getenv('INVALIDATION_CHANNEL', 'fbo_cache_invalidation')
+    # Direct (non-PgBouncer) connection for LISTEN; defaults to the app database
+    INVALIDATION_DATABASE_URL = os.getenv('INVALIDATION_DATABASE_URL')
+
+    # Dispatch optimizer: an LST is never planned more active orders than this
+    DISPATCH_MAX_ACTIVE_ORDERS_PER_LST = int(os.getenv('DISPATCH_MAX_ACTIVE_ORDERS_PER_LST', '8'))
 
     @staticmethod
     def init_app(app):
@@ -34,6 +127,11 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
+    # Single-process dev server
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '2'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '3'))
+    # Leave long-running queries alone while debugging
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '0'))
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URL') or \
         'postgresql://fbo_user:fbo_password@db:5432/fbo_launchpad_dev'
 
@@ -42,6 +140,10 @@ class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'postgresql://fbo_user:fbo_password@db:5432/fbo_launchpad'
+    # Production runs several gunicorn workers
+    INVALIDATION_BACKEND = os.getenv('INVALIDATION_BACKEND', 'postgres')
+    # Query counts and timings are not for clients
+    SQL_QUERY_HEADERS = os.getenv('SQL_QUERY_HEADERS', 'False').lower() == 'true'
 
 class TestingConfig(Config):
     """Testing configuration."""
@@ -51,6 +153,9 @@ class TestingConfig(Config):
         'postgresql://fbo_user:fbo_password@db:5432/fbo_launchpad_test'
     # Keep test output clean
     SQLALCHEMY_ECHO = False
+    # The test database is local and fresh; no need to ping connections
+    DB_POOL_PRE_PING = False
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '10000'))
     # Disable CSRF for testing if using Flask-WTF
     WTF_CSRF_ENABLED = False
     # Disable error catching during request handling
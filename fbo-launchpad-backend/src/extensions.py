@@ -4,8 +4,11 @@ from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 from flask_jwt_extended import JWTManager
 
+from .utils.db_routing import RoutingSession
+
 # Database
-db = SQLAlchemy()
+# Sends eligible reads to the read replica bind when one is configured
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 
@@ -6,7 +6,12 @@ from .user import User, UserRole
 from .aircraft import Aircraft
 from .customer import Customer
 from .fuel_truck import FuelTruck
+from .ramp_spot import RampSpot
 from .fuel_order import FuelOrder, FuelOrderStatus
+from .idempotency_key import IdempotencyKey
+from .lst_shift import LSTShift
+from . import fuel_order_search  # registers full-text search DDL on fuel_orders
+from . import fuel_order_partitioning  # registers monthly partitioning of fuel_orders
 
 __all__ = [
     'Base',
@@ -19,6 +24,9 @@ __all__ = [
     'Aircraft',
     'Customer',
     'FuelTruck',
+    'RampSpot',
     'FuelOrder',
-    'FuelOrderStatus'
+    'FuelOrderStatus',
+    'IdempotencyKey',
+    'LSTShift'
 ]
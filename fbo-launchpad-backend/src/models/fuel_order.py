@@ -15,6 +15,16 @@ class FuelOrderStatus(enum.Enum):
 
 class FuelOrder(db.Model):
     __tablename__ = 'fuel_orders'
+    # Monthly range partitions on Postgres, plain table elsewhere (see fuel_order_partitioning.py)
+    __table_args__ = (
+        # Claim queue: unassigned dispatched orders, oldest first (FuelOrderService.claim_next_order)
+        db.Index(
+            'ix_fuel_orders_claim_queue', 'created_at', 'id',
+            postgresql_where=db.text("status = 'DISPATCHED' AND assigned_lst_user_id IS NULL"),
+            sqlite_where=db.text("status = 'DISPATCHED' AND assigned_lst_user_id IS NULL")
+        ),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
 
     # Primary Key
     id = db.Column(db.Integer, primary_key=True)
@@ -31,6 +41,7 @@ class FuelOrder(db.Model):
     assigned_lst_user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     assigned_truck_id = db.Column(db.Integer, db.ForeignKey('fuel_trucks.id'), nullable=True, index=True)
     location_on_ramp = db.Column(db.String(100), nullable=True)
+    ramp_spot_id = db.Column(db.Integer, db.ForeignKey('ramp_spots.id'), nullable=True, index=True)
     
     # Notes Fields
     csr_notes = db.Column(db.Text, nullable=True)
@@ -41,7 +52,7 @@ class FuelOrder(db.Model):
     end_meter_reading = db.Column(db.Numeric(12, 2), nullable=True)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     dispatch_timestamp = db.Column(db.DateTime, nullable=True)
     acknowledge_timestamp = db.Column(db.DateTime, nullable=True)
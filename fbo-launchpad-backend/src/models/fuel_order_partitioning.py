@@ -0,0 +1,168 @@
+"""
+Monthly range partitioning of fuel orders on ``created_at``.
+
+Postgres: ``fuel_orders`` is declared ``PARTITION BY RANGE (created_at)`` with
+one partition per month (``fuel_orders_pYYYY_MM``) plus a default partition as
+a safety net. Partitions are created by the ``fuel_orders_ensure_partition``
+SQL function, which is called:
+
+* when the table is created (current month and ``FUEL_ORDER_PARTITIONS_AHEAD``
+  months ahead),
+* by ``flask orders ensure-partitions`` (meant to run from cron),
+* before the first insert into a month this process has not seen yet, in a
+  SAVEPOINT so a failure cannot abort the inserting transaction (the row then
+  goes to the default partition).
+
+Postgres requires the partition key in the primary key, so the table's
+primary key constraint is rendered as ``PRIMARY KEY (id, created_at)`` there
+(and the migration adds the same constraint) while the ORM keeps mapping
+``id`` alone as the identity.
+
+SQLite (local tests) has no partitioning; the table stays a plain table and
+everything here is a no-op.
+"""
+import logging
+from datetime import datetime
+from typing import List, Set, Tuple
+
+from sqlalchemy import DDL, PrimaryKeyConstraint, event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, object_session
+
+from .fuel_order import FuelOrder
+
+PARTITION_KEY = 'created_at'
+DEFAULT_PARTITION = 'fuel_orders_default'
+DEFAULT_PARTITIONS_AHEAD = 3
+
+logger = logging.getLogger(__name__)
+
+POSTGRES_PARTITION_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION fuel_orders_ensure_partition(ts timestamp) RETURNS text AS $$
+DECLARE
+    month_start timestamp := date_trunc('month', ts);
+    partition_name text := 'fuel_orders_p' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NULL THEN
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF fuel_orders FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_start + interval '1 month'
+            );
+        EXCEPTION WHEN duplicate_table OR unique_violation THEN
+            -- Created concurrently by another session
+            NULL;
+        END;
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+POSTGRES_DEFAULT_PARTITION_DDL = f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF fuel_orders DEFAULT"
+
+POSTGRES_PARTITION_DROP_DDL = [
+    "DROP FUNCTION IF EXISTS fuel_orders_ensure_partition(timestamp)",
+]
+
+
+def month_start(ts: datetime) -> datetime:
+    """First instant of the month containing ``ts``."""
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(ts: datetime, months: int) -> datetime:
+    """Shift a month start by ``months`` (may be negative)."""
+    index = ts.year * 12 + ts.month - 1 + months
+    return ts.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(ts: datetime) -> str:
+    """Name of the monthly partition holding ``ts``."""
+    return f"fuel_orders_p{ts.year:04d}_{ts.month:02d}"
+
+
+def ensure_partitions(connection, start: datetime, months_ahead: int = DEFAULT_PARTITIONS_AHEAD) -> List[str]:
+    """
+    Create the monthly partitions from ``start``'s month through ``months_ahead``
+    months after it. Existing partitions are left alone.
+
+    Returns:
+        List[str]: The partition names covered, or an empty list on databases
+        without partitioning.
+    """
+    if connection.dialect.name != 'postgresql':
+        return []
+    first = month_start(start)
+    names = []
+    for offset in range(months_ahead + 1):
+        names.append(connection.execute(
+            text("SELECT fuel_orders_ensure_partition(:ts)"), {'ts': add_months(first, offset)}
+        ).scalar())
+    return names
+
+
+@compiles(PrimaryKeyConstraint, 'postgresql')
+def _compile_primary_key(constraint, compiler, **kw):
+    """Include the partition key in the fuel_orders primary key on Postgres."""
+    table = constraint.table
+    if table is not FuelOrder.__table__ or PARTITION_KEY in constraint.columns:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+    columns = [*constraint.columns, table.c[PARTITION_KEY]]
+    sql = ''
+    if constraint.name is not None:
+        sql += f"CONSTRAINT {compiler.preparer.format_constraint(constraint)} "
+    sql += 'PRIMARY KEY (%s)' % ', '.join(compiler.preparer.quote(column.name) for column in columns)
+    return sql
+
+
+def _create_initial_partitions(target, connection, **kw):
+    ensure_partitions(connection, datetime.utcnow(), DEFAULT_PARTITIONS_AHEAD)
+
+
+event.listen(FuelOrder.__table__, 'after_create', DDL(POSTGRES_PARTITION_FUNCTION_DDL).execute_if(dialect='postgresql'))
+event.listen(FuelOrder.__table__, 'after_create', DDL(POSTGRES_DEFAULT_PARTITION_DDL).execute_if(dialect='postgresql'))
+event.listen(FuelOrder.__table__, 'after_create', _create_initial_partitions)
+for statement in POSTGRES_PARTITION_DROP_DDL:
+    event.listen(FuelOrder.__table__, 'after_drop', DDL(statement).execute_if(dialect='postgresql'))
+
+
+# Months this process knows have a partition. Months ensured inside a
+# transaction are only recorded once that transaction commits, since the
+# CREATE TABLE is rolled back with it.
+_known_months: Set[Tuple[int, int]] = set()
+_PENDING_KEY = 'fuel_order_partitions_pending'
+
+
+@event.listens_for(FuelOrder, 'before_insert')
+def _ensure_partition_before_insert(mapper, connection, target):
+    if connection.dialect.name != 'postgresql':
+        return
+    if target.created_at is None:
+        # Pin the timestamp so the partition checked is the one the row lands in
+        target.created_at = datetime.utcnow()
+    month = (target.created_at.year, target.created_at.month)
+    if month in _known_months:
+        return
+    # A failed statement aborts the whole transaction on Postgres, so keep it
+    # in a SAVEPOINT; without the partition the row goes to the default one
+    try:
+        with connection.begin_nested():
+            connection.execute(text("SELECT fuel_orders_ensure_partition(:ts)"), {'ts': target.created_at})
+    except SQLAlchemyError as e:
+        logger.warning("Could not create the fuel_orders partition for %04d-%02d: %s", *month, e)
+        return
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(month)
+
+
+@event.listens_for(Session, 'after_commit')
+def _record_ensured_partitions(session):
+    _known_months.update(session.info.pop(_PENDING_KEY, ()))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_ensured_partitions(session):
+    session.info.pop(_PENDING_KEY, None)
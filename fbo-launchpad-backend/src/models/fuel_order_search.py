@@ -0,0 +1,74 @@
+"""
+Full-text search index over fuel orders.
+
+Postgres: a generated ``search_vector`` tsvector column on ``fuel_orders``
+with a GIN index, kept current by the database on every write.
+SQLite (local tests): an external-content FTS5 table kept in sync by triggers.
+
+The DDL is attached to the ``fuel_orders`` table so ``db.create_all()`` sets
+it up, and the same statements are reused by the Alembic migration.
+"""
+from sqlalchemy import DDL, event
+
+from .fuel_order import FuelOrder
+
+SEARCH_VECTOR_COLUMN = 'search_vector'
+SQLITE_FTS_TABLE = 'fuel_orders_fts'
+
+POSTGRES_SEARCH_DDL = [
+    f"""
+    ALTER TABLE fuel_orders ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(tail_number, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location_on_ramp, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(csr_notes, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(lst_notes, '')), 'C')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS ix_fuel_orders_search_vector ON fuel_orders USING GIN ({SEARCH_VECTOR_COLUMN})",
+]
+
+POSTGRES_SEARCH_DROP_DDL = [
+    "DROP INDEX IF EXISTS ix_fuel_orders_search_vector",
+    f"ALTER TABLE fuel_orders DROP COLUMN IF EXISTS {SEARCH_VECTOR_COLUMN}",
+]
+
+_FTS_COLUMNS = 'tail_number, location_on_ramp, csr_notes, lst_notes'
+_FTS_NEW = 'new.tail_number, new.location_on_ramp, new.csr_notes, new.lst_notes'
+_FTS_OLD = 'old.tail_number, old.location_on_ramp, old.csr_notes, old.lst_notes'
+
+SQLITE_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        {_FTS_COLUMNS}, content='fuel_orders', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS fuel_orders_fts_ai AFTER INSERT ON fuel_orders BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS fuel_orders_fts_ad AFTER DELETE ON fuel_orders BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS fuel_orders_fts_au AFTER UPDATE ON fuel_orders BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD});
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW});
+    END
+    """,
+]
+
+SQLITE_SEARCH_DROP_DDL = [
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(FuelOrder.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(FuelOrder.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in SQLITE_SEARCH_DROP_DDL:
+    event.listen(FuelOrder.__table__, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
@@ -13,6 +13,10 @@ class FuelTruck(db.Model):
     capacity = db.Column(db.Numeric(10, 2), nullable=False)
     current_meter_reading = db.Column(db.Numeric(12, 2), nullable=False, default=0)
     is_active = db.Column(db.Boolean, nullable=False, default=True)
+    # Last reported position on the ramp grid (see RampSpot), if any
+    last_x = db.Column(db.Float, nullable=True)
+    last_y = db.Column(db.Float, nullable=True)
+    position_updated_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -24,6 +28,9 @@ class FuelTruck(db.Model):
             'capacity': float(self.capacity),
             'current_meter_reading': float(self.current_meter_reading),
             'is_active': self.is_active,
+            'last_x': self.last_x,
+            'last_y': self.last_y,
+            'position_updated_at': self.position_updated_at.isoformat() if self.position_updated_at else None,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
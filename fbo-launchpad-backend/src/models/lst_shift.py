@@ -0,0 +1,52 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class LSTShift(db.Model):
+    """A rostered shift of a line service technician, with optional unpaid breaks."""
+
+    __tablename__ = 'lst_shifts'
+    __table_args__ = (
+        db.Index('ix_lst_shifts_user_id_start_time', 'user_id', 'start_time'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # UTC, half-open: on shift from start_time up to (not including) end_time
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False, index=True)
+    # [{"start": ISO datetime, "end": ISO datetime}, ...] within the shift, sorted, not overlapping
+    breaks = db.Column(db.JSON, nullable=False, default=list)
+    notes = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = db.relationship('User', backref=db.backref('shifts', lazy='dynamic', passive_deletes=True))
+
+    def working_intervals(self):
+        """The shift minus its breaks, as sorted (start, end) pairs."""
+        intervals = []
+        current = self.start_time
+        for brk in sorted(self.breaks or [], key=lambda b: b['start']):
+            brk_start, brk_end = datetime.fromisoformat(brk['start']), datetime.fromisoformat(brk['end'])
+            if brk_start > current:
+                intervals.append((current, brk_start))
+            current = max(current, brk_end)
+        if current < self.end_time:
+            intervals.append((current, self.end_time))
+        return intervals
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'breaks': self.breaks or [],
+            'notes': self.notes,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+    def __repr__(self):
+        return f'<LSTShift {self.id} user={self.user_id} {self.start_time:%Y-%m-%d %H:%M}>'
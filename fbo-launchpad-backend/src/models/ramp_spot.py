@@ -0,0 +1,33 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class RampSpot(db.Model):
+    """A parking position on the ramp that fuel orders can reference."""
+
+    __tablename__ = 'ramp_spots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(20), unique=True, nullable=False)
+    zone = db.Column(db.String(50), nullable=True, index=True)
+    # Planar position in metres on the airport's ramp grid
+    x = db.Column(db.Float, nullable=False)
+    y = db.Column(db.Float, nullable=False)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'code': self.code,
+            'zone': self.zone,
+            'x': self.x,
+            'y': self.y,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+    def __repr__(self):
+        return f'<RampSpot {self.code}>'
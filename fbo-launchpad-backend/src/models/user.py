@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 from enum import Enum
-from flask import current_app, g, has_request_context
-from sqlalchemy import exists
+from flask import current_app
 from sqlalchemy.orm import joinedload
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
@@ -10,6 +9,7 @@ from ..extensions import db
 from ..models.permission import Permission
 from ..models.role import Role
 from ..models.role_permission import role_permissions, user_roles
+from ..utils.permission_cache import permission_cache
 
 class UserRole(Enum):
     """
@@ -21,6 +21,14 @@ class UserRole(Enum):
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Case-insensitive prefix search on the user list (text_pattern_ops lets
+        # Postgres use them for LIKE 'abc%' under any collation)
+        db.Index('ix_users_username_lower', db.func.lower(db.text('username')).label('username_lower'),
+                 postgresql_ops={'username_lower': 'text_pattern_ops'}),
+        db.Index('ix_users_email_lower', db.func.lower(db.text('email')).label('email_lower'),
+                 postgresql_ops={'email_lower': 'text_pattern_ops'}),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(64), unique=True, nullable=False, index=True)
@@ -36,6 +44,9 @@ class User(db.Model):
         backref=db.backref('users', lazy='dynamic'),
         lazy='dynamic'
     )
+    # Read-only list view of `roles` that can be batch loaded with
+    # selectinload(User.role_list); `roles` stays dynamic for filtering and writes
+    role_list = db.relationship('Role', secondary=user_roles, viewonly=True, order_by='Role.id')
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
@@ -50,16 +61,11 @@ class User(db.Model):
             'username': self.username,
             'email': self.email,
             'name': self.name,
-            'roles': [role.name for role in self.roles.all()],
+            'roles': [role.name for role in self.role_list],
             'is_active': self.is_active,
             'created_at': self.created_at.isoformat()
         }
 
-    @property
-    def role_list(self):
-        """Get list of roles for this user."""
-        return self.roles.all()
-
     def __repr__(self):
         return f'<User {self.username}>'
 
@@ -74,40 +80,12 @@ class User(db.Model):
             bool: True if the user has the permission through any role, False otherwise.
             
         Note:
-            This method uses SQLAlchemy's EXISTS subquery for efficient permission checking
-            and caches results for the duration of the request.
+            The user's whole permission set is resolved with one query and kept in
+            the per-process permission cache, so further checks need no query.
         """
         if not self.is_active:
             return False
-            
-        # Use request-level caching if available
-        if has_request_context():
-            # Initialize permission cache if it doesn't exist
-            if not hasattr(g, '_permission_cache'):
-                g._permission_cache = {}
-            
-            cache_key = f'user_{self.id}_perm_{permission_name}'
-            if cache_key in g._permission_cache:
-                return g._permission_cache[cache_key]
-            
-            # Check permission and cache result
-            result = db.session.query(exists().where(
-                db.and_(
-                    User.id == self.id,
-                    User.roles.any(Role.permissions.any(Permission.name == permission_name))
-                )
-            )).scalar()
-            
-            g._permission_cache[cache_key] = result
-            return result
-            
-        # If no request context, perform check without caching
-        return db.session.query(exists().where(
-            db.and_(
-                User.id == self.id,
-                User.roles.any(Role.permissions.any(Permission.name == permission_name))
-            )
-        )).scalar()
+        return permission_name in permission_cache.get(self.id)
 
     def generate_token(self, expires_in=3600):
         """
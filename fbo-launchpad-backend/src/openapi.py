@@ -0,0 +1,341 @@
+"""
+OpenAPI document of the API, served by ``GET /api/swagger.json``.
+
+Registering every schema and documented view with apispec takes a noticeable
+part of a worker's startup, and most workers never serve the document. So the
+spec is built on the first request for it (or read from OPENAPI_SPEC_PATH,
+written at image build time by ``flask openapi export``), serialized once and
+kept as bytes with an ETag.
+"""
+import hashlib
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+from apispec import APISpec
+from apispec.ext.marshmallow import MarshmallowPlugin
+from apispec_webframeworks.flask import FlaskPlugin
+
+from src.extensions import apispec as base_spec
+from src.schemas import (
+    RegisterRequestSchema,
+    UserResponseSchema,
+    RegisterResponseSchema,
+    LoginRequestSchema,
+    LoginSuccessResponseSchema,
+    ErrorResponseSchema,
+    FuelOrderCreateRequestSchema,
+    FuelOrderStatusUpdateRequestSchema,
+    FuelOrderCompleteRequestSchema,
+    FuelOrderResponseSchema,
+    FuelOrderBriefResponseSchema,
+    FuelOrderCreateResponseSchema,
+    FuelOrderUpdateResponseSchema,
+    PaginationSchema,
+    FuelOrderListResponseSchema,
+    FuelTruckSchema,
+    FuelTruckListResponseSchema,
+    FuelTruckCreateRequestSchema,
+    FuelTruckCreateResponseSchema,
+    OrderStatusCountsSchema,
+    OrderStatusCountsResponseSchema,
+    UserPermissionsResponseSchema
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_spec(app) -> APISpec:
+    """Register every schema and documented view of `app` on a new APISpec."""
+    spec = APISpec(
+        title=base_spec.title,
+        version=base_spec.version,
+        openapi_version=str(base_spec.openapi_version),
+        plugins=[FlaskPlugin(), MarshmallowPlugin()],
+        **base_spec.options
+    )
+
+    # Add security scheme for JWT
+    spec.components.security_scheme(
+        "bearerAuth",
+        {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT",
+        }
+    )
+
+    from src.routes.auth_routes import auth_bp
+    from src.routes.fuel_order_routes import fuel_order_bp
+    from src.routes.user_routes import user_bp
+    from src.routes.fuel_truck_routes import truck_bp
+    from src.routes.aircraft_routes import aircraft_bp
+    from src.routes.ramp_spot_routes import ramp_spot_bp
+    from src.routes.lst_shift_routes import lst_shift_bp
+    from src.routes.admin.routes import admin_bp
+
+    with app.app_context():
+        # Register Auth Schemas
+        spec.components.schema("RegisterRequestSchema", schema=RegisterRequestSchema)
+        spec.components.schema("UserResponseSchema", schema=UserResponseSchema)
+        spec.components.schema("RegisterResponseSchema", schema=RegisterResponseSchema)
+        spec.components.schema("LoginRequestSchema", schema=LoginRequestSchema)
+        spec.components.schema("LoginSuccessResponseSchema", schema=LoginSuccessResponseSchema)
+        spec.components.schema("ErrorResponseSchema", schema=ErrorResponseSchema)
+        spec.components.schema("UserPermissionsResponseSchema", schema=UserPermissionsResponseSchema)
+
+        # Register User Admin Schemas
+        from src.schemas.user_schemas import (
+            UserCreateRequestSchema, UserUpdateRequestSchema,
+            UserDetailSchema, UserListResponseSchema, UserBriefSchema,
+            RoleBriefSchema
+        )
+        spec.components.schema("RoleBriefSchema", schema=RoleBriefSchema)
+        spec.components.schema("UserBriefSchema", schema=UserBriefSchema)
+        spec.components.schema("UserCreateRequestSchema", schema=UserCreateRequestSchema)
+        spec.components.schema("UserUpdateRequestSchema", schema=UserUpdateRequestSchema)
+        spec.components.schema("UserDetailSchema", schema=UserDetailSchema)
+        spec.components.schema("UserListResponseSchema", schema=UserListResponseSchema)
+
+        # Register Fuel Order Schemas
+        spec.components.schema("FuelOrderCreateRequestSchema", schema=FuelOrderCreateRequestSchema)
+        spec.components.schema("FuelOrderStatusUpdateRequestSchema", schema=FuelOrderStatusUpdateRequestSchema)
+        spec.components.schema("FuelOrderCompleteRequestSchema", schema=FuelOrderCompleteRequestSchema)
+        spec.components.schema("FuelOrderResponseSchema", schema=FuelOrderResponseSchema)
+        spec.components.schema("FuelOrderBriefResponseSchema", schema=FuelOrderBriefResponseSchema)
+        spec.components.schema("FuelOrderCreateResponseSchema", schema=FuelOrderCreateResponseSchema)
+        spec.components.schema("FuelOrderUpdateResponseSchema", schema=FuelOrderUpdateResponseSchema)
+        spec.components.schema("PaginationSchema", schema=PaginationSchema)
+        spec.components.schema("FuelOrderListResponseSchema", schema=FuelOrderListResponseSchema)
+        spec.components.schema("OrderStatusCountsSchema", schema=OrderStatusCountsSchema)
+        spec.components.schema("OrderStatusCountsResponseSchema", schema=OrderStatusCountsResponseSchema)
+
+        # Register Fuel Truck Schemas
+        spec.components.schema("FuelTruckSchema", schema=FuelTruckSchema)
+        spec.components.schema("FuelTruckListResponseSchema", schema=FuelTruckListResponseSchema)
+        spec.components.schema("FuelTruckCreateRequestSchema", schema=FuelTruckCreateRequestSchema)
+        spec.components.schema("FuelTruckCreateResponseSchema", schema=FuelTruckCreateResponseSchema)
+
+        # Register Aircraft Schemas
+        from src.schemas.aircraft_schemas import (
+            AircraftCreateSchema,
+            AircraftUpdateSchema,
+            AircraftResponseSchema,
+            AircraftListSchema,
+            ErrorResponseSchema as AircraftErrorResponseSchema
+        )
+        spec.components.schema("AircraftCreateSchema", schema=AircraftCreateSchema)
+        spec.components.schema("AircraftUpdateSchema", schema=AircraftUpdateSchema)
+        spec.components.schema("AircraftResponseSchema", schema=AircraftResponseSchema)
+        spec.components.schema("AircraftListSchema", schema=AircraftListSchema)
+        spec.components.schema("AircraftErrorResponseSchema", schema=AircraftErrorResponseSchema)
+
+        # Register Customer Schemas
+        from src.schemas.customer_schemas import (
+            CustomerCreateSchema,
+            CustomerUpdateSchema,
+            CustomerResponseSchema,
+            CustomerListSchema,
+            ErrorResponseSchema as CustomerErrorResponseSchema
+        )
+        spec.components.schema("CustomerCreateSchema", schema=CustomerCreateSchema)
+        spec.components.schema("CustomerUpdateSchema", schema=CustomerUpdateSchema)
+        spec.components.schema("CustomerResponseSchema", schema=CustomerResponseSchema)
+        spec.components.schema("CustomerListSchema", schema=CustomerListSchema)
+        spec.components.schema("CustomerErrorResponseSchema", schema=CustomerErrorResponseSchema)
+
+        # Register Ramp Spot Schemas
+        from src.schemas.ramp_spot_schemas import (
+            RampSpotCreateSchema,
+            RampSpotUpdateSchema,
+            RampSpotResponseSchema,
+            RampSpotListSchema,
+            NearestTruckListSchema
+        )
+        from src.schemas.fuel_truck_schemas import FuelTruckPositionRequestSchema
+        spec.components.schema("RampSpotCreateSchema", schema=RampSpotCreateSchema)
+        spec.components.schema("RampSpotUpdateSchema", schema=RampSpotUpdateSchema)
+        spec.components.schema("RampSpotResponseSchema", schema=RampSpotResponseSchema)
+        spec.components.schema("RampSpotListSchema", schema=RampSpotListSchema)
+        spec.components.schema("NearestTruckListSchema", schema=NearestTruckListSchema)
+        spec.components.schema("FuelTruckPositionRequestSchema", schema=FuelTruckPositionRequestSchema)
+
+        # Register LST Shift Schemas
+        from src.schemas.lst_shift_schemas import (
+            LSTShiftCreateSchema,
+            LSTShiftUpdateSchema,
+            LSTShiftResponseSchema,
+            LSTShiftListSchema
+        )
+        spec.components.schema("LSTShiftCreateSchema", schema=LSTShiftCreateSchema)
+        spec.components.schema("LSTShiftUpdateSchema", schema=LSTShiftUpdateSchema)
+        spec.components.schema("LSTShiftResponseSchema", schema=LSTShiftResponseSchema)
+        spec.components.schema("LSTShiftListSchema", schema=LSTShiftListSchema)
+
+        # Register Admin Schemas
+        from src.schemas.admin_schemas import (
+            AdminAircraftSchema, AdminAircraftListResponseSchema,
+            AdminCustomerSchema, AdminCustomerListResponseSchema
+        )
+        spec.components.schema("AdminAircraftSchema", schema=AdminAircraftSchema)
+        spec.components.schema("AdminAircraftListResponseSchema", schema=AdminAircraftListResponseSchema)
+        spec.components.schema("AdminCustomerSchema", schema=AdminCustomerSchema)
+        spec.components.schema("AdminCustomerListResponseSchema", schema=AdminCustomerListResponseSchema)
+
+        # Register Permission Schemas
+        from src.routes.admin.permission_admin_routes import PermissionListResponseSchema
+        from src.schemas import PermissionSchema
+        spec.components.schema("PermissionSchema", schema=PermissionSchema)
+        spec.components.schema("PermissionListResponseSchema", schema=PermissionListResponseSchema)
+
+        # Register Auth Views
+        from src.routes.auth_routes import register, login, get_my_permissions
+        spec.path(view=register, bp=auth_bp)
+        spec.path(view=login, bp=auth_bp)
+        spec.path(view=get_my_permissions, bp=auth_bp)
+
+        # Register User Views
+        from src.routes.user_routes import get_users
+        spec.path(view=get_users, bp=user_bp)
+
+        # Register Fuel Order Views
+        from src.routes.fuel_order_routes import (
+            create_fuel_order, get_fuel_orders, get_fuel_order,
+            update_fuel_order_status, submit_fuel_data, review_fuel_order,
+            export_fuel_orders_csv, get_status_counts, claim_next_fuel_order
+        )
+        spec.path(view=create_fuel_order, bp=fuel_order_bp)
+        spec.path(view=get_fuel_orders, bp=fuel_order_bp)
+        spec.path(view=get_fuel_order, bp=fuel_order_bp)
+        spec.path(view=update_fuel_order_status, bp=fuel_order_bp)
+        spec.path(view=submit_fuel_data, bp=fuel_order_bp)
+        spec.path(view=review_fuel_order, bp=fuel_order_bp)
+        spec.path(view=export_fuel_orders_csv, bp=fuel_order_bp)
+        spec.path(view=get_status_counts, bp=fuel_order_bp)
+        spec.path(view=claim_next_fuel_order, bp=fuel_order_bp)
+
+        # Register Fuel Truck Views
+        from src.routes.fuel_truck_routes import get_fuel_trucks, create_fuel_truck, update_fuel_truck_position
+        spec.path(view=get_fuel_trucks, bp=truck_bp)
+        spec.path(view=create_fuel_truck, bp=truck_bp)
+        spec.path(view=update_fuel_truck_position, bp=truck_bp)
+
+        # Register Ramp Spot Views
+        from src.routes.ramp_spot_routes import (
+            list_ramp_spots, create_ramp_spot, nearest_ramp_spots, get_ramp_spot,
+            update_ramp_spot, delete_ramp_spot, nearest_trucks_to_spot
+        )
+        spec.path(view=list_ramp_spots, bp=ramp_spot_bp)
+        spec.path(view=create_ramp_spot, bp=ramp_spot_bp)
+        spec.path(view=nearest_ramp_spots, bp=ramp_spot_bp)
+        spec.path(view=get_ramp_spot, bp=ramp_spot_bp)
+        spec.path(view=update_ramp_spot, bp=ramp_spot_bp)
+        spec.path(view=delete_ramp_spot, bp=ramp_spot_bp)
+        spec.path(view=nearest_trucks_to_spot, bp=ramp_spot_bp)
+
+        # Register LST Shift Views
+        from src.routes.lst_shift_routes import (
+            list_lst_shifts, create_lst_shift, get_lsts_on_shift, get_lst_shift,
+            update_lst_shift, delete_lst_shift
+        )
+        spec.path(view=list_lst_shifts, bp=lst_shift_bp)
+        spec.path(view=create_lst_shift, bp=lst_shift_bp)
+        spec.path(view=get_lsts_on_shift, bp=lst_shift_bp)
+        spec.path(view=get_lst_shift, bp=lst_shift_bp)
+        spec.path(view=update_lst_shift, bp=lst_shift_bp)
+        spec.path(view=delete_lst_shift, bp=lst_shift_bp)
+
+        # Register Aircraft Views
+        from src.routes.aircraft_routes import list_aircraft, create_aircraft, get_aircraft, update_aircraft, delete_aircraft
+        spec.path(view=list_aircraft, bp=aircraft_bp)
+        spec.path(view=create_aircraft, bp=aircraft_bp)
+        spec.path(view=get_aircraft, bp=aircraft_bp)
+        spec.path(view=update_aircraft, bp=aircraft_bp)
+        spec.path(view=delete_aircraft, bp=aircraft_bp)
+
+        # Register Admin Views
+        from src.routes.admin.aircraft_admin_routes import list_aircraft as admin_list_aircraft, create_aircraft as admin_create_aircraft, get_aircraft as admin_get_aircraft, update_aircraft as admin_update_aircraft, delete_aircraft as admin_delete_aircraft
+        from src.routes.admin.customer_admin_routes import list_customers as admin_list_customers, create_customer as admin_create_customer, get_customer as admin_get_customer, update_customer as admin_update_customer, delete_customer as admin_delete_customer
+        from src.routes.admin.permission_admin_routes import get_permissions
+        from src.routes.admin.cache_admin_routes import get_invalidation_stats
+        from src.routes.admin.db_admin_routes import get_db_pool_stats
+        from src.routes.admin.user_admin_routes import get_users as admin_get_users
+        from src.routes.admin.role_admin_routes import get_roles, create_role, get_role, update_role, delete_role, get_role_permissions, get_permission_matrix, set_role_permissions
+
+        # Register Admin Aircraft Views
+        spec.path(view=admin_list_aircraft, bp=admin_bp)
+        spec.path(view=admin_create_aircraft, bp=admin_bp)
+        spec.path(view=admin_get_aircraft, bp=admin_bp)
+        spec.path(view=admin_update_aircraft, bp=admin_bp)
+        spec.path(view=admin_delete_aircraft, bp=admin_bp)
+
+        # Register Admin Customer Views
+        spec.path(view=admin_list_customers, bp=admin_bp)
+        spec.path(view=admin_create_customer, bp=admin_bp)
+        spec.path(view=admin_get_customer, bp=admin_bp)
+        spec.path(view=admin_update_customer, bp=admin_bp)
+        spec.path(view=admin_delete_customer, bp=admin_bp)
+
+        # Register Admin User Views
+        spec.path(view=admin_get_users, bp=admin_bp)
+        # spec.path(view=admin_create_user, bp=admin_bp)
+        # spec.path(view=admin_get_user, bp=admin_bp)
+        # spec.path(view=admin_update_user, bp=admin_bp)
+        # spec.path(view=admin_delete_user, bp=admin_bp)
+
+        # Register Admin Role Views
+        spec.path(view=get_roles, bp=admin_bp)
+        spec.path(view=create_role, bp=admin_bp)
+        spec.path(view=get_role, bp=admin_bp)
+        spec.path(view=update_role, bp=admin_bp)
+        spec.path(view=delete_role, bp=admin_bp)
+        spec.path(view=get_role_permissions, bp=admin_bp)
+        spec.path(view=get_permission_matrix, bp=admin_bp)
+        spec.path(view=set_role_permissions, bp=admin_bp)
+
+        # Register Admin Permission Views
+        spec.path(view=get_permissions, bp=admin_bp)
+
+        # Register Admin Cache Views
+        spec.path(view=get_invalidation_stats, bp=admin_bp)
+
+        # Register Admin Database Views
+        spec.path(view=get_db_pool_stats, bp=admin_bp)
+
+    return spec
+
+
+def serialize_spec(app) -> bytes:
+    """The OpenAPI document of `app` as compact JSON."""
+    # The app's JSON provider also handles Decimal defaults, like jsonify did
+    return app.json.dumps(build_spec(app).to_dict(), separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+class SpecDocument:
+    """The serialized OpenAPI document of one app, built on first use."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+        self._document: Optional[Tuple[bytes, str]] = None
+
+    def get(self) -> Tuple[bytes, str]:
+        """(JSON bytes, ETag)"""
+        document = self._document
+        if document is None:
+            with self._lock:
+                if self._document is None:
+                    self._document = self._load()
+                document = self._document
+        return document
+
+    def _load(self) -> Tuple[bytes, str]:
+        path = self.app.config.get('OPENAPI_SPEC_PATH')
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                body = f.read()
+            logger.info(f"Loaded the OpenAPI document from {path}")
+        else:
+            body = serialize_spec(self.app)
+        return body, f"spec-{hashlib.sha1(body).hexdigest()[:16]}"
@@ -0,0 +1,30 @@
+from flask import jsonify
+from src.utils.decorators import token_required, require_permission
+from src.utils.invalidation import invalidation_bus
+from .routes import admin_bp
+
+@admin_bp.route('/cache/invalidation', methods=['GET'])
+@token_required
+@require_permission('MANAGE_SETTINGS')
+def get_invalidation_stats():
+    """
+    ---
+    get:
+      summary: Cache invalidation bus statistics of the answering worker (admin, MANAGE_SETTINGS permission required)
+      description: >
+        Counts of published and received invalidation events, events that could not be
+        delivered, full cache flushes after lost events, and the delivery lag of recent
+        events received from other workers.
+      tags:
+        - Admin - Cache
+      security:
+        - bearerAuth: []
+      responses:
+        200:
+          description: Invalidation statistics
+        401:
+          description: Unauthorized
+        403:
+          description: Forbidden (missing permission)
+    """
+    return jsonify(invalidation_bus.stats()), 200
@@ -0,0 +1,36 @@
+from flask import jsonify
+from src.extensions import db
+from src.utils.decorators import token_required, require_permission
+from src.utils.db_pool import pool_stats
+from src.utils.db_routing import replica_router
+from .routes import admin_bp
+
+@admin_bp.route('/db/pool', methods=['GET'])
+@token_required
+@require_permission('MANAGE_SETTINGS')
+def get_db_pool_stats():
+    """
+    ---
+    get:
+      summary: Database connection pool statistics of the answering worker (admin, MANAGE_SETTINGS permission required)
+      description: >
+        Current pool occupancy (checked out, checked in, overflow), checkout counts, the
+        time requests waited for a connection, checkout timeouts, and the connection
+        budget of all workers (WEB_CONCURRENCY x (pool size + max overflow)).
+        `replica` reports read replica routing: last measured lag and how many
+        reads went to the replica or fell back to the primary.
+      tags:
+        - Admin - Database
+      security:
+        - bearerAuth: []
+      responses:
+        200:
+          description: Pool statistics
+        401:
+          description: Unauthorized
+        403:
+          description: Forbidden (missing permission)
+    """
+    stats = pool_stats.snapshot(db.engine)
+    stats['replica'] = replica_router.stats()
+    return jsonify(stats), 200
@@ -5,6 +5,7 @@ from ...models.user import UserRole
 from ...schemas import PermissionSchema, ErrorResponseSchema
 from marshmallow import Schema, fields
 from src.extensions import apispec
+from src.utils.reference_cache import reference_lists
 from .routes import admin_bp
 
 class PermissionListResponseSchema(Schema):
@@ -34,6 +35,11 @@ def get_permissions():
     """
     if request.method == 'OPTIONS':
         return jsonify({'message': 'OPTIONS request successful'}), 200
-    permissions, msg, status = PermissionService.get_all_permissions()
-    schema = PermissionSchema(many=True)
-    return jsonify({"permissions": schema.dump(permissions)}), status 
\ No newline at end of file
+
+    def build():
+        permissions, msg, status = PermissionService.get_all_permissions()
+        if permissions is None:
+            return {"error": msg}, status
+        return {"permissions": PermissionSchema(many=True).dump(permissions)}, status
+
+    return reference_lists.response('permission', None, build) 
\ No newline at end of file
@@ -8,12 +8,14 @@ from ...schemas.role_schemas import (
     RoleListResponseSchema,
     RoleCreateRequestSchema,
     RoleUpdateRequestSchema,
-    RoleAssignPermissionRequestSchema
+    RoleAssignPermissionRequestSchema,
+    RoleSetPermissionsRequestSchema
 )
 from ...schemas.permission_schemas import PermissionSchema
 from ...schemas import ErrorResponseSchema
 from marshmallow import ValidationError
 from src.extensions import apispec
+from src.utils.reference_cache import reference_lists
 from .routes import admin_bp
 
 @admin_bp.route('roles', methods=['GET', 'OPTIONS'])
@@ -38,9 +40,11 @@ def get_roles():
         403:
           description: Forbidden (missing permission)
     """
-    roles, msg, status = RoleService.get_all_roles()
-    schema = RoleSchema(many=True)
-    return jsonify({"roles": schema.dump(roles)}), status
+    def build():
+        roles, msg, status = RoleService.get_all_roles()
+        return {"roles": RoleSchema(many=True).dump(roles)}, status
+
+    return reference_lists.response('role', None, build)
 
 @admin_bp.route('roles', methods=['POST', 'OPTIONS'])
 @admin_bp.route('/roles', methods=['POST', 'OPTIONS'])
@@ -177,6 +181,39 @@ def delete_role(role_id):
         return jsonify({"error": msg}), status
     return '', 204
 
+@admin_bp.route('/roles/permission-matrix', methods=['GET'])
+@token_required
+@require_permission('MANAGE_ROLES')
+def get_permission_matrix():
+    """
+    ---
+    get:
+      summary: Get all roles with the permissions granted to each (admin, MANAGE_ROLES permission required)
+      tags:
+        - Admin - Roles
+      security:
+        - bearerAuth: []
+      responses:
+        200:
+          description: Roles with their permission IDs, and all permissions
+          content:
+            application/json:
+              schema: PermissionMatrixResponseSchema
+        401:
+          description: Unauthorized
+        403:
+          description: Forbidden (missing permission)
+        500:
+          description: Server error
+          content:
+            application/json:
+              schema: ErrorResponseSchema
+    """
+    matrix, msg, status = RoleService.get_permission_matrix()
+    if matrix is None:
+        return jsonify({"error": msg}), status
+    return jsonify(matrix), status
+
 @admin_bp.route('/roles/<int:role_id>/permissions', methods=['GET'])
 @token_required
 @require_permission('MANAGE_ROLES')
@@ -283,6 +320,77 @@ def assign_permission(role_id):
         return jsonify({"message": message}), status_code
     return jsonify({"error": message}), status_code
 
+@admin_bp.route('/roles/<int:role_id>/permissions', methods=['PUT'])
+@token_required
+@require_permission('MANAGE_ROLES')
+def set_role_permissions(role_id):
+    """Replace the permission set of a role.
+    Requires MANAGE_ROLES permission.
+    ---
+    put:
+      summary: Set the permissions of a role (admin, MANAGE_ROLES permission required)
+      description: Permissions not listed are removed from the role. Only the difference to the current set is written.
+      tags:
+        - Admin - Roles
+      security:
+        - bearerAuth: []
+      parameters:
+        - in: path
+          name: role_id
+          schema:
+            type: integer
+          required: true
+          description: ID of the role
+      requestBody:
+        required: true
+        content:
+          application/json:
+            schema: RoleSetPermissionsRequestSchema
+      responses:
+        200:
+          description: Permissions updated
+          content:
+            application/json:
+              schema: RoleSetPermissionsResponseSchema
+        400:
+          description: Bad request or unknown permission IDs
+          content:
+            application/json:
+              schema: ErrorResponseSchema
+        401:
+          description: Unauthorized
+          content:
+            application/json:
+              schema: ErrorResponseSchema
+        403:
+          description: Forbidden (missing permission)
+          content:
+            application/json:
+              schema: ErrorResponseSchema
+        404:
+          description: Role not found
+          content:
+            application/json:
+              schema: ErrorResponseSchema
+        409:
+          description: The role was updated concurrently
+          content:
+            application/json:
+              schema: ErrorResponseSchema
+    """
+    try:
+        data = RoleSetPermissionsRequestSchema().load(request.get_json() or {})
+    except ValidationError as e:
+        return jsonify({
+            "error": "Validation error",
+            "details": e.messages
+        }), 400
+
+    result, message, status_code = RoleService.set_role_permissions(role_id, data['permission_ids'])
+    if result is None:
+        return jsonify({"error": message}), status_code
+    return jsonify(dict(result, message=message)), status_code
+
 @admin_bp.route('/roles/<int:role_id>/permissions/<int:permission_id>', methods=['DELETE'])
 @token_required
 @require_permission('MANAGE_ROLES')
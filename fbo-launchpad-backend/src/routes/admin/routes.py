@@ -8,6 +8,8 @@ from .permission_admin_routes import *
 from .role_admin_routes import *
 from .customer_admin_routes import *
 from .aircraft_admin_routes import *
+from .cache_admin_routes import *
+from .db_admin_routes import *
 
 # Register routes with the admin blueprint
 # Note: The individual route modules should use admin_bp from this module 
\ No newline at end of file
@@ -28,10 +28,10 @@ def get_users():
     if request.method == 'OPTIONS':
         return jsonify({'message': 'OPTIONS request successful'}), 200
     current_app.logger.info("--- Attempting to serve GET /api/admin/users/ via get_users ---")
-    users, msg, status = UserService.get_users(request.args)
+    page, msg, status = UserService.get_users(request.args)
     if status == 200:
         schema = UserDetailSchema(many=True)
-        return jsonify({"users": schema.dump(users), "message": msg}), status
+        return jsonify({"users": schema.dump(page['users']), "next_cursor": page['next_cursor'], "message": msg}), status
     else:
         return jsonify({"error": msg}), status
 
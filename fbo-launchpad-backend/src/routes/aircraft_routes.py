@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from ..utils.decorators import token_required, require_permission
 from ..models.user import UserRole
 from ..services.aircraft_service import AircraftService
+from ..utils.fieldsets import parse_fields, serialize_fields
+from ..utils.reference_cache import reference_lists
 from ..schemas.aircraft_schemas import (
     AircraftCreateSchema,
     AircraftUpdateSchema,
@@ -12,6 +14,15 @@ from ..schemas.aircraft_schemas import (
 
 aircraft_bp = Blueprint('aircraft_bp', __name__, url_prefix='/api/aircraft')
 
+# Fields selectable via ?fields= on the aircraft list (mirrors Aircraft.to_dict)
+AIRCRAFT_LIST_FIELDS = {
+    'tail_number': lambda a: a.tail_number,
+    'aircraft_type': lambda a: a.aircraft_type,
+    'fuel_type': lambda a: a.fuel_type,
+    'created_at': lambda a: a.created_at.isoformat(),
+    'updated_at': lambda a: a.updated_at.isoformat(),
+}
+
 @aircraft_bp.route('', methods=['GET', 'OPTIONS'])
 @aircraft_bp.route('/', methods=['GET', 'OPTIONS'])
 @token_required
@@ -23,6 +34,13 @@ def list_aircraft():
       - Aircraft
     security:
       - bearerAuth: []
+    parameters:
+      - in: query
+        name: fields
+        schema:
+          type: string
+        required: false
+        description: Comma separated subset of aircraft fields to return
     responses:
       200:
         description: Aircraft list
@@ -35,11 +53,21 @@ def list_aircraft():
     filters = {}
     if 'customer_id' in request.args:
         filters['customer_id'] = request.args.get('customer_id', type=int)
-    aircraft, message, status_code = AircraftService.get_all_aircraft(filters)
-    return jsonify({
-        "message": message,
-        "aircraft": [AircraftResponseSchema().dump(a) for a in aircraft]
-    }), status_code
+    try:
+        fields = parse_fields(request.args.get('fields'), AIRCRAFT_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def build():
+        aircraft, message, status_code = AircraftService.get_all_aircraft(filters, fields=fields)
+        if fields:
+            aircraft_list = [serialize_fields(a, fields, AIRCRAFT_LIST_FIELDS) for a in aircraft]
+        else:
+            aircraft_list = AircraftResponseSchema(many=True).dump(aircraft)
+        return {"message": message, "aircraft": aircraft_list}, status_code
+
+    variant = (filters.get('customer_id'), tuple(fields) if fields else None)
+    return reference_lists.response('aircraft', variant, build)
 
 @aircraft_bp.route('', methods=['POST', 'OPTIONS'])
 @aircraft_bp.route('/', methods=['POST', 'OPTIONS'])
@@ -77,6 +105,49 @@ def create_aircraft():
     else:
         return jsonify({"error": message}), status_code
 
+@aircraft_bp.route('/suggest', methods=['GET', 'OPTIONS'])
+@token_required
+@require_permission('VIEW_AIRCRAFT')
+def suggest_aircraft():
+    """Typeahead suggestions for tail numbers (VIEW_AIRCRAFT permission required).
+    Served from the in-memory tail number index without querying the aircraft table.
+    ---
+    tags:
+      - Aircraft
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: query
+        name: prefix
+        schema:
+          type: string
+        required: true
+        description: Tail number prefix (case-insensitive)
+      - in: query
+        name: limit
+        schema:
+          type: integer
+          default: 10
+        required: false
+        description: Maximum number of suggestions (1-50)
+    responses:
+      200:
+        description: Matching aircraft ordered by tail number
+      400:
+        description: Missing prefix
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'OPTIONS request successful'}), 200
+    limit = request.args.get('limit', 10, type=int)
+    limit = max(1, min(limit, 50))
+    suggestions, message, status_code = AircraftService.suggest_tail_numbers(request.args.get('prefix', ''), limit)
+    if status_code != 200:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "aircraft": suggestions}), status_code
+
 @aircraft_bp.route('/<string:tail_number>', methods=['GET'])
 @token_required
 @require_permission('VIEW_AIRCRAFT')
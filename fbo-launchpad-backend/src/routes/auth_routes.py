@@ -20,6 +20,7 @@ import jwt as pyjwt
 from src.utils.rate_limiting import rate_limit
 from flask import g
 from ..utils.decorators import token_required
+from ..utils.permission_cache import permission_cache
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -199,12 +200,26 @@ def get_my_permissions():
       - Authentication
     security:
       - bearerAuth: []
+    parameters:
+      - in: header
+        name: If-None-Match
+        schema:
+          type: string
+        required: false
+        description: ETag of a previous response; 304 is returned if the permissions did not change
     responses:
       200:
         description: List of effective permission strings for the user.
+        headers:
+          ETag:
+            description: Version of the permission set
+            schema:
+              type: string
         content:
           application/json:
             schema: UserPermissionsResponseSchema
+      304:
+        description: Permissions unchanged since the ETag in If-None-Match
       401:
         description: Unauthorized (invalid/missing token)
         content:
@@ -219,10 +234,19 @@ def get_my_permissions():
     current_user = g.current_user
     permissions, message, status_code = AuthService.get_user_effective_permissions(current_user)
     if permissions is not None:
-        result = UserPermissionsResponseSchema().dump({
-            "message": message,
-            "permissions": permissions
-        })
-        return jsonify(result), status_code
+        etag = permission_cache.etag(current_user.id, frozenset(permissions))
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            result = UserPermissionsResponseSchema().dump({
+                "message": message,
+                "permissions": permissions
+            })
+            response = jsonify(result)
+            response.status_code = status_code
+        response.set_etag(etag)
+        # Clients may keep the response but must revalidate it on every use
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
     else:
-        return jsonify({"error": message}), status_code 
\ No newline at end of file
+        return jsonify({"error": message}), status_code
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from ..utils.decorators import token_required, require_permission
 from ..models.user import UserRole
 from ..services.customer_service import CustomerService
+from ..utils.fieldsets import parse_fields, serialize_fields
+from ..utils.reference_cache import reference_lists
 from ..schemas.customer_schemas import (
     CustomerCreateSchema,
     CustomerUpdateSchema,
@@ -12,6 +14,16 @@ from ..schemas.customer_schemas import (
 
 customer_bp = Blueprint('customer_bp', __name__, url_prefix='/api/customers')
 
+# Fields selectable via ?fields= on the customer list (mirrors Customer.to_dict)
+CUSTOMER_LIST_FIELDS = {
+    'id': lambda c: c.id,
+    'name': lambda c: c.name,
+    'email': lambda c: c.email,
+    'phone': lambda c: c.phone,
+    'created_at': lambda c: c.created_at.isoformat(),
+    'updated_at': lambda c: c.updated_at.isoformat(),
+}
+
 @customer_bp.route('', methods=['GET', 'OPTIONS'])
 @customer_bp.route('/', methods=['GET', 'OPTIONS'])
 @token_required
@@ -23,6 +35,13 @@ def list_customers():
       - Customers
     security:
       - bearerAuth: []
+    parameters:
+      - in: query
+        name: fields
+        schema:
+          type: string
+        required: false
+        description: Comma separated subset of customer fields to return
     responses:
       200:
         description: Customer list
@@ -32,11 +51,20 @@ def list_customers():
     """
     if request.method == 'OPTIONS':
         return jsonify({'message': 'OPTIONS request successful'}), 200
-    customers, message, status_code = CustomerService.get_all_customers()
-    return jsonify({
-        "message": message,
-        "customers": [CustomerResponseSchema().dump(c) for c in customers]
-    }), status_code
+    try:
+        fields = parse_fields(request.args.get('fields'), CUSTOMER_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def build():
+        customers, message, status_code = CustomerService.get_all_customers(fields=fields)
+        if fields:
+            customers_list = [serialize_fields(c, fields, CUSTOMER_LIST_FIELDS) for c in customers]
+        else:
+            customers_list = CustomerResponseSchema(many=True).dump(customers)
+        return {"message": message, "customers": customers_list}, status_code
+
+    return reference_lists.response('customer', tuple(fields) if fields else None, build)
 
 @customer_bp.route('', methods=['POST', 'OPTIONS'])
 @customer_bp.route('/', methods=['POST', 'OPTIONS'])
@@ -6,17 +6,75 @@ from ..models.user import UserRole
 from ..models.fuel_order import FuelOrder, FuelOrderStatus
 from ..services.fuel_order_service import FuelOrderService
 from ..models.fuel_truck import FuelTruck
+from ..models.ramp_spot import RampSpot
 from ..schemas import OrderStatusCountsResponseSchema, ErrorResponseSchema
 from ..extensions import db
 from ..models.aircraft import Aircraft
 from ..services.aircraft_service import AircraftService
+from ..utils.fieldsets import parse_fields, serialize_fields
+from ..utils.idempotency import idempotent
+from ..utils.metrics import FUEL_ORDERS_COMPLETED, FUEL_ORDERS_DISPATCHED
+from ..utils.spatial_index import ramp_index
 
 # Create the blueprint for fuel order routes
 fuel_order_bp = Blueprint('fuel_order_bp', __name__)
 
 # Special value for auto-assigning LST
 AUTO_ASSIGN_LST_ID = -1  # If this value is provided, backend will auto-select least busy LST
-AUTO_ASSIGN_TRUCK_ID = -1 # If this value is provided, backend will auto-select an available truck
+AUTO_ASSIGN_TRUCK_ID = -1 # If this value is provided, backend will auto-select the nearest compatible truck
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+def _str_or_none(value):
+    return str(value) if value else None
+
+# Fields selectable via ?fields= on the fuel order list, and how to serialize each one
+FUEL_ORDER_LIST_FIELDS = {
+    'id': lambda o: o.id,
+    'status': lambda o: o.status.value,
+    'tail_number': lambda o: o.tail_number,
+    'customer_id': lambda o: o.customer_id,
+    'fuel_type': lambda o: o.fuel_type,
+    'additive_requested': lambda o: o.additive_requested,
+    'requested_amount': lambda o: _str_or_none(o.requested_amount),
+    'assigned_lst_user_id': lambda o: o.assigned_lst_user_id,
+    'assigned_truck_id': lambda o: o.assigned_truck_id,
+    'location_on_ramp': lambda o: o.location_on_ramp,
+    'ramp_spot_id': lambda o: o.ramp_spot_id,
+    'csr_notes': lambda o: o.csr_notes,
+    'lst_notes': lambda o: o.lst_notes,
+    'start_meter_reading': lambda o: _str_or_none(o.start_meter_reading),
+    'end_meter_reading': lambda o: _str_or_none(o.end_meter_reading),
+    'calculated_gallons_dispensed': lambda o: _str_or_none(o.calculated_gallons_dispensed),
+    'created_at': lambda o: _iso(o.created_at),
+    'updated_at': lambda o: _iso(o.updated_at),
+    'dispatch_timestamp': lambda o: _iso(o.dispatch_timestamp),
+    'acknowledge_timestamp': lambda o: _iso(o.acknowledge_timestamp),
+    'en_route_timestamp': lambda o: _iso(o.en_route_timestamp),
+    'fueling_start_timestamp': lambda o: _iso(o.fueling_start_timestamp),
+    'completion_timestamp': lambda o: _iso(o.completion_timestamp),
+    'reviewed_timestamp': lambda o: _iso(o.reviewed_timestamp),
+    'reviewed_by_csr_user_id': lambda o: o.reviewed_by_csr_user_id,
+}
+
+def _pagination_dict(paginated_result):
+    return {
+        "page": paginated_result.page,
+        "per_page": paginated_result.per_page,
+        "total": paginated_result.total,
+        "pages": paginated_result.pages,
+        "has_next": paginated_result.has_next,
+        "has_prev": paginated_result.has_prev
+    }
+
+# Fields returned when the client does not pass ?fields=
+DEFAULT_FUEL_ORDER_LIST_FIELDS = (
+    'id', 'tail_number', 'customer_id', 'fuel_type', 'additive_requested',
+    'requested_amount', 'assigned_lst_user_id', 'assigned_truck_id',
+    'location_on_ramp', 'csr_notes', 'status', 'created_at'
+)
 
 @fuel_order_bp.route('/stats/status-counts', methods=['GET', 'OPTIONS'])
 @fuel_order_bp.route('/stats/status-counts/', methods=['GET', 'OPTIONS'])
@@ -40,6 +98,7 @@ def get_status_counts():
 @fuel_order_bp.route('/', methods=['POST', 'OPTIONS'])
 @token_required
 @require_permission('CREATE_ORDER')
+@idempotent
 def create_fuel_order():
     if request.method == 'OPTIONS':
         # Pre-flight request. Reply successfully:
@@ -54,7 +113,9 @@ def create_fuel_order():
     logger.info('Entered create_fuel_order')
     logger.info('Request data: %s', request.get_json())
     """Create a new fuel order.
-    Requires CREATE_ORDER permission. If assigned_lst_user_id is -1, the backend will auto-assign the least busy active LST.
+    Requires CREATE_ORDER permission. If assigned_lst_user_id is -1, the backend will auto-assign the least busy active LST;
+    if it is null, the order is queued for an LST to claim via POST /api/fuel-orders/claim-next.
+    If assigned_truck_id is -1, it picks the compatible truck nearest to ramp_spot_id.
     ---
     tags:
       - Fuel Orders
@@ -126,6 +187,9 @@ def create_fuel_order():
             logger.error('Step 2.1: Missing required field: %s', field)
             return jsonify({"error": f"Missing required field: {field}"}), 400
         if field == 'assigned_lst_user_id':
+            if data[field] is None:
+                # Left unassigned: the order waits in the queue for an LST to claim it
+                continue
             try:
                 data[field] = int(data[field])
                 if data[field] != AUTO_ASSIGN_LST_ID and data[field] <= 0: # Assuming positive IDs or -1
@@ -195,49 +259,36 @@ def create_fuel_order():
 
     # --- END AIRCRAFT GET OR CREATE ---
 
-    # LST Auto-assignment
-    if data['assigned_lst_user_id'] == AUTO_ASSIGN_LST_ID:
+    # Ramp spot (optional): structured location of the aircraft on the ramp
+    ramp_spot = None
+    if data.get('ramp_spot_id') is not None:
         try:
-            from src.services.user_service import UserService
-            from src.models.user import UserRole
-            # Get all active LST users
-            lst_users, _, _ = UserService.get_users({'role': UserRole.LST, 'is_active': True})
-            if not lst_users:
-                logger.error('No active LST users found for auto-assignment')
-                return jsonify({"error": "No active LST users available for auto-assignment"}), 400
-            # Find the LST with the fewest active/in-progress orders
-            least_busy = None
-            min_orders = None
-            for lst in lst_users:
-                count = FuelOrder.query.filter(
-                    FuelOrder.assigned_lst_user_id == lst.id,
-                    FuelOrder.status.in_([
-                        FuelOrderStatus.DISPATCHED,
-                        FuelOrderStatus.ACKNOWLEDGED,
-                        FuelOrderStatus.EN_ROUTE,
-                        FuelOrderStatus.FUELING
-                    ])
-                ).count()
-                if min_orders is None or count < min_orders:
-                    min_orders = count
-                    least_busy = lst
-            if not least_busy:
-                logger.error('Auto-assign logic failed to select an LST')
-                return jsonify({"error": "Auto-assign failed to select an LST"}), 400
-            data['assigned_lst_user_id'] = least_busy.id
-            logger.info(f"Auto-assigned LST user_id {least_busy.id} (username={least_busy.username}) with {min_orders} active orders.")
-        except Exception as e:
-            logger.error(f"Error during auto-assignment of LST: {str(e)}")
-            return jsonify({"error": f"Error during auto-assignment of LST: {str(e)}"}), 500
-    # --- END LST AUTO-ASSIGN ---
+            data['ramp_spot_id'] = int(data['ramp_spot_id'])
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid type for field: ramp_spot_id (must be integer)"}), 400
+        ramp_spot = RampSpot.query.filter_by(id=data['ramp_spot_id'], is_active=True).first()
+        if not ramp_spot:
+            return jsonify({"error": f"Active ramp spot with ID {data['ramp_spot_id']} not found"}), 400
+        if not data.get('location_on_ramp'):
+            data['location_on_ramp'] = ramp_spot.code
+
+    # LST auto-assignment happens when the order is committed, so the choice
+    # is made while holding the LST's row lock (see FuelOrderService)
+    auto_assign_lst = data['assigned_lst_user_id'] == AUTO_ASSIGN_LST_ID
 
     # Truck Auto-assignment
     if data['assigned_truck_id'] == AUTO_ASSIGN_TRUCK_ID:
         try:
-            # Get all active FuelTrucks
-            # For simplicity, picking the first active one.
-            # Future enhancement: more sophisticated selection logic (e.g., fuel type compatibility, availability)
-            active_truck = FuelTruck.query.filter(FuelTruck.is_active == True).first()
+            active_truck = None
+            if ramp_spot is not None:
+                # Nearest positioned truck carrying this fuel with room for the requested amount
+                ramp_index.ensure_loaded()
+                nearest = ramp_index.nearest_trucks(ramp_spot.x, ramp_spot.y, data['fuel_type'], data['requested_amount'])
+                if nearest:
+                    active_truck = FuelTruck.query.get(nearest[0]['id'])
+            if active_truck is None:
+                # No spot or no positioned compatible truck: fall back to the first active one
+                active_truck = FuelTruck.query.filter(FuelTruck.is_active == True).first()
             
             if not active_truck:
                 logger.error('No active FuelTrucks found for auto-assignment')
@@ -284,15 +335,23 @@ def create_fuel_order():
             fuel_type=data['fuel_type'],
             additive_requested=data.get('additive_requested', False),
             requested_amount=data['requested_amount'],
-            assigned_lst_user_id=data['assigned_lst_user_id'],
+            assigned_lst_user_id=None if auto_assign_lst else data['assigned_lst_user_id'],
             assigned_truck_id=data['assigned_truck_id'],
-            location_on_ramp=data['location_on_ramp'],
+            location_on_ramp=data.get('location_on_ramp'),
+            ramp_spot_id=data.get('ramp_spot_id'),
             csr_notes=data.get('csr_notes')
         )
         logger.info('Step 5: FuelOrder object created')
         db.session.add(fuel_order)
         logger.info('Step 6: FuelOrder added to session')
-        db.session.commit()
+        if auto_assign_lst:
+            lst_id, message, status_code = FuelOrderService.commit_with_auto_assigned_lst(fuel_order)
+            if lst_id is None:
+                return jsonify({"error": message}), status_code
+            logger.info(f"Auto-assigned LST user_id {lst_id}.")
+        else:
+            db.session.commit()
+        FUEL_ORDERS_DISPATCHED.inc()
         logger.info('Step 7: FuelOrder committed')
         return jsonify({
             'message': 'Fuel order created successfully',
@@ -306,6 +365,7 @@ def create_fuel_order():
                 'assigned_lst_user_id': fuel_order.assigned_lst_user_id,
                 'assigned_truck_id': fuel_order.assigned_truck_id,
                 'location_on_ramp': fuel_order.location_on_ramp,
+                'ramp_spot_id': fuel_order.ramp_spot_id,
                 'csr_notes': fuel_order.csr_notes,
                 'status': fuel_order.status.value,
                 'created_at': fuel_order.created_at.isoformat()
@@ -325,39 +385,20 @@ def get_fuel_orders():
         current_app.logger.info(f"[get_fuel_orders] User: {getattr(g, 'current_user', None)} | Args: {request.args}")
         from src.services.fuel_order_service import FuelOrderService
         filters = dict(request.args)
-        paginated_result, message = FuelOrderService.get_fuel_orders(current_user=g.current_user, filters=filters)
+        try:
+            fields = parse_fields(request.args.get('fields'), FUEL_ORDER_LIST_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        paginated_result, message = FuelOrderService.get_fuel_orders(current_user=g.current_user, filters=filters, fields=fields)
         if paginated_result is not None:
-            orders_list = []
-            for order in paginated_result.items:
-                # Use a custom to_dict if available, else fallback to basic fields
-                if hasattr(order, 'to_dict'):
-                    orders_list.append(order.to_dict())
-                else:
-                    orders_list.append({
-                        'id': order.id,
-                        'tail_number': order.tail_number,
-                        'customer_id': order.customer_id,
-                        'fuel_type': order.fuel_type,
-                        'additive_requested': order.additive_requested,
-                        'requested_amount': str(order.requested_amount) if order.requested_amount else None,
-                        'assigned_lst_user_id': order.assigned_lst_user_id,
-                        'assigned_truck_id': order.assigned_truck_id,
-                        'location_on_ramp': order.location_on_ramp,
-                        'csr_notes': order.csr_notes,
-                        'status': order.status.value,
-                        'created_at': order.created_at.isoformat() if order.created_at else None
-                    })
+            orders_list = [
+                serialize_fields(order, fields or DEFAULT_FUEL_ORDER_LIST_FIELDS, FUEL_ORDER_LIST_FIELDS)
+                for order in paginated_result.items
+            ]
             response = {
                 "orders": orders_list,
                 "message": message,
-                "pagination": {
-                    "page": paginated_result.page,
-                    "per_page": paginated_result.per_page,
-                    "total": paginated_result.total,
-                    "pages": paginated_result.pages,
-                    "has_next": paginated_result.has_next,
-                    "has_prev": paginated_result.has_prev
-                }
+                "pagination": _pagination_dict(paginated_result)
             }
             return jsonify(response), 200
         else:
@@ -366,6 +407,101 @@ def get_fuel_orders():
         current_app.logger.error(f"Unhandled exception in get_fuel_orders route: {str(e)}\n{traceback.format_exc()}")
         return jsonify({"error": "An internal server error occurred in get_fuel_orders route.", "details": str(e)}), 500
 
+@fuel_order_bp.route('/search', methods=['GET', 'OPTIONS'])
+@token_required
+def search_fuel_orders():
+    """Full-text search over fuel orders.
+    Matches tail number, ramp location, CSR notes and LST notes, ranked by relevance.
+    Users without VIEW_ALL_ORDERS only see orders assigned to them.
+    ---
+    tags:
+      - Fuel Orders
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: query
+        name: q
+        schema:
+          type: string
+        required: true
+        description: Search text (e.g. "fuel cap")
+      - in: query
+        name: page
+        schema:
+          type: integer
+        required: false
+      - in: query
+        name: per_page
+        schema:
+          type: integer
+        required: false
+      - in: query
+        name: fields
+        schema:
+          type: string
+        required: false
+        description: Comma separated subset of order fields to return
+      - in: query
+        name: date_from
+        schema:
+          type: string
+          format: date
+        required: false
+        description: Only orders created on or after this date
+      - in: query
+        name: date_to
+        schema:
+          type: string
+          format: date
+        required: false
+        description: Only orders created on or before this date
+    responses:
+      200:
+        description: Ranked search results
+        content:
+          application/json:
+            schema: FuelOrderListResponseSchema
+      400:
+        description: Bad Request (missing query or invalid fields)
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      401:
+        description: Unauthorized
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      500:
+        description: Server error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'OPTIONS request successful'}), 200
+    try:
+        fields = parse_fields(request.args.get('fields'), FUEL_ORDER_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results, message, status_code = FuelOrderService.search_fuel_orders(
+        current_user=g.current_user,
+        search_text=request.args.get('q', ''),
+        filters=dict(request.args),
+        fields=fields
+    )
+    if results is None:
+        return jsonify({"error": message}), status_code
+
+    return jsonify({
+        "orders": [
+            serialize_fields(order, fields or DEFAULT_FUEL_ORDER_LIST_FIELDS, FUEL_ORDER_LIST_FIELDS)
+            for order in results.items
+        ],
+        "message": message,
+        "pagination": _pagination_dict(results)
+    }), status_code
+
 @fuel_order_bp.route('/<int:order_id>', methods=['GET'])
 @token_required
 def get_fuel_order(order_id):
@@ -430,6 +566,7 @@ def get_fuel_order(order_id):
             "assigned_lst_user_id": order.assigned_lst_user_id,  # Consider joining/fetching LST name later
             "assigned_truck_id": order.assigned_truck_id,  # Consider joining/fetching truck name later
             "location_on_ramp": order.location_on_ramp,
+            "ramp_spot_id": order.ramp_spot_id,
             "csr_notes": order.csr_notes,
             "start_meter_reading": str(order.start_meter_reading) if order.start_meter_reading else None,
             "end_meter_reading": str(order.end_meter_reading) if order.end_meter_reading else None,
@@ -451,6 +588,7 @@ def get_fuel_order(order_id):
 
 @fuel_order_bp.route('/<int:order_id>/status', methods=['PATCH'])
 @token_required
+@idempotent
 def update_fuel_order_status(order_id):
     """Update a fuel order's status.
     ---
@@ -465,6 +603,12 @@ def update_fuel_order_status(order_id):
           type: integer
         required: true
         description: ID of the fuel order to update
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+        required: false
+        description: Client-generated key; retries with the same key replay the first response
     requestBody:
       required: true
       content:
@@ -540,9 +684,12 @@ def update_fuel_order_status(order_id):
             print(f"Valid status values: {list(FuelOrderStatus.__members__.keys())}")
             return jsonify({"error": f"Invalid status value: {data['status']}"}), 400
             
+        previous_status = fuel_order.status
         fuel_order.status = FuelOrderStatus[status_value]
         fuel_order.assigned_truck_id = data['assigned_truck_id']
         db.session.commit()
+        if fuel_order.status == FuelOrderStatus.COMPLETED and previous_status != FuelOrderStatus.COMPLETED:
+            FUEL_ORDERS_COMPLETED.inc()
         
         return jsonify({
             'id': fuel_order.id,
@@ -568,6 +715,7 @@ def update_fuel_order_status(order_id):
 @fuel_order_bp.route('/<int:order_id>/submit-data', methods=['PUT'])
 @token_required
 @require_permission('COMPLETE_ORDER')
+@idempotent
 def submit_fuel_data(order_id):
     """Submit fuel meter readings and notes for a fuel order.
     Requires COMPLETE_ORDER permission. Order must be in FUELING status.
@@ -583,6 +731,12 @@ def submit_fuel_data(order_id):
           type: integer
         required: true
         description: ID of the fuel order
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+        required: false
+        description: Client-generated key; retries with the same key replay the first response
     requestBody:
       required: true
       content:
@@ -677,6 +831,7 @@ def submit_fuel_data(order_id):
         fuel_order.completion_timestamp = datetime.utcnow()
         
         db.session.commit()
+        FUEL_ORDERS_COMPLETED.inc()
         
         return jsonify({
             "message": "Fuel data submitted successfully",
@@ -696,9 +851,314 @@ def submit_fuel_data(order_id):
         db.session.rollback()
         return jsonify({"error": f"Error submitting fuel data: {str(e)}"}), 500
 
+@fuel_order_bp.route('/sync', methods=['POST', 'OPTIONS'])
+@token_required
+@require_permission('UPDATE_OWN_ORDER_STATUS')
+@idempotent
+def sync_fuel_order_transitions():
+    """Apply status changes an LST queued while offline, in one round trip.
+    Requires UPDATE_OWN_ORDER_STATUS permission (COMPLETE_OWN_ORDER for COMPLETED items).
+    Items are applied in order and validated like PATCH /<id>/status and
+    PUT /<id>/submit-data; client timestamps are kept as the stage timestamps.
+    ---
+    tags:
+      - Fuel Orders
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+        required: false
+        description: Client-generated key; retries with the same key replay the first response
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              items:
+                type: array
+                description: Queued transitions in the order they happened (at most 500)
+                items:
+                  type: object
+                  properties:
+                    order_id:
+                      type: integer
+                    status:
+                      type: string
+                      description: ACKNOWLEDGED, EN_ROUTE, FUELING or COMPLETED
+                    timestamp:
+                      type: string
+                      format: date-time
+                      description: When the change happened on the device
+                    start_meter_reading:
+                      type: string
+                      description: Required for COMPLETED
+                    end_meter_reading:
+                      type: string
+                      description: Required for COMPLETED
+                    lst_notes:
+                      type: string
+    responses:
+      200:
+        description: Per-item results (applied, conflict or rejected) and the resulting status of each order
+      400:
+        description: Bad Request (missing or oversized items list)
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      401:
+        description: Unauthorized
+      500:
+        description: Server error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object."}), 400
+
+    result, message, status_code = FuelOrderService.sync_status_transitions(
+        items=data.get('items'),
+        current_user=g.current_user
+    )
+    if result is None:
+        return jsonify({"error": message}), status_code
+    return jsonify(dict(result, message=message)), status_code
+
+@fuel_order_bp.route('/optimize-assignments', methods=['POST', 'OPTIONS'])
+@token_required
+@require_permission('EDIT_FUEL_ORDER')
+@idempotent
+def optimize_fuel_order_assignments():
+    """Re-plan LST and truck assignments of all dispatched, unacknowledged orders.
+    Requires EDIT_FUEL_ORDER permission. Balances load across active LSTs and
+    trucks, keeps trucks compatible with each order's fuel type and amount, and
+    prefers leaving orders where they are. With dry_run the plan is only returned.
+    ---
+    tags:
+      - Fuel Orders
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+        required: false
+        description: Client-generated key; retries with the same key replay the first response
+    requestBody:
+      required: false
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              dry_run:
+                type: boolean
+                default: false
+                description: Return the plan without reassigning any order
+    responses:
+      200:
+        description: Plan computed (and applied unless dry_run); `plan` has one entry per pending order with current and planned lst_user_id/truck_id
+      400:
+        description: Bad Request (dry_run is not a boolean)
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (missing permission)
+      500:
+        description: Server error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object."}), 400
+    dry_run = data.get('dry_run', False)
+    if not isinstance(dry_run, bool):
+        return jsonify({"error": "'dry_run' must be a boolean."}), 400
+
+    result, message, status_code = FuelOrderService.optimize_assignments(dry_run=dry_run)
+    if result is None:
+        return jsonify({"error": message}), status_code
+    return jsonify(dict(result, message=message)), status_code
+
+@fuel_order_bp.route('/claim-next', methods=['POST', 'OPTIONS'])
+@token_required
+@require_permission('UPDATE_OWN_ORDER_STATUS')
+@idempotent
+def claim_next_fuel_order():
+    """Claim the oldest unassigned dispatched order (pull mode).
+    Requires UPDATE_OWN_ORDER_STATUS permission. The order is assigned to the
+    caller and acknowledged. LSTs claiming at the same time never receive the
+    same order and do not wait on each other.
+    ---
+    tags:
+      - Fuel Orders
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+        required: false
+        description: Client-generated key; retries with the same key replay the first response
+    requestBody:
+      required: false
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              truck_id:
+                type: integer
+                description: Only claim orders this truck can serve (fuel type, capacity) and assign it with the order
+              fuel_type:
+                type: string
+                description: Only claim orders for this fuel type (ignored when truck_id is given)
+    responses:
+      200:
+        description: The claimed order, or `fuel_order` null when no compatible order is waiting
+      400:
+        description: Bad Request (invalid truck_id or fuel_type)
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (missing permission)
+      409:
+        description: Caller is at the active order limit, or every candidate was claimed first (retry)
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      500:
+        description: Server error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object."}), 400
+    truck_id = data.get('truck_id')
+    if truck_id is not None and (not isinstance(truck_id, int) or isinstance(truck_id, bool)):
+        return jsonify({"error": "'truck_id' must be an integer."}), 400
+    fuel_type = data.get('fuel_type')
+    if fuel_type is not None and (not isinstance(fuel_type, str) or not fuel_type.strip()):
+        return jsonify({"error": "'fuel_type' must be a non-empty string."}), 400
+
+    order, message, status_code = FuelOrderService.claim_next_order(
+        g.current_user, truck_id=truck_id, fuel_type=fuel_type
+    )
+    if status_code != 200:
+        return jsonify({"error": message}), status_code
+    if order is None:
+        return jsonify({"message": message, "fuel_order": None}), 200
+    return jsonify({"message": message, "fuel_order": {
+        'id': order.id,
+        'status': order.status.value,
+        'tail_number': order.tail_number,
+        'fuel_type': order.fuel_type,
+        'requested_amount': _str_or_none(order.requested_amount),
+        'assigned_lst_user_id': order.assigned_lst_user_id,
+        'assigned_truck_id': order.assigned_truck_id,
+        'location_on_ramp': order.location_on_ramp,
+        'ramp_spot_id': order.ramp_spot_id,
+        'csr_notes': order.csr_notes,
+        'created_at': _iso(order.created_at),
+        'acknowledge_timestamp': _iso(order.acknowledge_timestamp),
+    }}), 200
+
+@fuel_order_bp.route('/review', methods=['PATCH'])
+@token_required
+@require_permission('REVIEW_ORDERS')
+@idempotent
+def review_fuel_orders_bulk():
+    """Mark many completed fuel orders as reviewed in one request.
+    Requires REVIEW_ORDERS permission. Orders not in COMPLETED state are skipped.
+    ---
+    tags:
+      - Fuel Orders
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+        required: false
+        description: Client-generated key; retries with the same key replay the first response
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              order_ids:
+                type: array
+                items:
+                  type: integer
+                description: Orders to review (at most 1000)
+              filter:
+                type: object
+                description: Review all COMPLETED orders matching this filter instead of a list of ids
+                properties:
+                  assigned_lst_user_id:
+                    type: integer
+                  date_from:
+                    type: string
+                    format: date
+                  date_to:
+                    type: string
+                    format: date
+    responses:
+      200:
+        description: Orders reviewed; `reviewed` lists the updated ids and `skipped` the ids left alone with a reason
+      400:
+        description: Bad Request (neither or both of order_ids and filter, invalid values)
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (missing permission)
+      500:
+        description: Server error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object."}), 400
+
+    result, message, status_code = FuelOrderService.review_fuel_orders(
+        reviewer_user=g.current_user,
+        order_ids=data.get('order_ids'),
+        filters=data.get('filter')
+    )
+    if result is None:
+        return jsonify({"error": message}), status_code
+    return jsonify(dict(result, message=message)), status_code
+
 @fuel_order_bp.route('/<int:order_id>/review', methods=['PATCH'])
 @token_required
 @require_permission('REVIEW_ORDERS')
+@idempotent
 def review_fuel_order(order_id):
     """Mark a completed fuel order as reviewed.
     Requires REVIEW_ORDERS permission. Order must be in COMPLETED state.
@@ -714,6 +1174,12 @@ def review_fuel_order(order_id):
           type: integer
         required: true
         description: ID of the fuel order to review
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+        required: false
+        description: Client-generated key; retries with the same key replay the first response
     responses:
       200:
         description: Fuel order marked as reviewed successfully
@@ -776,6 +1242,27 @@ def export_fuel_orders_csv():
       - Fuel Orders
     security:
       - bearerAuth: []
+    parameters:
+      - in: query
+        name: status
+        schema:
+          type: string
+        required: false
+        description: Status to export (defaults to REVIEWED)
+      - in: query
+        name: date_from
+        schema:
+          type: string
+          format: date
+        required: false
+        description: Only orders created on or after this date
+      - in: query
+        name: date_to
+        schema:
+          type: string
+          format: date
+        required: false
+        description: Only orders created on or before this date
     responses:
       200:
         description: CSV file exported successfully
@@ -788,8 +1275,9 @@ def export_fuel_orders_csv():
     """
     # Extract filter parameters from request.args
     filters = {
-        'status': request.args.get('status', None, type=str)
-        # TODO: Add date_from, date_to filters later
+        'status': request.args.get('status', None, type=str),
+        'date_from': request.args.get('date_from', None, type=str),
+        'date_to': request.args.get('date_to', None, type=str)
     }
 
     # Call service method to generate CSV data
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify, g
 from ..utils.decorators import token_required, require_permission
 from ..models.user import UserRole
 from ..services import FuelTruckService
+from ..utils.fieldsets import parse_fields, serialize_fields
+from ..utils.reference_cache import reference_lists
 from ..schemas import (
     FuelTruckListResponseSchema,
     FuelTruckCreateRequestSchema,
@@ -9,10 +11,26 @@ from ..schemas import (
     FuelTruckSchema,
     ErrorResponseSchema
 )
+from ..schemas.fuel_truck_schemas import FuelTruckPositionRequestSchema
 
 # Create the blueprint for fuel truck routes
 truck_bp = Blueprint('truck_bp', __name__, url_prefix='/api/fuel-trucks')
 
+# Fields selectable via ?fields= on the truck list (mirrors FuelTruck.to_dict)
+FUEL_TRUCK_LIST_FIELDS = {
+    'id': lambda t: t.id,
+    'truck_number': lambda t: t.truck_number,
+    'fuel_type': lambda t: t.fuel_type,
+    'capacity': lambda t: float(t.capacity),
+    'current_meter_reading': lambda t: float(t.current_meter_reading),
+    'is_active': lambda t: t.is_active,
+    'last_x': lambda t: t.last_x,
+    'last_y': lambda t: t.last_y,
+    'position_updated_at': lambda t: t.position_updated_at.isoformat() if t.position_updated_at else None,
+    'created_at': lambda t: t.created_at.isoformat(),
+    'updated_at': lambda t: t.updated_at.isoformat(),
+}
+
 @truck_bp.route('', methods=['GET', 'OPTIONS'])
 @truck_bp.route('/', methods=['GET', 'OPTIONS'])
 @token_required
@@ -35,6 +53,12 @@ def get_fuel_trucks():
           enum: ['true', 'false']
         required: false
         description: Filter trucks by active status ('true' or 'false')
+      - in: query
+        name: fields
+        schema:
+          type: string
+        required: false
+        description: Comma separated subset of truck fields to return
     responses:
       200:
         description: List of fuel trucks retrieved successfully
@@ -67,19 +91,24 @@ def get_fuel_trucks():
         'is_active': request.args.get('is_active', None, type=str)
     }
     filters = {k: v for k, v in filters.items() if v is not None}
+    try:
+        fields = parse_fields(request.args.get('fields'), FUEL_TRUCK_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    # Call FuelTruckService to get trucks with filters
-    trucks, message, status_code = FuelTruckService.get_trucks(filters=filters)
+    def build():
+        # Call FuelTruckService to get trucks with filters
+        trucks, message, status_code = FuelTruckService.get_trucks(filters=filters, fields=fields)
+        if trucks is None:
+            return {"error": message}, status_code
+        if fields:
+            trucks_list = [serialize_fields(truck, fields, FUEL_TRUCK_LIST_FIELDS) for truck in trucks]
+        else:
+            trucks_list = [truck.to_dict() for truck in trucks]
+        return {"message": message, "fuel_trucks": trucks_list}, status_code
 
-    if trucks is not None:
-        trucks_list = [truck.to_dict() for truck in trucks]
-        response = {
-            "message": message,
-            "fuel_trucks": trucks_list
-        }
-        return jsonify(response), status_code
-    else:
-        return jsonify({"error": message}), status_code
+    variant = (filters.get('is_active'), tuple(fields) if fields else None)
+    return reference_lists.response('fuel_truck', variant, build)
 
 @truck_bp.route('/', methods=['POST'])
 @token_required
@@ -266,6 +295,70 @@ def update_fuel_truck(truck_id):
     else:
         return jsonify({"error": message}), status_code
 
+@truck_bp.route('/<int:truck_id>/position', methods=['PUT'])
+@token_required
+@require_permission('UPDATE_OWN_ORDER_STATUS')
+def update_fuel_truck_position(truck_id):
+    """Report where a fuel truck is on the ramp.
+    Requires UPDATE_OWN_ORDER_STATUS permission (LSTs drive the trucks). Give either
+    ramp_spot_id or x/y in metres on the ramp grid. Trucks are also placed at an
+    order's ramp spot automatically when fueling starts.
+    ---
+    tags:
+      - Fuel Trucks
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: truck_id
+        schema:
+          type: integer
+        required: true
+        description: ID of the fuel truck
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema: FuelTruckPositionRequestSchema
+    responses:
+      200:
+        description: Position recorded
+        content:
+          application/json:
+            schema: FuelTruckSchema
+      400:
+        description: Bad Request (neither ramp_spot_id nor x/y, unknown spot)
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (missing permission)
+      404:
+        description: Fuel truck not found
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      500:
+        description: Server error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    try:
+        data = FuelTruckPositionRequestSchema().load(request.get_json(silent=True) or {})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    truck, message, status_code = FuelTruckService.update_position(truck_id, data)
+    if truck is not None:
+        return jsonify({
+            "message": message,
+            "fuel_truck": FuelTruckSchema().dump(truck)
+        }), status_code
+    else:
+        return jsonify({"error": message}), status_code
+
 @truck_bp.route('/<int:truck_id>', methods=['DELETE'])
 @token_required
 @require_permission('MANAGE_TRUCKS')
@@ -0,0 +1,258 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from marshmallow import ValidationError
+from ..utils.decorators import token_required, require_permission
+from ..services.lst_shift_service import LSTShiftService
+from ..schemas.lst_shift_schemas import (
+    LSTShiftCreateSchema,
+    LSTShiftUpdateSchema,
+    LSTShiftResponseSchema,
+    to_utc
+)
+
+lst_shift_bp = Blueprint('lst_shift_bp', __name__, url_prefix='/api/lst-shifts')
+
+@lst_shift_bp.route('', methods=['GET', 'OPTIONS'])
+@lst_shift_bp.route('/', methods=['GET', 'OPTIONS'])
+@token_required
+@require_permission('VIEW_USERS')
+def list_lst_shifts():
+    """Get rostered LST shifts (VIEW_USERS permission required).
+    ---
+    tags:
+      - LST Shifts
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: query
+        name: user_id
+        schema:
+          type: integer
+        required: false
+        description: Only shifts of this user
+      - in: query
+        name: date_from
+        schema:
+          type: string
+          format: date-time
+        required: false
+        description: Only shifts ending after this time (UTC)
+      - in: query
+        name: date_to
+        schema:
+          type: string
+          format: date-time
+        required: false
+        description: Only shifts starting before this time (UTC)
+    responses:
+      200:
+        description: Shifts ordered by start time
+        content:
+          application/json:
+            schema: LSTShiftListSchema
+      400:
+        description: Invalid filter
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'OPTIONS request successful'}), 200
+    shifts, message, status_code = LSTShiftService.get_shifts(request.args.to_dict())
+    if status_code != 200:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "shifts": LSTShiftResponseSchema(many=True).dump(shifts)}), status_code
+
+@lst_shift_bp.route('', methods=['POST'])
+@lst_shift_bp.route('/', methods=['POST'])
+@token_required
+@require_permission('MANAGE_USERS')
+def create_lst_shift():
+    """Roster a shift for an LST (MANAGE_USERS permission required).
+    Times without a UTC offset are taken as UTC.
+    ---
+    tags:
+      - LST Shifts
+    security:
+      - bearerAuth: []
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema: LSTShiftCreateSchema
+    responses:
+      201:
+        description: Shift created
+        content:
+          application/json:
+            schema: LSTShiftResponseSchema
+      400:
+        description: Validation error, or the user is not an active LST
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      409:
+        description: The shift overlaps another shift of the same LST
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    try:
+        data = LSTShiftCreateSchema().load(request.get_json() or {})
+    except ValidationError as e:
+        return jsonify({"error": "Validation error", "details": e.messages}), 400
+    shift, message, status_code = LSTShiftService.create_shift(data)
+    if shift is None:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "shift": LSTShiftResponseSchema().dump(shift)}), status_code
+
+@lst_shift_bp.route('/on-shift', methods=['GET'])
+@token_required
+@require_permission('VIEW_USERS')
+def get_lsts_on_shift():
+    """Get the LSTs working at a point in time (VIEW_USERS permission required).
+    LSTs on a break are not included. `roster_in_use` is false when no shifts
+    are rostered; auto-assignment then considers every active LST.
+    ---
+    tags:
+      - LST Shifts
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: query
+        name: at
+        schema:
+          type: string
+          format: date-time
+        required: false
+        description: Point in time (default now, UTC when no offset is given)
+    responses:
+      200:
+        description: LSTs on shift
+      400:
+        description: Invalid time
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    at = None
+    if request.args.get('at'):
+        try:
+            at = to_utc(datetime.fromisoformat(request.args['at']))
+        except ValueError:
+            return jsonify({"error": "'at' must be an ISO 8601 datetime."}), 400
+    result, message, status_code = LSTShiftService.get_on_shift(at)
+    return jsonify(dict(result, message=message)), status_code
+
+@lst_shift_bp.route('/<int:shift_id>', methods=['GET'])
+@token_required
+@require_permission('VIEW_USERS')
+def get_lst_shift(shift_id):
+    """Get a shift by ID (VIEW_USERS permission required).
+    ---
+    tags:
+      - LST Shifts
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: shift_id
+        schema:
+          type: integer
+        required: true
+    responses:
+      200:
+        description: Shift details
+        content:
+          application/json:
+            schema: LSTShiftResponseSchema
+      404:
+        description: Shift not found
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    shift, message, status_code = LSTShiftService.get_shift_by_id(shift_id)
+    if shift is None:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "shift": LSTShiftResponseSchema().dump(shift)}), status_code
+
+@lst_shift_bp.route('/<int:shift_id>', methods=['PATCH'])
+@token_required
+@require_permission('MANAGE_USERS')
+def update_lst_shift(shift_id):
+    """Update a shift (MANAGE_USERS permission required).
+    Sending `breaks` replaces all breaks of the shift.
+    ---
+    tags:
+      - LST Shifts
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: shift_id
+        schema:
+          type: integer
+        required: true
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema: LSTShiftUpdateSchema
+    responses:
+      200:
+        description: Shift updated
+        content:
+          application/json:
+            schema: LSTShiftResponseSchema
+      400:
+        description: Validation error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      404:
+        description: Shift not found
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      409:
+        description: The shift overlaps another shift of the same LST
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    try:
+        data = LSTShiftUpdateSchema().load(request.get_json() or {})
+    except ValidationError as e:
+        return jsonify({"error": "Validation error", "details": e.messages}), 400
+    shift, message, status_code = LSTShiftService.update_shift(shift_id, data)
+    if shift is None:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "shift": LSTShiftResponseSchema().dump(shift)}), status_code
+
+@lst_shift_bp.route('/<int:shift_id>', methods=['DELETE'])
+@token_required
+@require_permission('MANAGE_USERS')
+def delete_lst_shift(shift_id):
+    """Delete a shift (MANAGE_USERS permission required).
+    ---
+    tags:
+      - LST Shifts
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: shift_id
+        schema:
+          type: integer
+        required: true
+    responses:
+      200:
+        description: Shift deleted
+      404:
+        description: Shift not found
+    """
+    deleted, message, status_code = LSTShiftService.delete_shift(shift_id)
+    if not deleted:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message}), status_code
@@ -0,0 +1,316 @@
+from flask import Blueprint, request, jsonify
+from marshmallow import ValidationError
+from ..utils.decorators import token_required, require_permission
+from ..services.ramp_spot_service import RampSpotService
+from ..utils.spatial_index import ramp_index
+from ..schemas.ramp_spot_schemas import (
+    RampSpotCreateSchema,
+    RampSpotUpdateSchema,
+    RampSpotResponseSchema
+)
+
+ramp_spot_bp = Blueprint('ramp_spot_bp', __name__, url_prefix='/api/ramp-spots')
+
+# Upper bound on spots returned by one nearest-spot lookup
+MAX_NEAREST_SPOTS = 20
+
+@ramp_spot_bp.route('', methods=['GET', 'OPTIONS'])
+@ramp_spot_bp.route('/', methods=['GET', 'OPTIONS'])
+@token_required
+def list_ramp_spots():
+    """Get ramp spots (any authenticated user).
+    ---
+    tags:
+      - Ramp Spots
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: query
+        name: zone
+        schema:
+          type: string
+        required: false
+        description: Only spots in this zone
+      - in: query
+        name: is_active
+        schema:
+          type: string
+          enum: ['true', 'false']
+        required: false
+        description: Filter on active status
+    responses:
+      200:
+        description: Ramp spot list
+        content:
+          application/json:
+            schema: RampSpotListSchema
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'OPTIONS request successful'}), 200
+    spots, message, status_code = RampSpotService.get_spots(request.args.to_dict())
+    if status_code != 200:
+        return jsonify({"error": message}), status_code
+    return jsonify({
+        "message": message,
+        "ramp_spots": RampSpotResponseSchema(many=True).dump(spots)
+    }), status_code
+
+@ramp_spot_bp.route('', methods=['POST'])
+@ramp_spot_bp.route('/', methods=['POST'])
+@token_required
+@require_permission('MANAGE_SETTINGS')
+def create_ramp_spot():
+    """Create a ramp spot (MANAGE_SETTINGS permission required).
+    ---
+    tags:
+      - Ramp Spots
+    security:
+      - bearerAuth: []
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema: RampSpotCreateSchema
+    responses:
+      201:
+        description: Ramp spot created
+        content:
+          application/json:
+            schema: RampSpotResponseSchema
+      400:
+        description: Validation error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      409:
+        description: A spot with this code already exists
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    try:
+        data = RampSpotCreateSchema().load(request.get_json() or {})
+    except ValidationError as e:
+        return jsonify({"error": "Validation error", "details": e.messages}), 400
+    spot, message, status_code = RampSpotService.create_spot(data)
+    if spot is None:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "ramp_spot": RampSpotResponseSchema().dump(spot)}), status_code
+
+@ramp_spot_bp.route('/nearest', methods=['GET'])
+@token_required
+def nearest_ramp_spots():
+    """Find the active ramp spots closest to a point on the ramp grid.
+    ---
+    tags:
+      - Ramp Spots
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: query
+        name: x
+        schema:
+          type: number
+        required: true
+      - in: query
+        name: y
+        schema:
+          type: number
+        required: true
+      - in: query
+        name: limit
+        schema:
+          type: integer
+          default: 1
+        required: false
+        description: Number of spots to return (1-20)
+    responses:
+      200:
+        description: Closest spots first, each with its distance in metres
+      400:
+        description: Missing or invalid coordinates
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    x = request.args.get('x', type=float)
+    y = request.args.get('y', type=float)
+    if x is None or y is None:
+        return jsonify({"error": "Query parameters x and y are required numbers."}), 400
+    limit = max(1, min(request.args.get('limit', 1, type=int), MAX_NEAREST_SPOTS))
+    ramp_index.ensure_loaded()
+    return jsonify({
+        "message": "Nearest ramp spots retrieved successfully",
+        "ramp_spots": ramp_index.nearest_spots(x, y, limit)
+    }), 200
+
+@ramp_spot_bp.route('/<int:spot_id>', methods=['GET'])
+@token_required
+def get_ramp_spot(spot_id):
+    """Get a ramp spot by ID.
+    ---
+    tags:
+      - Ramp Spots
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: spot_id
+        schema:
+          type: integer
+        required: true
+    responses:
+      200:
+        description: Ramp spot details
+        content:
+          application/json:
+            schema: RampSpotResponseSchema
+      404:
+        description: Ramp spot not found
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    spot, message, status_code = RampSpotService.get_spot_by_id(spot_id)
+    if spot is None:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "ramp_spot": RampSpotResponseSchema().dump(spot)}), status_code
+
+@ramp_spot_bp.route('/<int:spot_id>', methods=['PATCH'])
+@token_required
+@require_permission('MANAGE_SETTINGS')
+def update_ramp_spot(spot_id):
+    """Update a ramp spot (MANAGE_SETTINGS permission required).
+    ---
+    tags:
+      - Ramp Spots
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: spot_id
+        schema:
+          type: integer
+        required: true
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema: RampSpotUpdateSchema
+    responses:
+      200:
+        description: Ramp spot updated
+        content:
+          application/json:
+            schema: RampSpotResponseSchema
+      400:
+        description: Validation error
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      404:
+        description: Ramp spot not found
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+      409:
+        description: A spot with this code already exists
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    try:
+        data = RampSpotUpdateSchema().load(request.get_json() or {})
+    except ValidationError as e:
+        return jsonify({"error": "Validation error", "details": e.messages}), 400
+    spot, message, status_code = RampSpotService.update_spot(spot_id, data)
+    if spot is None:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message, "ramp_spot": RampSpotResponseSchema().dump(spot)}), status_code
+
+@ramp_spot_bp.route('/<int:spot_id>', methods=['DELETE'])
+@token_required
+@require_permission('MANAGE_SETTINGS')
+def delete_ramp_spot(spot_id):
+    """Delete a ramp spot that no fuel order references (MANAGE_SETTINGS permission required).
+    ---
+    tags:
+      - Ramp Spots
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: spot_id
+        schema:
+          type: integer
+        required: true
+    responses:
+      200:
+        description: Ramp spot deleted
+      404:
+        description: Ramp spot not found
+      409:
+        description: Spot is referenced by fuel orders; deactivate it instead
+    """
+    deleted, message, status_code = RampSpotService.delete_spot(spot_id)
+    if not deleted:
+        return jsonify({"error": message}), status_code
+    return jsonify({"message": message}), status_code
+
+@ramp_spot_bp.route('/<int:spot_id>/nearest-trucks', methods=['GET'])
+@token_required
+@require_permission('VIEW_TRUCKS')
+def nearest_trucks_to_spot(spot_id):
+    """Find the active trucks closest to a ramp spot by last reported position.
+    Requires VIEW_TRUCKS permission. Trucks that never reported a position are not included.
+    ---
+    tags:
+      - Ramp Spots
+    security:
+      - bearerAuth: []
+    parameters:
+      - in: path
+        name: spot_id
+        schema:
+          type: integer
+        required: true
+      - in: query
+        name: fuel_type
+        schema:
+          type: string
+        required: false
+        description: Only trucks carrying this fuel type
+      - in: query
+        name: min_capacity
+        schema:
+          type: number
+        required: false
+        description: Only trucks with at least this capacity (gallons)
+      - in: query
+        name: limit
+        schema:
+          type: integer
+          default: 5
+        required: false
+        description: Number of trucks to return (1-20)
+    responses:
+      200:
+        description: Closest trucks first
+        content:
+          application/json:
+            schema: NearestTruckListSchema
+      404:
+        description: Active ramp spot not found
+        content:
+          application/json:
+            schema: ErrorResponseSchema
+    """
+    result, message, status_code = RampSpotService.nearest_trucks(
+        spot_id,
+        fuel_type=request.args.get('fuel_type'),
+        min_capacity=request.args.get('min_capacity', type=float),
+        limit=request.args.get('limit', 5, type=int)
+    )
+    if result is None:
+        return jsonify({"error": message}), status_code
+    return jsonify(dict(result, message=message)), status_code
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, g
 from ..utils.decorators import token_required, require_permission
 from ..models.user import UserRole
 from ..services.user_service import UserService
+from ..utils.fieldsets import parse_fields, serialize_fields
 from marshmallow import ValidationError
 from ..schemas import (
     UserCreateRequestSchema,
@@ -14,13 +15,25 @@ from ..schemas import (
 # Create blueprint for user routes
 user_bp = Blueprint('user_bp', __name__, url_prefix='/api/users')
 
+# Fields selectable via ?fields= on the user list, and how to serialize each one
+USER_LIST_FIELDS = {
+    'id': lambda u: u.id,
+    'name': lambda u: u.username,
+    'email': lambda u: u.email,
+    'roles': lambda u: [role.name for role in u.role_list],
+    'is_active': lambda u: u.is_active,
+    'created_at': lambda u: u.created_at.isoformat(),
+}
+
 @user_bp.route('', methods=['GET', 'OPTIONS'])
 @user_bp.route('/', methods=['GET', 'OPTIONS'])
 @token_required
 @require_permission('VIEW_USERS')
 def get_users():
-    """Get a list of users.
-    Requires VIEW_USERS permission. Supports filtering by 'role' and 'is_active'.
+    """Get a page of users ordered by username.
+    Requires VIEW_USERS permission. Supports filtering by 'role' and 'is_active',
+    prefix search with 'q', and cursor pagination: pass the returned
+    `next_cursor` as 'cursor' to get the next page (null on the last page).
     ---
     tags:
       - Users
@@ -41,9 +54,34 @@ def get_users():
           enum: ['true', 'false']
         required: false
         description: Filter users by active status ('true' or 'false')
+      - in: query
+        name: fields
+        schema:
+          type: string
+        required: false
+        description: Comma separated subset of fields to return (id, name, email, roles, is_active, created_at)
+      - in: query
+        name: q
+        schema:
+          type: string
+        required: false
+        description: Case-insensitive prefix of the username or email
+      - in: query
+        name: limit
+        schema:
+          type: integer
+          default: 50
+        required: false
+        description: Page size (1-200)
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        required: false
+        description: next_cursor from the previous page
     responses:
       200:
-        description: List of users retrieved successfully
+        description: Page of users retrieved successfully
         content:
           application/json:
             schema: UserListResponseSchema
@@ -74,31 +112,30 @@ def get_users():
     # Extract filter parameters from request.args
     filters = {
         'role': request.args.get('role', None, type=str),
-        'is_active': request.args.get('is_active', None, type=str)  # Keep as string, service handles conversion
+        'is_active': request.args.get('is_active', None, type=str),  # Keep as string, service handles conversion
+        'q': request.args.get('q', None, type=str),
+        'limit': request.args.get('limit', None, type=str),
+        'cursor': request.args.get('cursor', None, type=str)
     }
     # Remove None values so service doesn't process empty filters unnecessarily
     filters = {k: v for k, v in filters.items() if v is not None}
+    try:
+        fields = parse_fields(request.args.get('fields'), USER_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     # Call the service method
-    users, message, status_code = UserService.get_users(filters=filters)
+    page, message, status_code = UserService.get_users(filters=filters, fields=fields)
     
     # Handle the response
-    if users is not None:
+    if page is not None:
         # Serialize the list of user objects, excluding sensitive fields
-        users_list = []
-        for user in users:
-            users_list.append({
-                "id": user.id,
-                "name": user.username,
-                "email": user.email,
-                "roles": [role.name for role in user.roles],
-                "is_active": user.is_active,
-                "created_at": user.created_at.isoformat()
-            })
+        users_list = [serialize_fields(user, fields or USER_LIST_FIELDS, USER_LIST_FIELDS) for user in page['users']]
         # Construct the final JSON response
         response = {
             "message": message,
-            "users": users_list
+            "users": users_list,
+            "next_cursor": page['next_cursor']
         }
         return jsonify(response), status_code  # Use status_code from service (should be 200)
     else:
@@ -25,7 +25,8 @@ from .admin_schemas import (
 from .role_schemas import (
     RoleSchema, RoleListResponseSchema,
     RoleCreateRequestSchema, RoleUpdateRequestSchema,
-    RoleAssignPermissionRequestSchema
+    RoleAssignPermissionRequestSchema, RoleSetPermissionsRequestSchema,
+    RoleSetPermissionsResponseSchema, PermissionMatrixResponseSchema
 )
 
 from .permission_schemas import PermissionSchema
@@ -61,6 +62,7 @@ __all__ = [
     'AdminCustomerSchema', 'AdminCustomerListResponseSchema',
     'RoleSchema', 'RoleListResponseSchema',
     'RoleCreateRequestSchema', 'RoleUpdateRequestSchema',
-    'RoleAssignPermissionRequestSchema',
+    'RoleAssignPermissionRequestSchema', 'RoleSetPermissionsRequestSchema',
+    'RoleSetPermissionsResponseSchema', 'PermissionMatrixResponseSchema',
     'PermissionSchema'
 ] # Ensure schemas are exported
\ No newline at end of file
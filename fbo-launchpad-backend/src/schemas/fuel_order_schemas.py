@@ -14,13 +14,15 @@ class FuelOrderBaseSchema(Schema):
     assigned_lst_user_id = fields.Int(required=True)
     assigned_truck_id = fields.Int(required=True)
     location_on_ramp = fields.Str(required=False, allow_none=True, validate=validate.Length(max=100))
+    ramp_spot_id = fields.Int(required=False, allow_none=True)
     csr_notes = fields.Str(required=False, allow_none=True)
 
 class FuelOrderCreateRequestSchema(FuelOrderBaseSchema):
     """
     Request schema for creating a fuel order. Allows assigned_lst_user_id to be -1 for auto-assign (the backend will select the least busy active LST).
     """
-    assigned_lst_user_id = fields.Int(required=True, metadata={"description": "Set to -1 to auto-assign the least busy LST."})
+    assigned_lst_user_id = fields.Int(required=True, allow_none=True, metadata={"description": "Set to -1 to auto-assign the least busy LST, or null to queue the order for an LST to claim."})
+    assigned_truck_id = fields.Int(required=True, metadata={"description": "Set to -1 to auto-assign the nearest compatible truck to ramp_spot_id."})
 
 class FuelOrderUpdateRequestSchema(Schema): # For potential future PUT/PATCH
      # Define fields allowed for update, likely optional
@@ -68,6 +70,7 @@ class FuelOrderResponseSchema(Schema):
     assigned_lst_user_id = fields.Int(dump_only=True, allow_none=True)
     assigned_truck_id = fields.Int(dump_only=True, allow_none=True)
     location_on_ramp = fields.Str(dump_only=True, allow_none=True)
+    ramp_spot_id = fields.Int(dump_only=True, allow_none=True)
     csr_notes = fields.Str(dump_only=True, allow_none=True)
     start_meter_reading = fields.Decimal(dump_only=True, places=2, as_string=True, allow_none=True)
     end_meter_reading = fields.Decimal(dump_only=True, places=2, as_string=True, allow_none=True)
@@ -8,6 +8,9 @@ class FuelTruckSchema(Schema):
     capacity = fields.Decimal(required=True, places=2)
     current_meter_reading = fields.Decimal(required=True, places=2)
     is_active = fields.Bool(dump_only=True)
+    last_x = fields.Float(dump_only=True, allow_none=True)
+    last_y = fields.Float(dump_only=True, allow_none=True)
+    position_updated_at = fields.DateTime(dump_only=True, allow_none=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
@@ -26,6 +29,12 @@ class FuelTruckUpdateRequestSchema(Schema):
     current_meter_reading = fields.Decimal(required=False, places=2)
     is_active = fields.Bool(required=False)
 
+class FuelTruckPositionRequestSchema(Schema):
+    """Schema for reporting a truck's position: a ramp spot, or x/y on the ramp grid."""
+    ramp_spot_id = fields.Int(required=False, allow_none=True)
+    x = fields.Float(required=False, allow_none=True)
+    y = fields.Float(required=False, allow_none=True)
+
 class FuelTruckCreateResponseSchema(Schema):
     """Schema for the fuel truck creation response."""
     message = fields.Str(dump_only=True)
@@ -0,0 +1,78 @@
+from datetime import timedelta, timezone
+from marshmallow import Schema, fields, validate, validates_schema, post_load, ValidationError
+
+# Longest shift the roster accepts
+MAX_SHIFT_LENGTH = timedelta(hours=24)
+
+
+def to_utc(value):
+    """Aware datetimes are converted to naive UTC, the form stored in the database."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ShiftBreakSchema(Schema):
+    start = fields.DateTime(required=True)
+    end = fields.DateTime(required=True)
+
+    @post_load
+    def normalize(self, data, **kwargs):
+        return {'start': to_utc(data['start']), 'end': to_utc(data['end'])}
+
+
+class LSTShiftCreateSchema(Schema):
+    user_id = fields.Integer(required=True)
+    start_time = fields.DateTime(required=True)
+    end_time = fields.DateTime(required=True)
+    breaks = fields.List(fields.Nested(ShiftBreakSchema), load_default=list)
+    notes = fields.String(required=False, allow_none=True, validate=validate.Length(max=255))
+
+    @post_load
+    def normalize(self, data, **kwargs):
+        for key in ('start_time', 'end_time'):
+            if key in data:
+                data[key] = to_utc(data[key])
+        return data
+
+    @validates_schema
+    def validate_times(self, data, **kwargs):
+        start, end = to_utc(data.get('start_time')), to_utc(data.get('end_time'))
+        if start is None or end is None:
+            return
+        if end <= start:
+            raise ValidationError("end_time must be after start_time.", 'end_time')
+        if end - start > MAX_SHIFT_LENGTH:
+            raise ValidationError("A shift can be at most 24 hours long.", 'end_time')
+        previous_end = start
+        for brk in sorted(data.get('breaks') or [], key=lambda b: to_utc(b['start'])):
+            brk_start, brk_end = to_utc(brk['start']), to_utc(brk['end'])
+            if brk_end <= brk_start:
+                raise ValidationError("Each break must end after it starts.", 'breaks')
+            if brk_start < previous_end or brk_end > end:
+                raise ValidationError("Breaks must lie within the shift and not overlap.", 'breaks')
+            previous_end = brk_end
+
+
+class LSTShiftUpdateSchema(LSTShiftCreateSchema):
+    """All fields optional; the merged shift is validated again by the service."""
+    user_id = fields.Integer(required=False)
+    start_time = fields.DateTime(required=False)
+    end_time = fields.DateTime(required=False)
+    breaks = fields.List(fields.Nested(ShiftBreakSchema), required=False)
+
+
+class LSTShiftResponseSchema(Schema):
+    id = fields.Integer()
+    user_id = fields.Integer()
+    start_time = fields.DateTime()
+    end_time = fields.DateTime()
+    breaks = fields.List(fields.Dict())
+    notes = fields.String(allow_none=True)
+    created_at = fields.DateTime()
+    updated_at = fields.DateTime()
+
+
+class LSTShiftListSchema(Schema):
+    message = fields.String()
+    shifts = fields.List(fields.Nested(LSTShiftResponseSchema))
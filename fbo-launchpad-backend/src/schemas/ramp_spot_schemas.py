@@ -0,0 +1,41 @@
+from marshmallow import Schema, fields, validate
+
+class RampSpotCreateSchema(Schema):
+    code = fields.String(required=True, validate=validate.Length(min=1, max=20))
+    zone = fields.String(required=False, allow_none=True, validate=validate.Length(max=50))
+    x = fields.Float(required=True, allow_nan=False)
+    y = fields.Float(required=True, allow_nan=False)
+    is_active = fields.Boolean(load_default=True)
+
+class RampSpotUpdateSchema(Schema):
+    code = fields.String(required=False, validate=validate.Length(min=1, max=20))
+    zone = fields.String(required=False, allow_none=True, validate=validate.Length(max=50))
+    x = fields.Float(required=False, allow_nan=False)
+    y = fields.Float(required=False, allow_nan=False)
+    is_active = fields.Boolean(required=False)
+
+class RampSpotResponseSchema(Schema):
+    id = fields.Integer()
+    code = fields.String()
+    zone = fields.String(allow_none=True)
+    x = fields.Float()
+    y = fields.Float()
+    is_active = fields.Boolean()
+    created_at = fields.DateTime()
+    updated_at = fields.DateTime()
+
+class RampSpotListSchema(Schema):
+    message = fields.String()
+    ramp_spots = fields.List(fields.Nested(RampSpotResponseSchema))
+
+class NearestTruckSchema(Schema):
+    id = fields.Integer()
+    truck_number = fields.String()
+    fuel_type = fields.String()
+    capacity = fields.Float()
+    distance = fields.Float(metadata={"description": "Metres from the spot to the truck's last reported position"})
+
+class NearestTruckListSchema(Schema):
+    message = fields.String()
+    ramp_spot = fields.Nested(RampSpotResponseSchema)
+    trucks = fields.List(fields.Nested(NearestTruckSchema))
@@ -24,4 +24,32 @@ class RoleListResponseSchema(Schema):
 
 class RoleAssignPermissionRequestSchema(Schema):
     """Schema for assigning a permission to a role."""
-    permission_id = fields.Integer(required=True) 
\ No newline at end of file
+    permission_id = fields.Integer(required=True)
+
+class RoleSetPermissionsRequestSchema(Schema):
+    """Schema for replacing the whole permission set of a role."""
+    permission_ids = fields.List(fields.Integer(), required=True)
+
+class RoleSetPermissionsResponseSchema(Schema):
+    """Schema for the result of replacing a role's permission set."""
+    message = fields.String(required=True)
+    permission_ids = fields.List(fields.Integer(), required=True)
+    added = fields.List(fields.Integer(), required=True)
+    removed = fields.List(fields.Integer(), required=True)
+
+class PermissionMatrixRoleSchema(Schema):
+    """One row of the role-permission matrix."""
+    id = fields.Integer(dump_only=True)
+    name = fields.String(dump_only=True)
+    permission_ids = fields.List(fields.Integer(), dump_only=True)
+
+class PermissionMatrixPermissionSchema(Schema):
+    """One column of the role-permission matrix."""
+    id = fields.Integer(dump_only=True)
+    name = fields.String(dump_only=True)
+    description = fields.String(dump_only=True, allow_none=True)
+
+class PermissionMatrixResponseSchema(Schema):
+    """Schema for all roles with the permissions granted to each."""
+    roles = fields.Nested(PermissionMatrixRoleSchema, many=True, required=True)
+    permissions = fields.Nested(PermissionMatrixPermissionSchema, many=True, required=True)
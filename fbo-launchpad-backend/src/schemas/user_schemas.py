@@ -26,7 +26,7 @@ class UserBriefSchema(Schema):
     id = fields.Integer()
     name = fields.String(attribute="username")
     email = fields.Email()
-    roles = fields.List(fields.Nested(RoleBriefSchema))
+    roles = fields.List(fields.Nested(RoleBriefSchema), attribute="role_list")
     is_active = fields.Boolean()
     created_at = fields.DateTime()
 
@@ -35,7 +35,7 @@ class UserDetailSchema(Schema):
     id = fields.Integer()
     name = fields.String(attribute="username")
     email = fields.Email()
-    roles = fields.List(fields.Nested(RoleBriefSchema))
+    roles = fields.List(fields.Nested(RoleBriefSchema), attribute="role_list")
     is_active = fields.Boolean()
     created_at = fields.DateTime()
     updated_at = fields.DateTime()
@@ -44,6 +44,7 @@ class UserListResponseSchema(Schema):
     """Schema for list of users response."""
     message = fields.String()
     users = fields.List(fields.Nested(UserBriefSchema))
+    next_cursor = fields.String(allow_none=True, metadata={"description": "Pass as ?cursor= for the next page; null on the last page"})
 
 class ErrorResponseSchema(Schema):
     """Schema for error responses."""
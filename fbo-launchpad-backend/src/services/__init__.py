@@ -6,5 +6,8 @@ from .user_service import UserService
 from .fuel_truck_service import FuelTruckService
 from .role_service import RoleService
 from .permission_service import PermissionService
+from .fuel_order_archive_service import FuelOrderArchiveService
+from .ramp_spot_service import RampSpotService
+from .lst_shift_service import LSTShiftService
 
-__all__ = ['AuthService', 'AircraftService', 'CustomerService', 'FuelOrderService', 'UserService', 'FuelTruckService', 'RoleService', 'PermissionService']
+__all__ = ['AuthService', 'AircraftService', 'CustomerService', 'FuelOrderService', 'UserService', 'FuelTruckService', 'RoleService', 'PermissionService', 'FuelOrderArchiveService', 'RampSpotService', 'LSTShiftService']
@@ -1,6 +1,9 @@
 from typing import Tuple, List, Optional, Dict, Any
 from ..models.aircraft import Aircraft
 from ..app import db
+from ..utils.fieldsets import load_only_fields
+from ..utils.invalidation import invalidation_bus
+from ..utils.tail_number_index import tail_number_index
 
 class AircraftService:
     @staticmethod
@@ -22,6 +25,8 @@ class AircraftService:
             )
             db.session.add(aircraft)
             db.session.commit()
+            tail_number_index.upsert(aircraft.tail_number, aircraft.aircraft_type, aircraft.fuel_type)
+            invalidation_bus.publish('aircraft', aircraft.tail_number)
             return aircraft, "Aircraft created successfully", 201
         except Exception as e:
             db.session.rollback()
@@ -38,8 +43,10 @@ class AircraftService:
             return None, f"Error retrieving aircraft: {str(e)}", 500
 
     @staticmethod
-    def get_all_aircraft(filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Aircraft], str, int]:
+    def get_all_aircraft(filters: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[List[Aircraft], str, int]:
         query = Aircraft.query
+        if fields:
+            query = query.options(load_only_fields(Aircraft, fields))
         if filters and 'customer_id' in filters:
             query = query.filter_by(customer_id=filters['customer_id'])
         try:
@@ -48,6 +55,17 @@ class AircraftService:
         except Exception as e:
             return [], f"Error retrieving aircraft: {str(e)}", 500
 
+    @staticmethod
+    def suggest_tail_numbers(prefix: str, limit: int = 10) -> Tuple[List[Dict[str, Any]], str, int]:
+        """Prefix lookup of tail numbers from the in-memory typeahead index (no DB query once loaded)."""
+        if not prefix or not prefix.strip():
+            return [], "Missing required parameter: prefix", 400
+        try:
+            tail_number_index.ensure_loaded()
+            return tail_number_index.suggest(prefix, limit), "Suggestions retrieved successfully", 200
+        except Exception as e:
+            return [], f"Error retrieving suggestions: {str(e)}", 500
+
     @staticmethod
     def update_aircraft(tail_number: str, update_data: Dict[str, Any]) -> Tuple[Optional[Aircraft], str, int]:
         try:
@@ -59,6 +77,8 @@ class AircraftService:
             if 'customer_id' in update_data:
                 aircraft.customer_id = update_data['customer_id']
             db.session.commit()
+            tail_number_index.upsert(aircraft.tail_number, aircraft.aircraft_type, aircraft.fuel_type)
+            invalidation_bus.publish('aircraft', aircraft.tail_number)
             return aircraft, "Aircraft updated successfully", 200
         except Exception as e:
             db.session.rollback()
@@ -72,6 +92,8 @@ class AircraftService:
                 return False, f"Aircraft with tail number {tail_number} not found", 404
             db.session.delete(aircraft)
             db.session.commit()
+            tail_number_index.remove(tail_number)
+            invalidation_bus.publish('aircraft', tail_number)
             return True, "Aircraft deleted successfully", 200
         except Exception as e:
             db.session.rollback()
@@ -1,6 +1,7 @@
 from typing import Union, Tuple
 from ..models.user import User, UserRole
 from ..extensions import db
+from ..utils.permission_cache import permission_cache
 from datetime import datetime, timedelta
 import jwt
 from flask import current_app
@@ -109,19 +110,16 @@ class AuthService:
     def get_user_effective_permissions(user):
         """
         Retrieves a unique list of all permission names assigned to the user through their roles.
+        The set is resolved with one query, or read from the per-process permission cache.
         Returns (permissions_list, message, status_code)
         """
-        if not user or not hasattr(user, 'roles') or user.roles.count() == 0:
+        if not user:
             return [], "User has no assigned roles or permissions.", 200
-
-        effective_permissions = set()
         try:
-            for role in user.roles.all():  # Efficiently fetch all roles
-                if hasattr(role, 'permissions'):
-                    for permission in role.permissions.all():  # Efficiently fetch all permissions
-                        effective_permissions.add(permission.name)
-            sorted_permissions = sorted(list(effective_permissions))
-            return sorted_permissions, "Effective permissions retrieved successfully.", 200
+            permissions = permission_cache.get(user.id)
+            if not permissions:
+                return [], "User has no assigned roles or permissions.", 200
+            return sorted(permissions), "Effective permissions retrieved successfully.", 200
         except Exception as e:
             print(f"Error calculating effective permissions for user {getattr(user, 'id', None)}: {str(e)}")
             return None, f"Error calculating effective permissions: {str(e)}", 500
\ No newline at end of file
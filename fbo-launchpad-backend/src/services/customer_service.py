@@ -1,6 +1,8 @@
 from typing import Tuple, List, Optional, Dict, Any
 from ..models.customer import Customer
 from ..app import db
+from ..utils.fieldsets import load_only_fields
+from ..utils.invalidation import invalidation_bus
 
 class CustomerService:
     @staticmethod
@@ -15,6 +17,7 @@ class CustomerService:
             )
             db.session.add(customer)
             db.session.commit()
+            invalidation_bus.publish('customer', customer.id)
             return customer, "Customer created successfully", 201
         except Exception as e:
             db.session.rollback()
@@ -31,8 +34,10 @@ class CustomerService:
             return None, f"Error retrieving customer: {str(e)}", 500
 
     @staticmethod
-    def get_all_customers(filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Customer], str, int]:
+    def get_all_customers(filters: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[List[Customer], str, int]:
         query = Customer.query
+        if fields:
+            query = query.options(load_only_fields(Customer, fields))
         try:
             customers = query.order_by(Customer.name.asc()).all()
             return customers, "Customer list retrieved successfully", 200
@@ -52,6 +57,7 @@ class CustomerService:
                     return None, f"Customer name {update_data['name']} already exists", 400
                 customer.name = update_data['name']
             db.session.commit()
+            invalidation_bus.publish('customer', customer.id)
             return customer, "Customer updated successfully", 200
         except Exception as e:
             db.session.rollback()
@@ -65,6 +71,7 @@ class CustomerService:
                 return False, f"Customer with ID {customer_id} not found", 404
             db.session.delete(customer)
             db.session.commit()
+            invalidation_bus.publish('customer', customer_id)
             return True, "Customer deleted successfully", 200
         except Exception as e:
             db.session.rollback()
@@ -0,0 +1,233 @@
+"""
+Batch re-optimization of LST and truck assignments for dispatched fuel orders.
+
+Orders that are DISPATCHED but not yet acknowledged can still be moved between
+LSTs and trucks at no cost to anyone. The optimizer takes all of them at once
+and solves two assignment problems, one for LSTs and one for trucks:
+
+* Every candidate (order, agent) pair has a cost. Keeping the current
+  assignment and working at a ramp location the agent is already busy at are
+  discounts; a truck with the wrong fuel type or too little capacity for the
+  order is infeasible.
+* Each agent's k-th additional order costs LOAD_WEIGHT * (current load + k),
+  so work spreads out instead of piling onto the cheapest agent. LSTs are
+  capped at DISPATCH_MAX_ACTIVE_ORDERS_PER_LST active orders.
+
+The problem is a min-cost flow from orders through agents with convex,
+per-agent slot costs. `solve_assignment` solves it exactly by successive
+shortest paths over the agent nodes only (moving an assigned order from agent
+a to agent b is an edge a -> b), which keeps each augmentation at
+O(agents^2) instead of expanding agents into one column per slot.
+"""
+import math
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+INF = math.inf
+
+# Cost of each additional active order on an agent, per order already held
+LOAD_WEIGHT = 10.0
+# Discount for leaving an order with its current LST or truck
+KEEP_BONUS = 5.0
+# Discount for an agent already working an order at the same ramp location
+LOCATION_BONUS = 3.0
+
+# Role whose active members are dispatchable LSTs (see seeds.py)
+LST_ROLE_NAME = 'Line Service Technician'
+
+
+class DispatchOrder(NamedTuple):
+    id: int
+    fuel_type: str
+    requested_amount: Optional[float]
+    location_on_ramp: Optional[str]
+    assigned_lst_user_id: Optional[int]
+    assigned_truck_id: Optional[int]
+
+
+class DispatchTruck(NamedTuple):
+    id: int
+    fuel_type: str
+    capacity: float
+
+
+class AgentState(NamedTuple):
+    """Active orders an LST or truck holds outside the batch being optimized."""
+    load: int
+    locations: Set[str]
+
+
+def solve_assignment(cost: Sequence[Sequence[float]], marginal: Sequence[Sequence[float]]) -> List[int]:
+    """
+    Assign rows to agents minimizing the sum of row costs plus slot costs.
+
+    Args:
+        cost: n x m matrix; cost[i][a] is the cost of giving row i to agent a,
+            INF if not allowed.
+        marginal: for each agent, the cost of its 1st, 2nd, ... row. Must be
+            non-decreasing; its length is the agent's capacity.
+
+    Returns:
+        List[int]: the agent of each row, or -1 for rows that cannot be placed
+        (no allowed agent with capacity left).
+    """
+    n = len(cost)
+    m = len(marginal)
+    assigned = [-1] * n
+    if m == 0:
+        return assigned
+    members: List[List[int]] = [[] for _ in range(m)]
+    # move[a][b]: cheapest cost change of moving one of a's rows to b, and that row
+    move = [[INF] * m for _ in range(m)]
+    move_row = [[-1] * m for _ in range(m)]
+    # Node potentials keep reduced edge costs non-negative for Dijkstra
+    potential = [0.0] * m
+
+    def refresh(a: int) -> None:
+        best = [INF] * m
+        best_row = [-1] * m
+        for row in members[a]:
+            row_cost = cost[row]
+            base = row_cost[a]
+            for b, value in enumerate(row_cost):
+                value -= base
+                if value < best[b]:
+                    best[b] = value
+                    best_row[b] = row
+        best[a] = INF
+        move[a] = best
+        move_row[a] = best_row
+
+    for row in range(n):
+        dist = [c - p for c, p in zip(cost[row], potential)]
+        lowest = min(dist)
+        if lowest == INF:
+            continue
+        dist = [d - lowest for d in dist]
+        # Reduced cost of ending the path at each agent, i.e. taking its next slot
+        slot = [mg[len(mb)] + p if len(mb) < len(mg) else INF
+                for mg, mb, p in zip(marginal, members, potential)]
+        lowest = min(slot)
+        if lowest == INF:
+            continue
+        slot = [s - lowest for s in slot]
+
+        pred = [-1] * m
+        done = [False] * m
+        final = [0.0] * m
+        best, best_agent = INF, -1
+        while True:
+            nearest = min(dist)
+            if nearest >= best:
+                break
+            a = dist.index(nearest)
+            dist[a] = INF
+            done[a] = True
+            final[a] = nearest
+            if nearest + slot[a] < best:
+                best, best_agent = nearest + slot[a], a
+            if members[a]:
+                offset = nearest + potential[a]
+                for b, value in enumerate(move[a]):
+                    if not done[b]:
+                        value += offset - potential[b]
+                        if value < dist[b]:
+                            dist[b] = value
+                            pred[b] = a
+        if best_agent < 0:
+            continue
+
+        for a in range(m):
+            potential[a] += min(final[a], best) if done[a] else best
+
+        # Walk the path back: each hop moves one row along, the new row takes the first agent
+        changed = set()
+        b = best_agent
+        while pred[b] != -1:
+            a = pred[b]
+            moved = move_row[a][b]
+            members[a].remove(moved)
+            members[b].append(moved)
+            assigned[moved] = b
+            changed.update((a, b))
+            b = a
+        members[b].append(row)
+        assigned[row] = b
+        changed.add(b)
+        for a in changed:
+            refresh(a)
+    return assigned
+
+
+def _same_fuel(a: Optional[str], b: Optional[str]) -> bool:
+    return (a or '').strip().lower() == (b or '').strip().lower()
+
+
+def _agent_cost(order: DispatchOrder, current_id: Optional[int], agent_id: int, state: AgentState) -> float:
+    cost = 0.0
+    if current_id == agent_id:
+        cost -= KEEP_BONUS
+    if order.location_on_ramp and order.location_on_ramp in state.locations:
+        cost -= LOCATION_BONUS
+    return cost
+
+
+def _slot_costs(state: AgentState, capacity: int) -> List[float]:
+    return [LOAD_WEIGHT * (state.load + k) for k in range(max(0, capacity - state.load))]
+
+
+def plan_assignments(
+    orders: Sequence[DispatchOrder],
+    lst_ids: Sequence[int],
+    trucks: Sequence[DispatchTruck],
+    lst_states: Dict[int, AgentState],
+    truck_states: Dict[int, AgentState],
+    max_orders_per_lst: int
+) -> List[Dict[str, Optional[int]]]:
+    """
+    Choose an LST and a truck for every order.
+
+    Returns one dict per order with `order_id`, `lst_user_id` and `truck_id`;
+    either id is None when no LST has capacity left or no truck can carry the
+    order's fuel type and amount.
+    """
+    idle = AgentState(0, set())
+    n = len(orders)
+
+    lst_cost = [[_agent_cost(o, o.assigned_lst_user_id, l, lst_states.get(l, idle)) for l in lst_ids] for o in orders]
+    lst_slots = [_slot_costs(lst_states.get(l, idle), max_orders_per_lst) for l in lst_ids]
+    lst_choice = solve_assignment(lst_cost, lst_slots)
+
+    truck_cost = []
+    for o in orders:
+        row = []
+        for t in trucks:
+            if not _same_fuel(o.fuel_type, t.fuel_type) or \
+                    (o.requested_amount is not None and o.requested_amount > t.capacity):
+                row.append(INF)
+            else:
+                row.append(_agent_cost(o, o.assigned_truck_id, t.id, truck_states.get(t.id, idle)))
+        truck_cost.append(row)
+    truck_slots = [_slot_costs(truck_states.get(t.id, idle), truck_states.get(t.id, idle).load + n) for t in trucks]
+    truck_choice = solve_assignment(truck_cost, truck_slots)
+
+    return [
+        {
+            'order_id': o.id,
+            'lst_user_id': lst_ids[lst_choice[i]] if lst_choice[i] >= 0 else None,
+            'truck_id': trucks[truck_choice[i]].id if truck_choice[i] >= 0 else None,
+        }
+        for i, o in enumerate(orders)
+    ]
+
+
+def agent_states(rows: Iterable[Sequence]) -> Dict[int, AgentState]:
+    """Build AgentStates from (agent_id, location_on_ramp) rows, one per active order."""
+    loads: Dict[int, int] = {}
+    locations: Dict[int, Set[str]] = {}
+    for agent_id, location in rows:
+        if agent_id is None:
+            continue
+        loads[agent_id] = loads.get(agent_id, 0) + 1
+        if location:
+            locations.setdefault(agent_id, set()).add(location)
+    return {agent_id: AgentState(load, locations.get(agent_id, set())) for agent_id, load in loads.items()}
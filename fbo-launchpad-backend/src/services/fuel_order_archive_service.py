@@ -0,0 +1,337 @@
+"""
+Archival of reviewed fuel orders to compressed files, and restore from them.
+
+Archive layout, under FUEL_ORDER_ARCHIVE_DIR::
+
+    2026/fuel_orders_2026_04_20261019T020000.jsonl.gz
+    2026/fuel_orders_2026_04_20261019T020000.manifest.json
+
+Each archive file holds one month of orders (by created_at) as JSON lines,
+one order per line. Its manifest records the row count and the SHA-256 of the
+uncompressed content. Rows are only deleted from fuel_orders once every file
+of the run has been read back and matches its manifest. Deletes run in small
+batches, each in its own transaction, so no long lock is held on the hot table.
+"""
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Enum, Numeric, delete, func, insert, select
+
+from src.extensions import db
+from src.models import FuelOrder, FuelOrderStatus
+from src.models.fuel_order_partitioning import ensure_partitions, month_start
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE_PREFIX = 'fuel_orders_'
+
+
+def _encode_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Make a fuel_orders row JSON serializable."""
+    encoded = {}
+    for key, value in row.items():
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        elif isinstance(value, FuelOrderStatus):
+            value = value.name
+        encoded[key] = value
+    return encoded
+
+
+def _decode_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of _encode_row, driven by the fuel_orders column types."""
+    columns = FuelOrder.__table__.c
+    row = {}
+    for key, value in data.items():
+        if key not in columns:
+            continue
+        column_type = columns[key].type
+        if value is not None:
+            if isinstance(column_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column_type, Enum):
+                value = FuelOrderStatus[value]
+            elif isinstance(column_type, Numeric):
+                value = Decimal(value)
+        row[key] = value
+    return row
+
+
+def _dump_line(row: Dict[str, Any]) -> bytes:
+    return (json.dumps(_encode_row(row), sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _read_archive(path: str) -> Tuple[int, str]:
+    """Return (row count, sha256 of uncompressed content) of an archive file."""
+    digest = hashlib.sha256()
+    rows = 0
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            digest.update(line)
+            rows += 1
+    return rows, digest.hexdigest()
+
+
+class _MonthWriter:
+    """Streams one month of rows into a temporary gzip file, tracking count and checksum."""
+
+    def __init__(self, directory: str, month: datetime, run_stamp: str):
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{ARCHIVE_FILE_PREFIX}{month:%Y_%m}_{run_stamp}")
+        self.month = month
+        self.path = base + '.jsonl.gz'
+        self.manifest_path = base + '.manifest.json'
+        self.tmp_path = self.path + '.tmp'
+        self.file = gzip.open(self.tmp_path, 'wb')
+        self.digest = hashlib.sha256()
+        self.ids: List[int] = []
+        self.created_from: Optional[datetime] = None
+        self.created_to: Optional[datetime] = None
+
+    def write(self, row: Dict[str, Any]) -> None:
+        line = _dump_line(row)
+        self.file.write(line)
+        self.digest.update(line)
+        self.ids.append(row['id'])
+        if self.created_from is None or row['created_at'] < self.created_from:
+            self.created_from = row['created_at']
+        if self.created_to is None or row['created_at'] > self.created_to:
+            self.created_to = row['created_at']
+
+    def close(self) -> Dict[str, Any]:
+        self.file.close()
+        return {
+            'file': os.path.basename(self.path),
+            'month': f"{self.month:%Y-%m}",
+            'rows': len(self.ids),
+            'sha256': self.digest.hexdigest(),
+            'min_id': min(self.ids),
+            'max_id': max(self.ids),
+            'created_from': self.created_from.isoformat(),
+            'created_to': self.created_to.isoformat(),
+        }
+
+    def discard(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+        for path in (self.tmp_path, self.path, self.manifest_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class FuelOrderArchiveService:
+    @staticmethod
+    def _archivable(cutoff: datetime):
+        table = FuelOrder.__table__
+        return (table.c.status == FuelOrderStatus.REVIEWED) & (table.c.created_at < cutoff)
+
+    @classmethod
+    def _stream_archivable(cls, cutoff: datetime, chunk_size: int) -> Iterator[Dict[str, Any]]:
+        """Yield archivable rows in id order, one keyset-paginated chunk at a time."""
+        table = FuelOrder.__table__
+        last_id = 0
+        while True:
+            chunk = db.session.execute(
+                select(table)
+                .where(cls._archivable(cutoff), table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(chunk_size)
+            ).mappings().all()
+            # Release the read snapshot between chunks
+            db.session.commit()
+            if not chunk:
+                return
+            for row in chunk:
+                yield dict(row)
+            last_id = chunk[-1]['id']
+
+    @classmethod
+    def archive_orders(
+        cls,
+        cutoff: datetime,
+        archive_dir: str,
+        chunk_size: int = 1000,
+        batch_size: int = 500,
+        pause: float = 0.0,
+        dry_run: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """
+        Archive REVIEWED orders created before `cutoff`, then delete them.
+
+        Args:
+            cutoff (datetime): Orders created before this instant are archived.
+            archive_dir (str): Root directory for archive files.
+            chunk_size (int): Rows read from the database per query.
+            batch_size (int): Rows deleted per transaction.
+            pause (float): Seconds to sleep between delete batches.
+            dry_run (bool): Only count the archivable orders.
+
+        Returns:
+            Tuple[Optional[Dict], str, int]: summary (files, rows archived, rows
+            deleted), message, status code
+        """
+        if dry_run:
+            table = FuelOrder.__table__
+            count = db.session.execute(
+                select(func.count()).select_from(table).where(cls._archivable(cutoff))
+            ).scalar()
+            return {'files': [], 'archived': count, 'deleted': 0}, f"{count} orders would be archived.", 200
+
+        run_stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        writers: Dict[datetime, _MonthWriter] = {}
+        try:
+            for row in cls._stream_archivable(cutoff, chunk_size):
+                month = month_start(row['created_at'])
+                writer = writers.get(month)
+                if writer is None:
+                    writer = writers[month] = _MonthWriter(
+                        os.path.join(archive_dir, f"{month:%Y}"), month, run_stamp
+                    )
+                writer.write(row)
+
+            if not writers:
+                return {'files': [], 'archived': 0, 'deleted': 0}, "No orders to archive.", 200
+
+            # Verify every file against what was written before anything is deleted
+            manifests = []
+            for writer in writers.values():
+                manifest = writer.close()
+                rows, checksum = _read_archive(writer.tmp_path)
+                if rows != manifest['rows'] or checksum != manifest['sha256']:
+                    raise IOError(f"Verification failed for {writer.path}: "
+                                  f"{rows} rows/{checksum}, expected {manifest['rows']}/{manifest['sha256']}")
+                manifest['archived_at'] = datetime.utcnow().isoformat()
+                with open(writer.manifest_path, 'w') as f:
+                    json.dump(manifest, f, indent=2)
+                os.replace(writer.tmp_path, writer.path)
+                manifests.append(manifest)
+        except Exception as e:
+            db.session.rollback()
+            for writer in writers.values():
+                writer.discard()
+            logger.error(f"Fuel order archive failed, nothing deleted: {str(e)}")
+            return None, f"Archive failed, no orders were deleted: {str(e)}", 500
+
+        archived = sum(m['rows'] for m in manifests)
+        deleted, message, status = cls._delete_in_batches(
+            [order_id for writer in writers.values() for order_id in writer.ids], cutoff, batch_size, pause
+        )
+        summary = {'files': [m['file'] for m in manifests], 'archived': archived, 'deleted': deleted}
+        if status != 200:
+            return summary, message, status
+        if deleted != archived:
+            logger.warning(f"Archived {archived} orders but deleted {deleted}; some rows changed during the run")
+        return summary, f"Archived {archived} orders into {len(manifests)} file(s).", 200
+
+    @classmethod
+    def _delete_in_batches(
+        cls, ids: List[int], cutoff: datetime, batch_size: int, pause: float
+    ) -> Tuple[int, str, int]:
+        table = FuelOrder.__table__
+        deleted = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            try:
+                result = db.session.execute(
+                    delete(table).where(table.c.id.in_(batch), cls._archivable(cutoff))
+                )
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error deleting archived fuel orders: {str(e)}")
+                return deleted, f"Archive files written but deleting archived rows failed after {deleted} rows: {str(e)}", 500
+            deleted += result.rowcount
+            if pause:
+                time.sleep(pause)
+        return deleted, "Archived rows deleted.", 200
+
+    @staticmethod
+    def _find_manifests(archive_dir: str, date_from: datetime, date_to: datetime) -> List[Tuple[str, Dict[str, Any]]]:
+        """Manifests whose created_at range overlaps [date_from, date_to)."""
+        found = []
+        for manifest_path in sorted(glob.glob(os.path.join(archive_dir, '*', f"{ARCHIVE_FILE_PREFIX}*.manifest.json"))):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if (datetime.fromisoformat(manifest['created_from']) < date_to
+                    and datetime.fromisoformat(manifest['created_to']) >= date_from):
+                found.append((os.path.join(os.path.dirname(manifest_path), manifest['file']), manifest))
+        return found
+
+    @classmethod
+    def restore_orders(
+        cls,
+        date_from: datetime,
+        date_to: datetime,
+        archive_dir: str,
+        batch_size: int = 500
+    ) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """
+        Re-insert archived orders created in [date_from, date_to).
+
+        Orders that are already present are skipped, so a restore can be rerun.
+        Archive files are kept.
+
+        Returns:
+            Tuple[Optional[Dict], str, int]: summary (files read, rows restored,
+            rows skipped), message, status code
+        """
+        if date_from >= date_to:
+            return None, "The restore range is empty.", 400
+
+        restored = skipped = 0
+        files = []
+        try:
+            for path, manifest in cls._find_manifests(archive_dir, date_from, date_to):
+                rows, checksum = _read_archive(path)
+                if rows != manifest['rows'] or checksum != manifest['sha256']:
+                    return None, f"Archive file {path} does not match its manifest; refusing to restore it.", 500
+                files.append(manifest['file'])
+
+                # Postgres: make sure the month's partition exists before inserting
+                ensure_partitions(db.session.connection(), datetime.fromisoformat(manifest['created_from']), 0)
+
+                batch = []
+                with gzip.open(path, 'rb') as f:
+                    for line in f:
+                        row = _decode_row(json.loads(line))
+                        if date_from <= row['created_at'] < date_to:
+                            batch.append(row)
+                        if len(batch) >= batch_size:
+                            inserted = cls._insert_missing(batch)
+                            restored += inserted
+                            skipped += len(batch) - inserted
+                            batch = []
+                if batch:
+                    inserted = cls._insert_missing(batch)
+                    restored += inserted
+                    skipped += len(batch) - inserted
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Fuel order restore failed: {str(e)}")
+            return None, f"Restore failed after {restored} orders: {str(e)}", 500
+
+        summary = {'files': files, 'restored': restored, 'skipped': skipped}
+        return summary, f"Restored {restored} orders from {len(files)} file(s).", 200
+
+    @staticmethod
+    def _insert_missing(rows: List[Dict[str, Any]]) -> int:
+        """Insert the rows whose ids are not in fuel_orders yet, in one transaction."""
+        table = FuelOrder.__table__
+        existing = set(db.session.execute(
+            select(table.c.id).where(table.c.id.in_([row['id'] for row in rows]))
+        ).scalars())
+        missing = [row for row in rows if row['id'] not in existing]
+        if missing:
+            db.session.execute(insert(table), missing)
+        db.session.commit()
+        return len(missing)
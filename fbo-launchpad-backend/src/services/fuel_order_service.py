@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 import csv
 import io
@@ -15,10 +15,79 @@ from src.extensions import db
 from flask import current_app
 from typing import Optional, Tuple, List, Dict, Any, Union
 import logging
+import threading
+from contextlib import nullcontext
 import traceback
+from src.utils.fieldsets import load_only_fields
+from src.utils.tail_number_index import tail_number_index
+from src.utils.invalidation import invalidation_bus
+from src.utils.db_routing import read_only
+from src.utils.metrics import FUEL_ORDERS_COMPLETED, FUEL_ORDERS_DISPATCHED
+from src.utils.spatial_index import ramp_index
+from src.utils.shift_index import lst_shift_index
+
+# Status transitions an assigned LST may make via PATCH /<id>/status.
+# Fueling -> Completed goes through submit-data (meter readings required) and
+# cancellation through a separate endpoint with different permissions.
+ALLOWED_STATUS_TRANSITIONS = {
+    FuelOrderStatus.DISPATCHED: [FuelOrderStatus.ACKNOWLEDGED],
+    FuelOrderStatus.ACKNOWLEDGED: [FuelOrderStatus.EN_ROUTE],
+    FuelOrderStatus.EN_ROUTE: [FuelOrderStatus.FUELING],
+}
+
+# Transitions accepted by the offline sync endpoint: the above plus completion
+SYNC_STATUS_TRANSITIONS = {
+    **ALLOWED_STATUS_TRANSITIONS,
+    FuelOrderStatus.FUELING: [FuelOrderStatus.COMPLETED],
+}
+
+# Stage timestamp column written for each status
+STATUS_TIMESTAMP_COLUMNS = {
+    FuelOrderStatus.ACKNOWLEDGED: 'acknowledge_timestamp',
+    FuelOrderStatus.EN_ROUTE: 'en_route_timestamp',
+    FuelOrderStatus.FUELING: 'fueling_start_timestamp',
+    FuelOrderStatus.COMPLETED: 'completion_timestamp',
+}
+
+# Upper bound on transitions accepted by one sync request
+MAX_SYNC_ITEMS = 500
+# Client clocks may run this far ahead of the server
+SYNC_CLOCK_SKEW = timedelta(minutes=5)
+
+# Upper bound on ids accepted by one bulk review request
+MAX_BULK_REVIEW_IDS = 1000
+
+# Orders that count towards an LST's workload when auto-assigning
+LST_ACTIVE_STATUSES = [
+    FuelOrderStatus.DISPATCHED,
+    FuelOrderStatus.ACKNOWLEDGED,
+    FuelOrderStatus.EN_ROUTE,
+    FuelOrderStatus.FUELING,
+]
+
+# Orders that are finished; only these are left out of lists by the active window
+TERMINAL_STATUSES = [
+    FuelOrderStatus.COMPLETED,
+    FuelOrderStatus.REVIEWED,
+    FuelOrderStatus.CANCELLED,
+]
+
+# A claim retries this many times when another LST takes its candidate first
+# (only on databases without SKIP LOCKED, where candidates are not locked)
+MAX_CLAIM_ATTEMPTS = 5
+
+# Serializes LST auto-assignment within a worker on databases without
+# SELECT ... FOR UPDATE SKIP LOCKED (SQLite in development and tests)
+_lst_assignment_lock = threading.Lock()
+
+# Columns backing computed fuel order list fields (see ?fields= on GET /api/fuel-orders)
+FUEL_ORDER_FIELD_COLUMNS = {
+    'calculated_gallons_dispensed': ('start_meter_reading', 'end_meter_reading'),
+}
 
 class FuelOrderService:
     @classmethod
+    @read_only
     def get_order_status_counts(cls, current_user):
         """
         Calculate and return counts of fuel orders by status groups for dashboard cards.
@@ -33,11 +102,13 @@ class FuelOrderService:
             pending_statuses = [FuelOrderStatus.DISPATCHED]
             in_progress_statuses = [FuelOrderStatus.ACKNOWLEDGED, FuelOrderStatus.EN_ROUTE, FuelOrderStatus.FUELING]
             completed_statuses = [FuelOrderStatus.COMPLETED]
-            counts = db.session.query(
+            counts_query = db.session.query(
                 func.count(case((FuelOrder.status.in_(pending_statuses), FuelOrder.id))).label('pending'),
                 func.count(case((FuelOrder.status.in_(in_progress_statuses), FuelOrder.id))).label('in_progress'),
                 func.count(case((FuelOrder.status.in_(completed_statuses), FuelOrder.id))).label('completed')
-            ).one_or_none()
+            )
+            # Completed orders are only counted within the active window
+            counts = counts_query.filter(cls._active_window(None)).one_or_none()
             result_counts = {
                 'pending': counts[0] if counts else 0,
                 'in_progress': counts[1] if counts else 0,
@@ -51,6 +122,7 @@ class FuelOrderService:
             return None, f"Database error retrieving status counts: {str(e)}", 500
 
     @classmethod
+    @read_only
     def get_status_counts(cls, current_user):
         """
         PBAC: Permission-based, not role-based. Only users with 'VIEW_ORDER_STATS' permission should access this.
@@ -115,31 +187,10 @@ class FuelOrderService:
             return None, "Missing required fields for fuel order (fuel_type, LST, truck).", 400, aircraft_created_this_request
 
         # --- LST Assignment Logic ---
-        if assigned_lst_user_id == -1:
-            active_lsts = User.query.filter(User.role == UserRole.LST, User.is_active == True).all()
-            if not active_lsts:
-                return None, "No available LST found for auto-assignment.", 400, aircraft_created_this_request
-            min_count = None
-            chosen_lst = None
-            active_statuses = [
-                FuelOrderStatus.DISPATCHED,
-                FuelOrderStatus.ACKNOWLEDGED,
-                FuelOrderStatus.EN_ROUTE,
-                FuelOrderStatus.FUELING
-            ]
-            for lst in active_lsts:
-                count = FuelOrder.query.filter(
-                    FuelOrder.assigned_lst_user_id == lst.id,
-                    FuelOrder.status.in_(active_statuses)
-                ).count()
-                if min_count is None or count < min_count:
-                    min_count = count
-                    chosen_lst = lst
-            if not chosen_lst:
-                return None, "No available LST found for auto-assignment.", 400, aircraft_created_this_request
-            logger.info(f"Auto-assigned LST user: {chosen_lst.id} (Active orders: {min_count})")
-            assigned_lst_user_id = chosen_lst.id
-            # order_data['assigned_lst_user_id'] = assigned_lst_user_id # Not needed if using var directly
+        # -1 is resolved at commit time, under the chosen LST's row lock
+        auto_assign_lst = assigned_lst_user_id == -1
+        if auto_assign_lst:
+            assigned_lst_user_id = None
         else:
             lst_user = User.query.filter_by(id=assigned_lst_user_id, role=UserRole.LST, is_active=True).first()
             if not lst_user:
@@ -172,6 +223,7 @@ class FuelOrderService:
                 additive_requested=order_data.get('additive_requested', False),
                 requested_amount=order_data.get('requested_amount'),
                 location_on_ramp=order_data.get('location_on_ramp'),
+                ramp_spot_id=order_data.get('ramp_spot_id'),
                 csr_notes=order_data.get('csr_notes'),
                 status=FuelOrderStatus.DISPATCHED,
                 dispatch_timestamp=datetime.utcnow()
@@ -179,7 +231,17 @@ class FuelOrderService:
             db.session.add(new_order)
             
             # Commit the session (includes new_order and potentially new_aircraft)
-            db.session.commit()
+            if auto_assign_lst:
+                lst_id, message, status_code = cls.commit_with_auto_assigned_lst(new_order)
+                if lst_id is None:
+                    return None, message, status_code, False
+                logger.info(f"Auto-assigned LST user: {lst_id}")
+            else:
+                db.session.commit()
+            FUEL_ORDERS_DISPATCHED.inc()
+            if aircraft_created_this_request:
+                tail_number_index.upsert(aircraft.tail_number, aircraft.aircraft_type, aircraft.fuel_type)
+                invalidation_bus.publish('aircraft', aircraft.tail_number)
             
             message = "Fuel order created successfully."
             if aircraft_created_this_request:
@@ -196,48 +258,52 @@ class FuelOrderService:
             return None, f"Database error during fuel order creation: {str(e)}", 500, aircraft_created_this_request
 
     @classmethod
+    @read_only
     def get_fuel_orders(
         cls,
         current_user: User,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
     ) -> Tuple[Optional[Any], str]:
         """
         Retrieve paginated fuel orders based on user PBAC and optional filters.
         PBAC: If user lacks 'VIEW_ALL_ORDERS', only show orders assigned to them.
+        If `fields` is given (already validated by the route), only the columns
+        backing those fields are selected.
         """
         logger = logging.getLogger(__name__)
         try:
             logger.info(f"[FuelOrderService.get_fuel_orders] User: {getattr(current_user, 'id', None)} | Filters: {filters}")
             query = FuelOrder.query
+            if fields:
+                query = query.options(load_only_fields(FuelOrder, fields, FUEL_ORDER_FIELD_COLUMNS))
 
             # PBAC: Only show all orders if user has permission
-            if not current_user.has_permission('VIEW_ALL_ORDERS'):
-                # Only see their assigned orders
-                query = query.filter(FuelOrder.assigned_lst_user_id == current_user.id)
+            query = cls._scope_to_user(query, current_user)
 
             # Apply filtering based on request parameters
+            statuses = None
             if filters:
                 status_filter = filters.get('status')
                 if status_filter:
                     try:
                         status_enum = FuelOrderStatus[status_filter.upper()]
                         query = query.filter(FuelOrder.status == status_enum)
+                        statuses = [status_enum]
                     except KeyError:
                         return None, f"Invalid status value provided: {status_filter}"
                 # TODO: Add other filters here
 
+            # Date bounds (explicit range or the active window) let Postgres prune partitions
             try:
-                page = int(filters.get('page', 1))
-                per_page = int(filters.get('per_page', 20))
-                if page < 1:
-                    page = 1
-                if per_page < 1:
-                    per_page = 20
-                if per_page > 100:
-                    per_page = 100
-            except (ValueError, TypeError):
-                page = 1
-                per_page = 20
+                query = cls._apply_date_bounds(query, *cls._get_date_bounds(filters))
+            except ValueError as e:
+                return None, str(e)
+            window = cls._active_window(filters, statuses)
+            if window is not None:
+                query = query.filter(window)
+
+            page, per_page = cls._get_pagination_params(filters)
 
             try:
                 paginated_orders = query.order_by(FuelOrder.created_at.desc()).paginate(
@@ -253,6 +319,155 @@ class FuelOrderService:
             logger.error(f"Unhandled exception in FuelOrderService.get_fuel_orders: {str(e)}\n{traceback.format_exc()}")
             return None, f"An internal server error occurred in FuelOrderService.get_fuel_orders: {str(e)}"
 
+    @staticmethod
+    def _get_pagination_params(filters: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+        """Read page/per_page from request filters, clamped to 1..100 per page."""
+        filters = filters or {}
+        try:
+            page = int(filters.get('page', 1))
+            per_page = int(filters.get('per_page', 20))
+            if page < 1:
+                page = 1
+            if per_page < 1:
+                per_page = 20
+            if per_page > 100:
+                per_page = 100
+        except (ValueError, TypeError):
+            page = 1
+            per_page = 20
+        return page, per_page
+
+    @staticmethod
+    def _get_date_bounds(filters: Optional[Dict[str, Any]]) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Read the created_at range from `date_from`/`date_to` (ISO dates or datetimes).
+
+        A bare `date_to` date includes that whole day.
+
+        Raises:
+            ValueError: If a date cannot be parsed.
+        """
+        filters = filters or {}
+        bounds = []
+        for key in ('date_from', 'date_to'):
+            value = filters.get(key)
+            if not value:
+                bounds.append(None)
+                continue
+            try:
+                parsed = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid {key} value provided: {value}. Expected ISO 8601 date.")
+            if key == 'date_to' and len(value) == 10:
+                parsed += timedelta(days=1)
+            bounds.append(parsed)
+        return bounds[0], bounds[1]
+
+    @staticmethod
+    def _active_window(filters: Optional[Dict[str, Any]], statuses: Optional[List[FuelOrderStatus]] = None):
+        """
+        Filter condition for the active window: finished orders (TERMINAL_STATUSES)
+        older than FUEL_ORDER_ACTIVE_WINDOW_DAYS are left out, open orders are
+        kept however old they are.
+
+        `statuses` are the statuses the query is already limited to, if any.
+        When they are all terminal the condition is a plain created_at bound,
+        which lets Postgres prune partitions. Returns None (no window) when a
+        date range or `window=all` is given, or no status in `statuses` is
+        terminal.
+        """
+        from sqlalchemy import or_
+
+        filters = filters or {}
+        if filters.get('date_from') or filters.get('date_to') or filters.get('window') == 'all':
+            return None
+        if statuses is not None and not any(status in TERMINAL_STATUSES for status in statuses):
+            return None
+        days = current_app.config.get('FUEL_ORDER_ACTIVE_WINDOW_DAYS', 90)
+        recent = FuelOrder.created_at >= datetime.utcnow() - timedelta(days=days)
+        if statuses is not None and all(status in TERMINAL_STATUSES for status in statuses):
+            return recent
+        return or_(FuelOrder.status.notin_(TERMINAL_STATUSES), recent)
+
+    @staticmethod
+    def _apply_date_bounds(query, date_from: Optional[datetime], date_to: Optional[datetime]):
+        """Filter on created_at, the fuel_orders partition key."""
+        if date_from is not None:
+            query = query.filter(FuelOrder.created_at >= date_from)
+        if date_to is not None:
+            query = query.filter(FuelOrder.created_at < date_to)
+        return query
+
+    @staticmethod
+    def _scope_to_user(query, current_user: User):
+        """PBAC: Only show all orders if user has 'VIEW_ALL_ORDERS', otherwise only their assigned orders."""
+        if not current_user.has_permission('VIEW_ALL_ORDERS'):
+            query = query.filter(FuelOrder.assigned_lst_user_id == current_user.id)
+        return query
+
+    @classmethod
+    @read_only
+    def search_fuel_orders(
+        cls,
+        current_user: User,
+        search_text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Optional[Any], str, int]:
+        """
+        Full-text search over tail number, ramp location, CSR notes and LST notes.
+
+        Uses the GIN-indexed `search_vector` column on Postgres and the
+        `fuel_orders_fts` FTS5 table on SQLite (see models/fuel_order_search.py).
+        Results are ranked best match first, paginated and PBAC-scoped like
+        get_fuel_orders.
+
+        Returns:
+            Tuple[Optional[Pagination], str, int]: paginated orders, message, HTTP status code
+        """
+        from sqlalchemy import func, literal_column, table, column
+        from src.models.fuel_order_search import SEARCH_VECTOR_COLUMN, SQLITE_FTS_TABLE
+
+        search_text = (search_text or '').strip()
+        if not search_text:
+            return None, "Search query parameter 'q' is required.", 400
+
+        query = FuelOrder.query
+        if fields:
+            query = query.options(load_only_fields(FuelOrder, fields, FUEL_ORDER_FIELD_COLUMNS))
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            tsquery = func.websearch_to_tsquery('english', search_text)
+            vector = literal_column(f'fuel_orders.{SEARCH_VECTOR_COLUMN}')
+            query = query.filter(vector.op('@@')(tsquery)).order_by(
+                func.ts_rank_cd(vector, tsquery).desc(), FuelOrder.id.desc()
+            )
+        elif dialect == 'sqlite':
+            # Quote every term so user input is never parsed as FTS5 query syntax
+            terms = ['"' + term.replace('"', '""') + '"' for term in search_text.split()]
+            fts = table(SQLITE_FTS_TABLE, column('rowid'), column('rank'))
+            query = query.join(fts, fts.c.rowid == FuelOrder.id).filter(
+                literal_column(SQLITE_FTS_TABLE).op('MATCH')(' '.join(terms))
+            ).order_by(fts.c.rank.asc(), FuelOrder.id.desc())
+        else:
+            return None, f"Full-text search is not supported on the '{dialect}' database.", 501
+
+        query = cls._scope_to_user(query, current_user)
+        # Search covers all history unless a date range is given
+        try:
+            query = cls._apply_date_bounds(query, *cls._get_date_bounds(filters))
+        except ValueError as e:
+            return None, str(e), 400
+        page, per_page = cls._get_pagination_params(filters)
+        try:
+            results = query.paginate(page=page, per_page=per_page, error_out=False)
+            return results, "Search completed successfully.", 200
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error searching fuel orders: {str(e)}")
+            return None, f"Database error while searching orders: {str(e)}", 500
+
     @classmethod
     def get_fuel_order_by_id(
         cls,
@@ -329,14 +544,8 @@ class FuelOrderService:
             # Should not happen due to auth middleware, but let's be thorough
             return None, "Forbidden: Invalid user role.", 403
 
-        # Define allowed transitions for LST updates via this endpoint
-        allowed_transitions = {
-            FuelOrderStatus.DISPATCHED: [FuelOrderStatus.ACKNOWLEDGED],
-            FuelOrderStatus.ACKNOWLEDGED: [FuelOrderStatus.EN_ROUTE],
-            FuelOrderStatus.EN_ROUTE: [FuelOrderStatus.FUELING]
-            # Note: Fueling -> Completed will be handled by a separate 'complete_order' endpoint
-            # Note: Cancellation will be handled by a separate endpoint with different permissions
-        }
+        # Allowed transitions for LST updates via this endpoint
+        allowed_transitions = ALLOWED_STATUS_TRANSITIONS
 
         # Validate the requested transition
         if order.status not in allowed_transitions or new_status not in allowed_transitions[order.status]:
@@ -354,8 +563,19 @@ class FuelOrderService:
             elif new_status == FuelOrderStatus.FUELING:
                 order.fueling_start_timestamp = datetime.utcnow()
 
+            # A truck that starts fueling is at the order's ramp spot
+            moved_truck = None
+            if new_status == FuelOrderStatus.FUELING:
+                from src.services.fuel_truck_service import FuelTruckService
+                moved_truck = FuelTruckService.place_at_spot(
+                    order.assigned_truck_id, order.ramp_spot_id, order.fueling_start_timestamp
+                )
+
             # Commit the changes
             db.session.commit()
+            if moved_truck is not None:
+                ramp_index.upsert_truck(moved_truck)
+                invalidation_bus.publish('fuel_truck', moved_truck.id)
 
             return order, f"Order status successfully updated to {new_status.value}.", 200  # OK
 
@@ -407,16 +627,9 @@ class FuelOrderService:
             return None, f"Order cannot be completed from its current status ({order.status.value}). Must be 'Fueling'.", 400  # Bad Request
 
         # Extract and validate meter readings
-        try:
-            start_meter = Decimal(completion_data['start_meter_reading'])
-            end_meter = Decimal(completion_data['end_meter_reading'])
-            if end_meter < start_meter:
-                return None, "End meter reading cannot be less than start meter reading.", 400  # Bad Request
-            # Add checks for negative values if necessary
-            if start_meter < 0 or end_meter < 0:
-                return None, "Meter readings cannot be negative.", 400
-        except (KeyError, ValueError, TypeError):
-            return None, "Invalid or missing meter reading values.", 400
+        start_meter, end_meter, error = cls._parse_meter_readings(completion_data)
+        if error:
+            return None, error, 400  # Bad Request
 
         lst_notes = completion_data.get('lst_notes')  # Optional notes
 
@@ -433,12 +646,188 @@ class FuelOrderService:
 
         try:
             db.session.commit()
+            FUEL_ORDERS_COMPLETED.inc()
             return order, "Fuel order completed successfully.", 200  # OK
         except Exception as e:
             db.session.rollback()
             current_app.logger.error(f"Error completing fuel order: {str(e)}")
             return None, f"Database error while completing order: {str(e)}", 500  # Internal Server Error
 
+    @staticmethod
+    def _parse_meter_readings(data: Dict[str, Any]) -> Tuple[Optional[Decimal], Optional[Decimal], Optional[str]]:
+        """Validate start/end meter readings. Returns (start, end, error message or None)."""
+        try:
+            start_meter = Decimal(str(data['start_meter_reading']))
+            end_meter = Decimal(str(data['end_meter_reading']))
+            if not start_meter.is_finite() or not end_meter.is_finite():
+                raise ValueError
+        except (KeyError, ValueError, TypeError, ArithmeticError):
+            return None, None, "Invalid or missing meter reading values."
+        if end_meter < start_meter:
+            return None, None, "End meter reading cannot be less than start meter reading."
+        if start_meter < 0 or end_meter < 0:
+            return None, None, "Meter readings cannot be negative."
+        return start_meter, end_meter, None
+
+    @staticmethod
+    def _parse_client_timestamp(value: Any) -> datetime:
+        """Parse an ISO 8601 client timestamp into naive UTC."""
+        from datetime import timezone
+
+        if not isinstance(value, str):
+            raise ValueError("'timestamp' must be an ISO 8601 string.")
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {value}")
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    @classmethod
+    def sync_status_transitions(
+        cls,
+        items: List[Dict[str, Any]],
+        current_user: User
+    ) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """
+        Apply a queued sequence of LST status transitions recorded offline.
+
+        Each item is `{"order_id", "status", "timestamp"}`; a COMPLETED item also
+        carries `start_meter_reading`, `end_meter_reading` and optionally
+        `lst_notes`. Items are applied in the order given, so several steps for
+        one order can be sent together. Each is validated like the live
+        endpoints: the user must be the assigned LST, the transition must be in
+        SYNC_STATUS_TRANSITIONS, and the client timestamp (kept as the stage
+        timestamp) may not precede the order's previous stage nor be in the
+        future. Invalid items are reported and skipped; all valid ones are
+        committed in a single transaction.
+
+        Returns:
+            Tuple[Optional[Dict], str, int]: {'applied': n, 'skipped': n,
+            'results': [...], 'orders': [...]}, message, HTTP status code.
+            Each result has 'result' set to 'applied', 'conflict' (the order's
+            state does not allow the step) or 'rejected' (invalid item).
+        """
+        if not isinstance(items, list) or not items:
+            return None, "'items' must be a non-empty list.", 400
+        if len(items) > MAX_SYNC_ITEMS:
+            return None, f"At most {MAX_SYNC_ITEMS} items can be synced per request.", 400
+
+        def valid_order_id(item):
+            order_id = item.get('order_id') if isinstance(item, dict) else None
+            return order_id if isinstance(order_id, int) and not isinstance(order_id, bool) else None
+
+        order_ids = {valid_order_id(item) for item in items} - {None}
+        try:
+            # Lock every order touched so live updates cannot interleave with the batch
+            orders = {
+                order.id: order for order in
+                FuelOrder.query.filter(FuelOrder.id.in_(order_ids)).with_for_update().all()
+            } if order_ids else {}
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error loading fuel orders for sync: {str(e)}")
+            return None, f"Database error while syncing orders: {str(e)}", 500
+
+        from src.services.fuel_truck_service import FuelTruckService
+
+        can_complete = current_user.has_permission('COMPLETE_OWN_ORDER')
+        latest_allowed = datetime.utcnow() + SYNC_CLOCK_SKEW
+        results = []
+        moved_trucks = []
+        for index, item in enumerate(items):
+            result = {'index': index, 'order_id': item.get('order_id') if isinstance(item, dict) else None}
+            results.append(result)
+            if not isinstance(item, dict):
+                result.update(result='rejected', error="Item must be an object.")
+                continue
+            if valid_order_id(item) is None:
+                result.update(result='rejected', error="'order_id' must be an integer.")
+                continue
+            order = orders.get(item['order_id'])
+            if order is None:
+                result.update(result='rejected', error=f"Fuel order with ID {item.get('order_id')} not found.")
+                continue
+            if order.assigned_lst_user_id != current_user.id:
+                result.update(result='rejected', error="Forbidden: You are not assigned to this fuel order.")
+                continue
+            try:
+                new_status = FuelOrderStatus[str(item.get('status', '')).upper()]
+                timestamp = cls._parse_client_timestamp(item.get('timestamp'))
+            except KeyError:
+                result.update(result='rejected', error=f"Invalid status value provided: {item.get('status')}")
+                continue
+            except ValueError as e:
+                result.update(result='rejected', error=str(e))
+                continue
+            result['status'] = new_status.name
+
+            if new_status not in SYNC_STATUS_TRANSITIONS.get(order.status, []):
+                result.update(result='conflict',
+                              error=f"Invalid status transition from {order.status.value} to {new_status.value}.",
+                              current_status=order.status.name)
+                continue
+            previous = max(
+                [t for t in (order.dispatch_timestamp, order.acknowledge_timestamp,
+                             order.en_route_timestamp, order.fueling_start_timestamp) if t is not None],
+                default=None
+            )
+            if timestamp > latest_allowed:
+                result.update(result='rejected', error="Timestamp is in the future.")
+                continue
+            if previous is not None and timestamp < previous:
+                result.update(result='conflict', error="Timestamp precedes the order's previous status change.",
+                              current_status=order.status.name)
+                continue
+
+            if new_status == FuelOrderStatus.COMPLETED:
+                if not can_complete:
+                    result.update(result='rejected', error="Forbidden: COMPLETE_OWN_ORDER permission required.")
+                    continue
+                start_meter, end_meter, error = cls._parse_meter_readings(item)
+                if error:
+                    result.update(result='rejected', error=error)
+                    continue
+                order.start_meter_reading = start_meter
+                order.end_meter_reading = end_meter
+                order.lst_notes = item.get('lst_notes')
+
+            order.status = new_status
+            setattr(order, STATUS_TIMESTAMP_COLUMNS[new_status], timestamp)
+            if new_status == FuelOrderStatus.FUELING:
+                truck = FuelTruckService.place_at_spot(order.assigned_truck_id, order.ramp_spot_id, timestamp)
+                if truck is not None:
+                    moved_trucks.append(truck)
+            result['result'] = 'applied'
+
+        applied = sum(1 for r in results if r['result'] == 'applied')
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error committing fuel order sync: {str(e)}")
+            return None, f"Database error while syncing orders: {str(e)}", 500
+        completed = sum(1 for r in results
+                        if r['result'] == 'applied' and r.get('status') == FuelOrderStatus.COMPLETED.name)
+        if completed:
+            FUEL_ORDERS_COMPLETED.inc(completed)
+        for truck in moved_trucks:
+            ramp_index.upsert_truck(truck)
+            invalidation_bus.publish('fuel_truck', truck.id)
+
+        touched = {r['order_id'] for r in results if valid_order_id(r) in orders}
+        summary = {
+            'applied': applied,
+            'skipped': len(results) - applied,
+            'results': results,
+            'orders': [
+                {'id': order_id, 'status': orders[order_id].status.value}
+                for order_id in sorted(touched)
+            ],
+        }
+        return summary, f"Applied {applied} of {len(results)} status change(s).", 200
+
     @classmethod
     def review_fuel_order(
         cls,
@@ -481,6 +870,387 @@ class FuelOrderService:
             return None, f"Database error while marking order as reviewed: {str(e)}", 500  # Internal Server Error
 
     @classmethod
+    def review_fuel_orders(
+        cls,
+        reviewer_user: User,
+        order_ids: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """
+        Mark many COMPLETED fuel orders as reviewed in one set-based UPDATE.
+
+        Exactly one of `order_ids` or `filters` selects the orders. Filters
+        accept `assigned_lst_user_id` and the created_at range used by
+        get_fuel_orders (`date_from`, `date_to`, active window by default).
+        Orders that are not COMPLETED are left alone; for `order_ids` they are
+        reported as skipped with the reason.
+
+        Returns:
+            Tuple[Optional[Dict], str, int]: {'reviewed': [...], 'skipped': [...],
+            'reviewed_timestamp': ...}, message, HTTP status code
+        """
+        from sqlalchemy import select, update
+
+        if (order_ids is None) == (filters is None):
+            return None, "Provide either 'order_ids' or 'filter'.", 400
+
+        conditions = [FuelOrder.status == FuelOrderStatus.COMPLETED]
+        if order_ids is not None:
+            if not isinstance(order_ids, list) or not order_ids or \
+                    not all(isinstance(i, int) and not isinstance(i, bool) for i in order_ids):
+                return None, "'order_ids' must be a non-empty list of integers.", 400
+            order_ids = list(dict.fromkeys(order_ids))
+            if len(order_ids) > MAX_BULK_REVIEW_IDS:
+                return None, f"At most {MAX_BULK_REVIEW_IDS} orders can be reviewed per request.", 400
+            conditions.append(FuelOrder.id.in_(order_ids))
+        else:
+            if not isinstance(filters, dict):
+                return None, "'filter' must be an object.", 400
+            lst_user_id = filters.get('assigned_lst_user_id')
+            if lst_user_id is not None:
+                if not isinstance(lst_user_id, int) or isinstance(lst_user_id, bool):
+                    return None, "'assigned_lst_user_id' must be an integer.", 400
+                conditions.append(FuelOrder.assigned_lst_user_id == lst_user_id)
+            try:
+                date_from, date_to = cls._get_date_bounds(filters)
+            except ValueError as e:
+                return None, str(e), 400
+            if date_from is not None:
+                conditions.append(FuelOrder.created_at >= date_from)
+            if date_to is not None:
+                conditions.append(FuelOrder.created_at < date_to)
+            window = cls._active_window(filters, [FuelOrderStatus.COMPLETED])
+            if window is not None:
+                conditions.append(window)
+
+        reviewed_at = datetime.utcnow()
+        values = {
+            'status': FuelOrderStatus.REVIEWED,
+            'reviewed_by_csr_user_id': reviewer_user.id,
+            'reviewed_timestamp': reviewed_at,
+        }
+        try:
+            if db.session.get_bind().dialect.update_returning:
+                reviewed_ids = db.session.execute(
+                    update(FuelOrder).where(*conditions).values(**values).returning(FuelOrder.id),
+                    execution_options={'synchronize_session': False}
+                ).scalars().all()
+            else:
+                reviewed_ids = db.session.execute(
+                    select(FuelOrder.id).where(*conditions).with_for_update()
+                ).scalars().all()
+                if reviewed_ids:
+                    db.session.execute(
+                        update(FuelOrder).where(FuelOrder.id.in_(reviewed_ids)).values(**values),
+                        execution_options={'synchronize_session': False}
+                    )
+
+            skipped = []
+            if order_ids is not None:
+                reviewed_set = set(reviewed_ids)
+                missing = [i for i in order_ids if i not in reviewed_set]
+                if missing:
+                    statuses = dict(db.session.execute(
+                        select(FuelOrder.id, FuelOrder.status).where(FuelOrder.id.in_(missing))
+                    ).all())
+                    for order_id in missing:
+                        status = statuses.get(order_id)
+                        reason = 'Not found' if status is None else f"Status is '{status.value}', must be 'Completed'"
+                        skipped.append({'id': order_id, 'reason': reason})
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error bulk reviewing fuel orders: {str(e)}")
+            return None, f"Database error while marking orders as reviewed: {str(e)}", 500
+
+        result = {
+            'reviewed': sorted(reviewed_ids),
+            'skipped': skipped,
+            'reviewed_timestamp': reviewed_at.isoformat(),
+        }
+        return result, f"{len(reviewed_ids)} fuel order(s) marked as reviewed.", 200
+
+    @classmethod
+    def optimize_assignments(cls, dry_run: bool = False) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """
+        Re-plan LST and truck assignments of all DISPATCHED (not yet acknowledged)
+        orders in one pass, balancing load across active, on-shift LSTs and
+        trucks. Unassigned orders are left in the claim queue (see claim_next_order).
+
+        See services/dispatch_optimizer.py for the cost model. With `dry_run`
+        the plan is returned without changing any order. Otherwise the pending
+        orders are locked (rows locked by a concurrent acknowledgement are
+        skipped) and the changed assignments are written in one transaction.
+
+        Returns:
+            Tuple[Optional[Dict], str, int]: {'dry_run', 'orders_considered',
+            'reassigned', 'plan': [...], 'unplaced': [...], 'solve_ms'}, message,
+            HTTP status code. Orders in `unplaced` keep their current LST or truck.
+        """
+        import time
+        from sqlalchemy import bindparam, select, update
+        from src.models import Role
+        from src.services.dispatch_optimizer import (
+            LST_ROLE_NAME, DispatchOrder, DispatchTruck, agent_states, plan_assignments
+        )
+
+        busy_statuses = [FuelOrderStatus.ACKNOWLEDGED, FuelOrderStatus.EN_ROUTE, FuelOrderStatus.FUELING]
+        try:
+            pending_query = select(
+                FuelOrder.id, FuelOrder.fuel_type, FuelOrder.requested_amount, FuelOrder.location_on_ramp,
+                FuelOrder.assigned_lst_user_id, FuelOrder.assigned_truck_id
+            ).where(
+                FuelOrder.status == FuelOrderStatus.DISPATCHED,
+                FuelOrder.assigned_lst_user_id.isnot(None)
+            ).order_by(FuelOrder.id)
+            if not dry_run:
+                pending_query = pending_query.with_for_update(skip_locked=True)
+            orders = [
+                DispatchOrder(row.id, row.fuel_type,
+                              float(row.requested_amount) if row.requested_amount is not None else None,
+                              row.location_on_ramp, row.assigned_lst_user_id, row.assigned_truck_id)
+                for row in db.session.execute(pending_query)
+            ]
+            lst_query = select(User.id).where(User.is_active == True, User.roles.any(Role.name == LST_ROLE_NAME))
+            on_shift = cls._on_shift_condition()
+            if on_shift is not None:
+                lst_query = lst_query.where(on_shift)
+            lst_ids = db.session.execute(lst_query.order_by(User.id)).scalars().all()
+            trucks = [
+                DispatchTruck(row.id, row.fuel_type, float(row.capacity))
+                for row in db.session.execute(
+                    select(FuelTruck.id, FuelTruck.fuel_type, FuelTruck.capacity)
+                    .where(FuelTruck.is_active == True).order_by(FuelTruck.id)
+                )
+            ]
+            busy = db.session.execute(
+                select(FuelOrder.assigned_lst_user_id, FuelOrder.assigned_truck_id, FuelOrder.location_on_ramp)
+                .where(FuelOrder.status.in_(busy_statuses))
+            ).all()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error loading orders for assignment optimization: {str(e)}")
+            return None, f"Database error while loading pending orders: {str(e)}", 500
+
+        started = time.perf_counter()
+        try:
+            plan = plan_assignments(
+                orders, lst_ids, trucks,
+                lst_states=agent_states((row[0], row[2]) for row in busy),
+                truck_states=agent_states((row[1], row[2]) for row in busy),
+                max_orders_per_lst=current_app.config.get('DISPATCH_MAX_ACTIVE_ORDERS_PER_LST', 8)
+            )
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error planning fuel order assignments: {str(e)}")
+            return None, f"Error while planning assignments: {str(e)}", 500
+        solve_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        changes = []
+        unplaced = []
+        for order, entry in zip(orders, plan):
+            if entry['lst_user_id'] is None:
+                unplaced.append({'order_id': order.id, 'reason': 'Every active LST is at the active order limit'})
+            if entry['truck_id'] is None:
+                unplaced.append({'order_id': order.id, 'reason': 'No active truck carries this fuel type and amount'})
+            # Keep the current agent when the solver could not place the order
+            lst_user_id = entry['lst_user_id'] if entry['lst_user_id'] is not None else order.assigned_lst_user_id
+            truck_id = entry['truck_id'] if entry['truck_id'] is not None else order.assigned_truck_id
+            entry.update({
+                'current_lst_user_id': order.assigned_lst_user_id,
+                'current_truck_id': order.assigned_truck_id,
+                'lst_user_id': lst_user_id,
+                'truck_id': truck_id,
+                'changed': (lst_user_id, truck_id) != (order.assigned_lst_user_id, order.assigned_truck_id),
+            })
+            if entry['changed']:
+                changes.append({'b_id': order.id, 'b_lst': lst_user_id, 'b_truck': truck_id})
+
+        if not dry_run and changes:
+            table = FuelOrder.__table__
+            try:
+                db.session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam('b_id'))
+                    .values(assigned_lst_user_id=bindparam('b_lst'), assigned_truck_id=bindparam('b_truck'),
+                            updated_at=datetime.utcnow()),
+                    changes
+                )
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error(f"Error applying optimized assignments: {str(e)}")
+                return None, f"Database error while applying assignments: {str(e)}", 500
+        db.session.commit()
+
+        result = {
+            'dry_run': dry_run,
+            'orders_considered': len(orders),
+            'reassigned': len(changes),
+            'plan': plan,
+            'unplaced': unplaced,
+            'solve_ms': solve_ms,
+        }
+        verb = "would be reassigned" if dry_run else "reassigned"
+        return result, f"{len(changes)} of {len(orders)} pending fuel order(s) {verb}.", 200
+
+    @staticmethod
+    def _on_shift_condition(at: Optional[datetime] = None):
+        """
+        Restricts a User query to LSTs working at `at` (default now), per the
+        shift index. None when no shifts are rostered, in which case every
+        active LST counts as available.
+        """
+        lst_shift_index.ensure_loaded()
+        if not lst_shift_index.has_roster:
+            return None
+        return User.id.in_(lst_shift_index.on_shift(at))
+
+    @classmethod
+    def _lock_least_busy_lst(cls) -> Optional[int]:
+        """
+        Select the active, on-shift LST with the fewest active orders and lock
+        their user row until the transaction ends.
+
+        LSTs whose row is locked by another dispatch in progress are skipped, so
+        simultaneous dispatches spread over different LSTs instead of all
+        reading the same counts and picking the same one. Only when every LST
+        is being assigned at once does this wait for the least busy one.
+        """
+        from sqlalchemy import func, select
+        from src.models import Role
+        from src.services.dispatch_optimizer import LST_ROLE_NAME
+
+        active_orders = select(func.count(FuelOrder.id)).where(
+            FuelOrder.assigned_lst_user_id == User.id,
+            FuelOrder.status.in_(LST_ACTIVE_STATUSES)
+        ).correlate(User).scalar_subquery()
+        query = select(User.id).where(
+            User.is_active == True,
+            User.roles.any(Role.name == LST_ROLE_NAME)
+        ).order_by(active_orders, User.id).limit(1)
+        on_shift = cls._on_shift_condition()
+        if on_shift is not None:
+            query = query.where(on_shift)
+
+        lst_id = db.session.execute(query.with_for_update(of=User, skip_locked=True)).scalar()
+        if lst_id is None:
+            lst_id = db.session.execute(query.with_for_update(of=User)).scalar()
+        return lst_id
+
+    @classmethod
+    def commit_with_auto_assigned_lst(cls, fuel_order: FuelOrder) -> Tuple[Optional[int], str, int]:
+        """
+        Assign the least busy active LST to a new order that has been added to
+        the session, and commit it.
+
+        On Postgres the chosen LST's user row stays locked (FOR UPDATE SKIP
+        LOCKED) until the order is committed, so concurrent dispatches in any
+        worker see each other's assignments. Other databases have no row locks;
+        there assignment is serialized within the worker.
+
+        Returns:
+            Tuple[Optional[int], str, int]: the assigned LST user id (None on
+            failure), message, HTTP status code. On failure the session has
+            been rolled back.
+        """
+        row_locks = db.session.get_bind().dialect.name == 'postgresql'
+        guard = nullcontext() if row_locks else _lst_assignment_lock
+        try:
+            with guard:
+                with db.session.no_autoflush:
+                    lst_id = cls._lock_least_busy_lst()
+                if lst_id is None:
+                    db.session.rollback()
+                    return None, "No active LST on shift is available for auto-assignment", 400
+                fuel_order.assigned_lst_user_id = lst_id
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error during auto-assignment of LST: {str(e)}")
+            return None, f"Error during auto-assignment of LST: {str(e)}", 500
+        return lst_id, "LST auto-assigned successfully", 201
+
+    @classmethod
+    def claim_next_order(
+        cls,
+        current_user: User,
+        truck_id: Optional[int] = None,
+        fuel_type: Optional[str] = None
+    ) -> Tuple[Optional[FuelOrder], str, int]:
+        """
+        Let an LST claim the oldest unassigned DISPATCHED order (pull mode).
+
+        With `truck_id` only orders the truck can serve are considered (same
+        fuel type, requested amount within capacity, no other truck assigned)
+        and the truck is assigned with the order; with `fuel_type` only orders
+        for that fuel. The claimed order is assigned to the LST and moves to
+        ACKNOWLEDGED.
+
+        The candidate is selected with FOR UPDATE SKIP LOCKED, so LSTs claiming
+        at the same time each get a different order without waiting on one
+        another. The update re-checks that the order is still unassigned, which
+        keeps claims exclusive on databases without row locks as well.
+
+        Returns:
+            Tuple[Optional[FuelOrder], str, int]: the claimed order (None if
+            nothing is waiting or on error), message, HTTP status code (200,
+            400, 409, 500).
+        """
+        from sqlalchemy import func, or_, select, update
+
+        conditions = [FuelOrder.status == FuelOrderStatus.DISPATCHED, FuelOrder.assigned_lst_user_id.is_(None)]
+        if truck_id is not None:
+            truck = db.session.get(FuelTruck, truck_id)
+            if truck is None or not truck.is_active:
+                return None, f"Active fuel truck with ID {truck_id} not found.", 400
+            fuel_type = truck.fuel_type
+            conditions.append(or_(FuelOrder.assigned_truck_id.is_(None), FuelOrder.assigned_truck_id == truck_id))
+            conditions.append(or_(FuelOrder.requested_amount.is_(None), FuelOrder.requested_amount <= truck.capacity))
+        if fuel_type:
+            conditions.append(func.lower(func.trim(FuelOrder.fuel_type)) == fuel_type.strip().lower())
+
+        limit = current_app.config.get('DISPATCH_MAX_ACTIVE_ORDERS_PER_LST', 8)
+        active = FuelOrder.query.filter(
+            FuelOrder.assigned_lst_user_id == current_user.id,
+            FuelOrder.status.in_(LST_ACTIVE_STATUSES)
+        ).count()
+        if active >= limit:
+            return None, f"You already have {active} active orders; complete one before claiming another.", 409
+
+        candidate_query = select(FuelOrder.id, FuelOrder.created_at).where(*conditions) \
+            .order_by(FuelOrder.created_at, FuelOrder.id).limit(1).with_for_update(skip_locked=True)
+        try:
+            for _ in range(MAX_CLAIM_ATTEMPTS):
+                candidate = db.session.execute(candidate_query).first()
+                if candidate is None:
+                    db.session.commit()
+                    return None, "No compatible unassigned orders are waiting.", 200
+                now = datetime.utcnow()
+                values = {
+                    'assigned_lst_user_id': current_user.id,
+                    'status': FuelOrderStatus.ACKNOWLEDGED,
+                    'acknowledge_timestamp': now,
+                    'updated_at': now,
+                }
+                if truck_id is not None:
+                    values['assigned_truck_id'] = truck_id
+                claimed = db.session.execute(
+                    update(FuelOrder)
+                    .where(FuelOrder.id == candidate.id, FuelOrder.created_at == candidate.created_at, *conditions)
+                    .values(**values),
+                    execution_options={'synchronize_session': False}
+                ).rowcount
+                db.session.commit()
+                if claimed:
+                    return db.session.get(FuelOrder, candidate.id), "Fuel order claimed.", 200
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error claiming next fuel order: {str(e)}")
+            return None, f"Database error while claiming an order: {str(e)}", 500
+        return None, "Could not claim an order; all candidates were taken. Please retry.", 409
+
+    @classmethod
+    @read_only
     def export_fuel_orders_to_csv(
         cls,
         current_user: User,
@@ -493,8 +1263,8 @@ class FuelOrderService:
             current_user (User): The authenticated user requesting the export
             filters (Optional[Dict[str, Any]]): Optional dictionary containing filter parameters
                 - status (str): Override default REVIEWED status filter
-                - date_from (str): Filter orders from this date (TODO)
-                - date_to (str): Filter orders until this date (TODO)
+                - date_from (str): Filter orders created on or after this ISO date
+                - date_to (str): Filter orders created on or before this ISO date
                 
         Returns:
             Tuple[Optional[str], str, int]: A tuple containing:
@@ -519,6 +1289,10 @@ class FuelOrderService:
                 return None, f"Invalid status value provided for export: {filters['status']}", 400
 
         query = query.filter(FuelOrder.status == target_status)
+        try:
+            query = cls._apply_date_bounds(query, *cls._get_date_bounds(filters))
+        except ValueError as e:
+            return None, str(e), 400
 
         try:
             # Fetch all orders matching the criteria, ordered by review timestamp
@@ -2,14 +2,19 @@ from typing import Tuple, List, Optional, Dict, Any
 
 from ..models.fuel_truck import FuelTruck
 from ..app import db
+from ..utils.fieldsets import load_only_fields
+from ..utils.invalidation import invalidation_bus
+from ..utils.spatial_index import ramp_index
 
 class FuelTruckService:
     """Service class for managing fuel truck operations."""
 
     @classmethod
-    def get_trucks(cls, filters: Optional[Dict[str, Any]] = None) -> Tuple[Optional[List[FuelTruck]], str, int]:
+    def get_trucks(cls, filters: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[Optional[List[FuelTruck]], str, int]:
         # ... (existing code unchanged)
         query = FuelTruck.query
+        if fields:
+            query = query.options(load_only_fields(FuelTruck, fields))
         if filters:
             is_active_filter = filters.get('is_active')
             if is_active_filter is not None:
@@ -41,6 +46,7 @@ class FuelTruckService:
             )
             db.session.add(new_truck)
             db.session.commit()
+            invalidation_bus.publish('fuel_truck', new_truck.id)
             return new_truck, "Fuel truck created successfully", 201
         except Exception as e:
             db.session.rollback()
@@ -80,6 +86,8 @@ class FuelTruckService:
             if 'is_active' in update_data:
                 truck.is_active = bool(update_data['is_active'])
             db.session.commit()
+            ramp_index.upsert_truck(truck)
+            invalidation_bus.publish('fuel_truck', truck.id)
             return truck, "Fuel truck updated successfully", 200
         except Exception as e:
             db.session.rollback()
@@ -94,7 +102,60 @@ class FuelTruckService:
                 return False, f"Fuel truck with ID {truck_id} not found", 404
             db.session.delete(truck)
             db.session.commit()
+            ramp_index.remove_truck(truck_id)
+            invalidation_bus.publish('fuel_truck', truck_id)
             return True, "Fuel truck deleted successfully", 200
         except Exception as e:
             db.session.rollback()
-            return False, f"Database error while deleting fuel truck: {str(e)}", 500
\ No newline at end of file
+            return False, f"Database error while deleting fuel truck: {str(e)}", 500
+
+    @classmethod
+    def update_position(cls, truck_id: int, data: Dict[str, Any]) -> Tuple[Optional[FuelTruck], str, int]:
+        """Record a truck's position, given as a ramp_spot_id or as x/y on the ramp grid."""
+        from datetime import datetime
+        import math
+        from ..models.ramp_spot import RampSpot
+
+        spot_id = data.get('ramp_spot_id')
+        if spot_id is not None:
+            spot = RampSpot.query.filter_by(id=spot_id, is_active=True).first()
+            if not spot:
+                return None, f"Active ramp spot with ID {spot_id} not found", 400
+            x, y = spot.x, spot.y
+        else:
+            x, y = data.get('x'), data.get('y')
+            if x is None or y is None or not (math.isfinite(x) and math.isfinite(y)):
+                return None, "Provide either ramp_spot_id or finite x and y.", 400
+        try:
+            truck = FuelTruck.query.get(truck_id)
+            if not truck:
+                return None, f"Fuel truck with ID {truck_id} not found", 404
+            truck.last_x, truck.last_y = x, y
+            truck.position_updated_at = datetime.utcnow()
+            db.session.commit()
+            ramp_index.upsert_truck(truck)
+            invalidation_bus.publish('fuel_truck', truck.id)
+            return truck, "Fuel truck position updated successfully", 200
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Database error while updating fuel truck position: {str(e)}", 500
+
+    @staticmethod
+    def place_at_spot(truck_id: Optional[int], spot_id: Optional[int], at) -> Optional[FuelTruck]:
+        """
+        Move a truck to a ramp spot's position as of `at`, unless a newer position
+        is already known. Does not commit; after committing, pass the returned
+        truck to ramp_index.upsert_truck and publish a 'fuel_truck' invalidation.
+        """
+        from ..models.ramp_spot import RampSpot
+
+        if truck_id is None or spot_id is None:
+            return None
+        truck = FuelTruck.query.get(truck_id)
+        spot = RampSpot.query.get(spot_id)
+        if truck is None or spot is None:
+            return None
+        if truck.position_updated_at is not None and truck.position_updated_at >= at:
+            return None
+        truck.last_x, truck.last_y, truck.position_updated_at = spot.x, spot.y, at
+        return truck
@@ -0,0 +1,164 @@
+from datetime import datetime
+from typing import Tuple, List, Optional, Dict, Any
+
+from marshmallow import ValidationError
+
+from ..models.lst_shift import LSTShift
+from ..models.role import Role
+from ..models.user import User
+from ..extensions import db
+from ..schemas.lst_shift_schemas import LSTShiftCreateSchema
+from ..utils.invalidation import invalidation_bus
+from ..utils.shift_index import lst_shift_index
+from .dispatch_optimizer import LST_ROLE_NAME
+
+
+class LSTShiftService:
+    """Service class for the LST shift roster."""
+
+    @staticmethod
+    def get_shifts(filters: Optional[Dict[str, Any]] = None) -> Tuple[List[LSTShift], str, int]:
+        """
+        Shifts ordered by start time.
+
+        Supported filters: user_id, and date_from/date_to (ISO datetimes) to
+        keep only shifts overlapping that range.
+        """
+        filters = filters or {}
+        query = LSTShift.query
+        try:
+            if filters.get('user_id'):
+                query = query.filter(LSTShift.user_id == int(filters['user_id']))
+            if filters.get('date_from'):
+                query = query.filter(LSTShift.end_time > datetime.fromisoformat(filters['date_from']))
+            if filters.get('date_to'):
+                query = query.filter(LSTShift.start_time < datetime.fromisoformat(filters['date_to']))
+        except (TypeError, ValueError):
+            return [], "Invalid filter: user_id must be an integer and dates ISO 8601.", 400
+        try:
+            return query.order_by(LSTShift.start_time.asc(), LSTShift.id.asc()).all(), \
+                "Shifts retrieved successfully", 200
+        except Exception as e:
+            return [], f"Database error while retrieving shifts: {str(e)}", 500
+
+    @staticmethod
+    def get_shift_by_id(shift_id: int) -> Tuple[Optional[LSTShift], str, int]:
+        try:
+            shift = db.session.get(LSTShift, shift_id)
+            if not shift:
+                return None, f"Shift with ID {shift_id} not found", 404
+            return shift, "Shift retrieved successfully", 200
+        except Exception as e:
+            return None, f"Database error while retrieving shift: {str(e)}", 500
+
+    @staticmethod
+    def _check_roster(user_id: int, start: datetime, end: datetime,
+                      exclude_id: Optional[int] = None) -> Tuple[Optional[str], int]:
+        """The user must be an active LST without another shift overlapping [start, end)."""
+        user = db.session.get(User, user_id)
+        if not user or not user.is_active:
+            return f"Active user with ID {user_id} not found.", 400
+        if not user.roles.filter(Role.name == LST_ROLE_NAME).first():
+            return f"User {user.username} is not a line service technician.", 400
+        overlapping = LSTShift.query.filter(
+            LSTShift.user_id == user_id,
+            LSTShift.start_time < end,
+            LSTShift.end_time > start
+        )
+        if exclude_id is not None:
+            overlapping = overlapping.filter(LSTShift.id != exclude_id)
+        clash = overlapping.first()
+        if clash:
+            return (f"Shift overlaps shift {clash.id} of {user.username} "
+                    f"({clash.start_time.isoformat()} - {clash.end_time.isoformat()})."), 409
+        return None, 200
+
+    @staticmethod
+    def _serialize_breaks(breaks: List[Dict[str, datetime]]) -> List[Dict[str, str]]:
+        return [{'start': b['start'].isoformat(), 'end': b['end'].isoformat()}
+                for b in sorted(breaks, key=lambda b: b['start'])]
+
+    @classmethod
+    def create_shift(cls, data: Dict[str, Any]) -> Tuple[Optional[LSTShift], str, int]:
+        """Create a shift from LSTShiftCreateSchema-loaded data and refresh the shift index."""
+        message, status = cls._check_roster(data['user_id'], data['start_time'], data['end_time'])
+        if message:
+            return None, message, status
+        try:
+            shift = LSTShift(user_id=data['user_id'], start_time=data['start_time'], end_time=data['end_time'],
+                             breaks=cls._serialize_breaks(data.get('breaks') or []), notes=data.get('notes'))
+            db.session.add(shift)
+            db.session.commit()
+            lst_shift_index.load_from_db()
+            invalidation_bus.publish('lst_shift')
+            return shift, "Shift created successfully", 201
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Database error while creating shift: {str(e)}", 500
+
+    @classmethod
+    def update_shift(cls, shift_id: int, update_data: Dict[str, Any]) -> Tuple[Optional[LSTShift], str, int]:
+        """Apply LSTShiftUpdateSchema-loaded changes; the merged shift is validated as a whole."""
+        shift = db.session.get(LSTShift, shift_id)
+        if not shift:
+            return None, f"Shift with ID {shift_id} not found", 404
+        merged = {
+            'user_id': update_data.get('user_id', shift.user_id),
+            'start_time': update_data.get('start_time', shift.start_time),
+            'end_time': update_data.get('end_time', shift.end_time),
+            'breaks': update_data['breaks'] if 'breaks' in update_data else [
+                {'start': datetime.fromisoformat(b['start']), 'end': datetime.fromisoformat(b['end'])}
+                for b in shift.breaks or []
+            ],
+        }
+        try:
+            LSTShiftCreateSchema().validate_times(merged)
+        except ValidationError as e:
+            return None, "; ".join(m for messages in e.normalized_messages().values() for m in messages), 400
+        message, status = cls._check_roster(merged['user_id'], merged['start_time'], merged['end_time'],
+                                            exclude_id=shift_id)
+        if message:
+            return None, message, status
+        try:
+            shift.user_id = merged['user_id']
+            shift.start_time = merged['start_time']
+            shift.end_time = merged['end_time']
+            shift.breaks = cls._serialize_breaks(merged['breaks'])
+            if 'notes' in update_data:
+                shift.notes = update_data['notes']
+            db.session.commit()
+            lst_shift_index.load_from_db()
+            invalidation_bus.publish('lst_shift')
+            return shift, "Shift updated successfully", 200
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Database error while updating shift: {str(e)}", 500
+
+    @staticmethod
+    def delete_shift(shift_id: int) -> Tuple[bool, str, int]:
+        try:
+            shift = db.session.get(LSTShift, shift_id)
+            if not shift:
+                return False, f"Shift with ID {shift_id} not found", 404
+            db.session.delete(shift)
+            db.session.commit()
+            lst_shift_index.load_from_db()
+            invalidation_bus.publish('lst_shift')
+            return True, "Shift deleted successfully", 200
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Database error while deleting shift: {str(e)}", 500
+
+    @staticmethod
+    def get_on_shift(at: Optional[datetime] = None) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """Active LSTs working at `at` (UTC, default now), answered from the shift index."""
+        at = at or datetime.utcnow()
+        lst_shift_index.ensure_loaded()
+        user_ids = lst_shift_index.on_shift(at)
+        users = User.query.filter(User.id.in_(user_ids), User.is_active == True) \
+            .order_by(User.username.asc()).all() if user_ids else []
+        return {
+            'at': at.isoformat(),
+            'roster_in_use': lst_shift_index.has_roster,
+            'users': [{'id': u.id, 'username': u.username, 'name': u.name} for u in users],
+        }, "On-shift LSTs retrieved successfully", 200
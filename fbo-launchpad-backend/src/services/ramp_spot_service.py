@@ -0,0 +1,218 @@
+import csv
+import json
+import math
+import os
+from typing import Tuple, List, Optional, Dict, Any
+
+from ..models.fuel_order import FuelOrder
+from ..models.ramp_spot import RampSpot
+from ..extensions import db
+from ..utils.invalidation import invalidation_bus
+from ..utils.spatial_index import ramp_index
+
+# Upper bound on trucks returned by one nearest-truck lookup
+MAX_NEAREST_TRUCKS = 20
+
+
+class RampSpotService:
+    """Service class for ramp spots and nearest-resource lookups."""
+
+    @staticmethod
+    def get_spots(filters: Optional[Dict[str, Any]] = None) -> Tuple[List[RampSpot], str, int]:
+        query = RampSpot.query
+        filters = filters or {}
+        if filters.get('zone'):
+            query = query.filter(RampSpot.zone == filters['zone'])
+        if filters.get('is_active') is not None:
+            query = query.filter(RampSpot.is_active == (str(filters['is_active']).lower() == 'true'))
+        try:
+            return query.order_by(RampSpot.code.asc()).all(), "Ramp spots retrieved successfully", 200
+        except Exception as e:
+            return [], f"Database error while retrieving ramp spots: {str(e)}", 500
+
+    @staticmethod
+    def get_spot_by_id(spot_id: int) -> Tuple[Optional[RampSpot], str, int]:
+        try:
+            spot = RampSpot.query.get(spot_id)
+            if not spot:
+                return None, f"Ramp spot with ID {spot_id} not found", 404
+            return spot, "Ramp spot retrieved successfully", 200
+        except Exception as e:
+            return None, f"Database error while retrieving ramp spot: {str(e)}", 500
+
+    @staticmethod
+    def create_spot(data: Dict[str, Any]) -> Tuple[Optional[RampSpot], str, int]:
+        if RampSpot.query.filter(db.func.upper(RampSpot.code) == data['code'].strip().upper()).first():
+            return None, f"Ramp spot {data['code']} already exists", 409
+        try:
+            spot = RampSpot(code=data['code'].strip(), zone=data.get('zone'), x=data['x'], y=data['y'],
+                            is_active=data.get('is_active', True))
+            db.session.add(spot)
+            db.session.commit()
+            ramp_index.upsert_spot(spot)
+            invalidation_bus.publish('ramp_spot', spot.id)
+            return spot, "Ramp spot created successfully", 201
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Database error while creating ramp spot: {str(e)}", 500
+
+    @staticmethod
+    def update_spot(spot_id: int, update_data: Dict[str, Any]) -> Tuple[Optional[RampSpot], str, int]:
+        try:
+            spot = RampSpot.query.get(spot_id)
+            if not spot:
+                return None, f"Ramp spot with ID {spot_id} not found", 404
+            if 'code' in update_data:
+                code = update_data['code'].strip()
+                existing = RampSpot.query.filter(db.func.upper(RampSpot.code) == code.upper()).first()
+                if existing and existing.id != spot_id:
+                    return None, f"Ramp spot {code} already exists", 409
+                spot.code = code
+            for field in ('zone', 'x', 'y', 'is_active'):
+                if field in update_data:
+                    setattr(spot, field, update_data[field])
+            db.session.commit()
+            ramp_index.upsert_spot(spot)
+            invalidation_bus.publish('ramp_spot', spot.id)
+            return spot, "Ramp spot updated successfully", 200
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Database error while updating ramp spot: {str(e)}", 500
+
+    @staticmethod
+    def delete_spot(spot_id: int) -> Tuple[bool, str, int]:
+        try:
+            spot = RampSpot.query.get(spot_id)
+            if not spot:
+                return False, f"Ramp spot with ID {spot_id} not found", 404
+            if db.session.query(FuelOrder.query.filter(FuelOrder.ramp_spot_id == spot_id).exists()).scalar():
+                return False, "Ramp spot is referenced by fuel orders; deactivate it instead", 409
+            db.session.delete(spot)
+            db.session.commit()
+            ramp_index.remove_spot(spot_id)
+            invalidation_bus.publish('ramp_spot', spot_id)
+            return True, "Ramp spot deleted successfully", 200
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Database error while deleting ramp spot: {str(e)}", 500
+
+    @staticmethod
+    def read_spot_map(path: str) -> List[Dict[str, Any]]:
+        """
+        Read a spot map file: CSV with a header row of code,x,y[,zone], or JSON
+        (a list of {"code", "x", "y", "zone"} objects).
+
+        Raises:
+            ValueError: If the file format is not recognised.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                return [dict(row) for row in csv.DictReader(f)]
+        if extension == '.json':
+            with open(path, encoding='utf-8') as f:
+                rows = json.load(f)
+            if not isinstance(rows, list):
+                raise ValueError("A JSON spot map must be a list of spot objects.")
+            return rows
+        raise ValueError(f"Unsupported spot map format '{extension}'; use .csv or .json.")
+
+    @staticmethod
+    def _validate_row(row: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        if not isinstance(row, dict):
+            return None, "must be an object"
+        code = str(row.get('code') or '').strip()
+        if not code or len(code) > 20:
+            return None, "code must be 1-20 characters"
+        try:
+            x, y = float(row.get('x')), float(row.get('y'))
+        except (TypeError, ValueError):
+            return None, "x and y must be numbers"
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return None, "x and y must be finite"
+        zone = str(row.get('zone') or '').strip() or None
+        if zone is not None and len(zone) > 50:
+            return None, "zone must be at most 50 characters"
+        return {'code': code, 'x': x, 'y': y, 'zone': zone}, None
+
+    @classmethod
+    def import_spots(
+        cls,
+        rows: List[Dict[str, Any]],
+        deactivate_missing: bool = False,
+        dry_run: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """
+        Create or update spots by code (case-insensitive) in one transaction.
+
+        Spots in the map are (re)activated. With `deactivate_missing`, active
+        spots not in the map are deactivated; spots are never deleted, since
+        fuel orders reference them.
+
+        Returns:
+            Tuple[Optional[Dict], str, int]: {'created', 'updated', 'unchanged',
+            'deactivated'} counts, message, status code. Any invalid row fails
+            the whole import with 400.
+        """
+        spots = {}
+        errors = []
+        for number, row in enumerate(rows, start=1):
+            spot, error = cls._validate_row(row)
+            if error:
+                errors.append(f"row {number}: {error}")
+            elif spot['code'].upper() in spots:
+                errors.append(f"row {number}: duplicate code {spot['code']}")
+            else:
+                spots[spot['code'].upper()] = spot
+        if errors:
+            return None, "Invalid spot map: " + "; ".join(errors[:10]), 400
+
+        summary = {'created': 0, 'updated': 0, 'unchanged': 0, 'deactivated': 0}
+        try:
+            existing = {spot.code.upper(): spot for spot in RampSpot.query.all()}
+            for key, data in spots.items():
+                spot = existing.get(key)
+                if spot is None:
+                    db.session.add(RampSpot(is_active=True, **data))
+                    summary['created'] += 1
+                elif (spot.code, spot.x, spot.y, spot.zone, spot.is_active) != \
+                        (data['code'], data['x'], data['y'], data['zone'], True):
+                    spot.code, spot.x, spot.y, spot.zone, spot.is_active = \
+                        data['code'], data['x'], data['y'], data['zone'], True
+                    summary['updated'] += 1
+                else:
+                    summary['unchanged'] += 1
+            if deactivate_missing:
+                for key, spot in existing.items():
+                    if key not in spots and spot.is_active:
+                        spot.is_active = False
+                        summary['deactivated'] += 1
+            if dry_run:
+                db.session.rollback()
+                return summary, "Spot map validated; nothing was written.", 200
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Database error while importing ramp spots: {str(e)}", 500
+
+        ramp_index.load_from_db()
+        invalidation_bus.publish('ramp_spot')
+        return summary, (f"Imported {len(spots)} ramp spots: {summary['created']} created, "
+                         f"{summary['updated']} updated, {summary['deactivated']} deactivated."), 200
+
+    @staticmethod
+    def nearest_trucks(
+        spot_id: int,
+        fuel_type: Optional[str] = None,
+        min_capacity: Optional[float] = None,
+        limit: int = 5
+    ) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """Active trucks closest to a spot by last reported position, optionally
+        limited to a fuel type and a minimum capacity."""
+        ramp_index.ensure_loaded()
+        spot = ramp_index.get_spot(spot_id)
+        if spot is None:
+            return None, f"Active ramp spot with ID {spot_id} not found", 404
+        limit = max(1, min(limit, MAX_NEAREST_TRUCKS))
+        trucks = ramp_index.nearest_trucks(spot.x, spot.y, fuel_type, min_capacity, limit)
+        return {'ramp_spot': spot._asdict(), 'trucks': trucks}, "Nearest trucks retrieved successfully", 200
@@ -1,7 +1,9 @@
-from typing import Tuple, Any, List, Optional
+from typing import Tuple, Any, List, Optional, Dict, Iterable
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from src.app import db
-from src.models import Role, Permission
+from src.models import Role, Permission, role_permissions
+from src.utils.invalidation import invalidation_bus
 
 class RoleService:
     """Service class for managing roles and their permissions."""
@@ -34,6 +36,7 @@ class RoleService:
             )
             db.session.add(new_role)
             db.session.commit()
+            invalidation_bus.publish('role', new_role.id)
             return new_role, "Role created successfully", 201
         except IntegrityError:
             db.session.rollback()
@@ -75,6 +78,7 @@ class RoleService:
                 role.description = data['description']
 
             db.session.commit()
+            invalidation_bus.publish('role', role_id)
             return role, "Role updated successfully", 200
         except IntegrityError:
             db.session.rollback()
@@ -99,6 +103,7 @@ class RoleService:
             role.permissions = []
             db.session.delete(role)
             db.session.commit()
+            invalidation_bus.publish('role', role_id)
             return True, "Role deleted successfully", 200
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -135,6 +140,7 @@ class RoleService:
 
             role.permissions.append(permission)
             db.session.commit()
+            invalidation_bus.publish('permissions')
             return role, "Permission assigned successfully", 200
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -158,7 +164,88 @@ class RoleService:
 
             role.permissions.remove(permission)
             db.session.commit()
+            invalidation_bus.publish('permissions')
             return role, "Permission removed successfully", 200
         except SQLAlchemyError as e:
             db.session.rollback()
-            return None, f"Database error: {str(e)}", 500 
\ No newline at end of file
+            return None, f"Database error: {str(e)}", 500
+
+    @classmethod
+    def set_role_permissions(cls, role_id: int, permission_ids: Iterable[int]) -> Tuple[Optional[Dict[str, List[int]]], str, int]:
+        """Make the role's permissions exactly `permission_ids`.
+
+        The difference to the current set is applied with one bulk insert and one
+        bulk delete on role_permissions. The role row is locked so concurrent
+        updates of the same role apply one after the other.
+        """
+        desired = set(permission_ids)
+        try:
+            role_exists = db.session.execute(
+                select(Role.id).where(Role.id == role_id).with_for_update()
+            ).scalar()
+            if role_exists is None:
+                db.session.rollback()
+                return None, f"Role with ID {role_id} not found", 404
+
+            if desired:
+                found = set(db.session.execute(
+                    select(Permission.id).where(Permission.id.in_(desired))
+                ).scalars())
+                if found != desired:
+                    # Release the role row lock
+                    db.session.rollback()
+                    return None, f"Invalid permission IDs provided: {sorted(desired - found)}", 400
+
+            current = set(db.session.execute(
+                select(role_permissions.c.permission_id).where(role_permissions.c.role_id == role_id)
+            ).scalars())
+            added = sorted(desired - current)
+            removed = sorted(current - desired)
+            if added:
+                db.session.execute(insert(role_permissions),
+                                   [{'role_id': role_id, 'permission_id': pid} for pid in added])
+            if removed:
+                db.session.execute(delete(role_permissions).where(
+                    role_permissions.c.role_id == role_id,
+                    role_permissions.c.permission_id.in_(removed)
+                ))
+            db.session.commit()
+            if added or removed:
+                invalidation_bus.publish('permissions')
+            result = {'permission_ids': sorted(desired), 'added': added, 'removed': removed}
+            return result, "Role permissions updated successfully", 200
+        except IntegrityError:
+            db.session.rollback()
+            return None, "Role permissions were changed concurrently, please retry", 409
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return None, f"Database error: {str(e)}", 500
+
+    @classmethod
+    def get_permission_matrix(cls) -> Tuple[Optional[Dict[str, List[Dict[str, Any]]]], str, int]:
+        """All roles and permissions, and which role grants which permission.
+
+        Two queries: roles left-joined to role_permissions, and the permissions.
+        """
+        try:
+            rows = db.session.execute(
+                select(Role.id, Role.name, role_permissions.c.permission_id)
+                .select_from(Role)
+                .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+                .order_by(Role.name.asc(), role_permissions.c.permission_id.asc())
+            ).all()
+            roles: Dict[int, Dict[str, Any]] = {}
+            for role_id, role_name, permission_id in rows:
+                role = roles.setdefault(role_id, {'id': role_id, 'name': role_name, 'permission_ids': []})
+                if permission_id is not None:
+                    role['permission_ids'].append(permission_id)
+            permissions = db.session.execute(
+                select(Permission.id, Permission.name, Permission.description).order_by(Permission.name.asc())
+            ).all()
+            return {
+                'roles': list(roles.values()),
+                'permissions': [{'id': pid, 'name': name, 'description': description}
+                                for pid, name, description in permissions],
+            }, "Permission matrix retrieved successfully", 200
+        except SQLAlchemyError as e:
+            return None, f"Database error: {str(e)}", 500
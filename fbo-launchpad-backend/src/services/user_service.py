@@ -1,62 +1,106 @@
 from typing import Tuple, List, Optional, Dict, Any, Set
 from flask import g, has_request_context # Import g and has_request_context
+from sqlalchemy import func, or_, tuple_
+from sqlalchemy.orm import selectinload
 
 from ..models.user import User
 from ..models.role import Role
 from ..models.permission import Permission
 from ..extensions import db
+from ..utils.fieldsets import load_only_fields
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.invalidation import invalidation_bus
+
+# Page size of the user list when no limit is given, and the largest allowed
+DEFAULT_USER_PAGE_SIZE = 50
+MAX_USER_PAGE_SIZE = 200
+
+# Columns backing user list fields that are not named after a column
+USER_FIELD_COLUMNS = {
+    'name': 'username',
+    'roles': None,
+}
 
 
 class UserService:
     """Service class for managing user-related operations."""
 
     @classmethod
-    def get_users(cls, filters: Optional[Dict[str, Any]] = None) -> Tuple[Optional[List[User]], str, int]:
-        """Retrieve users based on specified filters.
+    def get_users(cls, filters: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """Retrieve one page of users ordered by username.
+
+        Roles are loaded for the whole page in one extra query (selectinload on
+        User.role_list) instead of one query per user.
 
         Args:
             filters (Optional[Dict[str, Any]]): Optional dictionary of filter parameters.
                 Supported filters:
                 - role_ids (List[int]): Filter by role IDs
                 - is_active (bool): Filter by user active status
+                - q (str): Case-insensitive prefix of the username or email
+                - limit (int): Page size, 1 to MAX_USER_PAGE_SIZE (default DEFAULT_USER_PAGE_SIZE)
+                - cursor (str): `next_cursor` of the previous page
+            fields (Optional[List[str]]): Validated response fields; when given,
+                only the columns backing them are loaded.
 
         Returns:
-            Tuple[Optional[List[User]], str, int]: A tuple containing:
-                - List of User objects if successful, None if error
+            Tuple[Optional[Dict[str, Any]], str, int]: A tuple containing:
+                - {'users': [User, ...], 'next_cursor': str or None} if successful, None if error
                 - Message describing the result
                 - HTTP status code
         """
+        filters = filters or {}
         try:
-            # Initialize base query with eager loading of roles
-            query = User.query
-
-            if filters:
-                # Filter by role IDs
-                role_ids = filters.get('role_ids')
-                if role_ids:
-                    if not isinstance(role_ids, list):
-                        return None, "Invalid role_ids format, must be a list", 400
-                    # Join with roles and filter where role.id is in the provided list
-                    query = query.join(User.roles).filter(Role.id.in_(role_ids))
-
-                # Filter by active status
-                is_active_filter = filters.get('is_active')
-                if is_active_filter is not None:
-                    is_active_bool = str(is_active_filter).lower() == 'true'
-                    query = query.filter(User.is_active == is_active_bool)
-
-            # Default sort by username ascending
-            users = query.order_by(User.username.asc()).all()
-            # --- Add Debugging ---
-            from flask import current_app
-            current_app.logger.info(f"DEBUG: UserService.get_users found {len(users)} users: {users}")
-            # --- End Debugging ---
-            return users, "Users retrieved successfully", 200
+            limit = int(filters.get('limit') or DEFAULT_USER_PAGE_SIZE)
+        except (TypeError, ValueError):
+            return None, "Invalid limit, must be an integer", 400
+        limit = max(1, min(limit, MAX_USER_PAGE_SIZE))
+        try:
+            after = decode_cursor(filters.get('cursor'), 2)
+        except ValueError as e:
+            return None, str(e), 400
 
+        try:
+            query = User.query
+            if fields:
+                # username is the page cursor, so it is loaded even when not requested
+                query = query.options(load_only_fields(User, list(fields) + ['name'], USER_FIELD_COLUMNS))
+            if not fields or 'roles' in fields:
+                query = query.options(selectinload(User.role_list))
+
+            # Filter by role IDs
+            role_ids = filters.get('role_ids')
+            if role_ids:
+                if not isinstance(role_ids, list):
+                    return None, "Invalid role_ids format, must be a list", 400
+                query = query.filter(User.roles.any(Role.id.in_(role_ids)))
+
+            # Filter by active status
+            is_active_filter = filters.get('is_active')
+            if is_active_filter is not None:
+                is_active_bool = str(is_active_filter).lower() == 'true'
+                query = query.filter(User.is_active == is_active_bool)
+
+            # Prefix search, served by the lower(username)/lower(email) indexes
+            prefix = (filters.get('q') or '').strip().lower()
+            if prefix:
+                query = query.filter(or_(
+                    func.lower(User.username).startswith(prefix, autoescape=True),
+                    func.lower(User.email).startswith(prefix, autoescape=True)
+                ))
+
+            if after is not None:
+                query = query.filter(tuple_(User.username, User.id) > tuple_(*after))
+            users = query.order_by(User.username.asc(), User.id.asc()).limit(limit + 1).all()
         except Exception as e:
-            # Log the error here if you have a logger configured
             return None, f"Database error while retrieving users: {str(e)}", 500
 
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor([users[-1].username, users[-1].id])
+        return {'users': users, 'next_cursor': next_cursor}, "Users retrieved successfully", 200
+
     @classmethod
     def create_user(cls, data: Dict[str, Any]) -> Tuple[Optional[User], str, int]:
         """Create a new user.
@@ -204,6 +248,8 @@ class UserService:
                 user_to_update.set_password(data['password'])
 
             db.session.commit()
+            if 'role_ids' in data:
+                invalidation_bus.publish('permissions', user_to_update.id)
             return user_to_update, "User updated successfully", 200
 
         except Exception as e:
@@ -0,0 +1,134 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+Responses whose mimetype is in COMPRESS_MIMETYPES are compressed with the
+client's preferred encoding among COMPRESS_ALGORITHMS (brotli when the Brotli
+package is installed, then gzip):
+
+* a complete body is compressed only when it is at least COMPRESS_MIN_SIZE
+  bytes; below that the header overhead and CPU time outweigh the savings;
+* a streamed body (a generator response) is compressed chunk by chunk as it is
+  sent, so it is never held in memory as a whole;
+* responses that already have a Content-Encoding, HEAD requests, 204/304 and
+  ``Cache-Control: no-transform`` responses are left alone.
+
+Compressed responses get ``Vary: Accept-Encoding`` and their ETag is made weak,
+since the bytes differ per encoding; ETag checks therefore compare with
+``request.if_none_match.contains_weak``, the comparison RFC 9110 prescribes
+for If-None-Match.
+
+The levels trade CPU for bytes: scripts/compression_benchmark.py measures both
+on fuel order list pages.
+"""
+import gzip
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Responses with these codes have no body
+_NO_BODY = (204, 304)
+
+
+def available_algorithms():
+    """The encodings this process can produce, in no particular order."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _gzip_stream(chunks: Iterable[bytes], level: int) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _brotli_stream(chunks: Iterable[bytes], quality: int) -> Iterator[bytes]:
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class Compression:
+    """after_request hook compressing eligible responses."""
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.mimetypes = frozenset()
+        self.algorithms = ()
+        self.gzip_level = 6
+        self.brotli_quality = 4
+
+    def init_app(self, app) -> None:
+        self.enabled = app.config.get('COMPRESS_ENABLED', True)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+        self.mimetypes = frozenset(app.config.get('COMPRESS_MIMETYPES', ()))
+        self.algorithms = tuple(a for a in app.config.get('COMPRESS_ALGORITHMS', ('br', 'gzip'))
+                                if a in available_algorithms())
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+        if self.enabled and self.algorithms:
+            app.after_request(self._after_request)
+
+    def negotiate(self, accept_encodings) -> Optional[str]:
+        """The encoding to use: highest client quality, our order breaking ties."""
+        best, best_quality = None, 0
+        for algorithm in self.algorithms:
+            quality = accept_encodings[algorithm]
+            if quality > best_quality:
+                best, best_quality = algorithm, quality
+        return best
+
+    def compress(self, data: bytes, algorithm: str) -> bytes:
+        if algorithm == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_stream(self, chunks: Iterable[bytes], algorithm: str) -> Iterator[bytes]:
+        if algorithm == 'br':
+            return _brotli_stream(chunks, self.brotli_quality)
+        return _gzip_stream(chunks, self.gzip_level)
+
+    def _after_request(self, response):
+        if (response.mimetype not in self.mimetypes
+                or response.status_code in _NO_BODY or response.status_code < 200
+                or request.method == 'HEAD'
+                or 'Content-Encoding' in response.headers
+                or response.direct_passthrough
+                or response.cache_control.no_transform):
+            return response
+        streamed = response.is_streamed
+        if not streamed and response.calculate_content_length() < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        algorithm = self.negotiate(request.accept_encodings)
+        if algorithm is None:
+            return response
+
+        if streamed:
+            body = response.response
+            response.response = self.compress_stream(response.iter_encoded(), algorithm)
+            if hasattr(body, 'close'):
+                # e.g. stream_with_context generators, which end the request context on close
+                response.call_on_close(body.close)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(self.compress(response.get_data(), algorithm))
+        response.headers['Content-Encoding'] = algorithm
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+compression = Compression()
@@ -0,0 +1,204 @@
+"""
+Database connection pool settings and telemetry.
+
+`engine_options` turns the DB_* settings of the config classes into
+SQLALCHEMY_ENGINE_OPTIONS for the configured database:
+
+* Directly against PostgreSQL, each worker keeps a QueuePool of DB_POOL_SIZE
+  connections plus up to DB_MAX_OVERFLOW extra ones, so the database sees up
+  to workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections per host. The
+  statement timeout is sent as a connection startup option.
+* Behind PgBouncer in transaction pooling mode (DB_PGBOUNCER), PgBouncer owns
+  the pool, so connections are not pooled here (NullPool) and nothing relies
+  on session state. PgBouncer rejects startup options, so set the statement
+  timeout on the database role instead
+  (``ALTER ROLE ... SET statement_timeout = ...``).
+* SQLite keeps SQLAlchemy's defaults.
+
+`replica_bind` adds short connect and statement timeouts for the read
+replica, so an unreachable replica fails fast and reads fall back to the
+primary (see src/utils/db_routing.py).
+
+The pool classes time every checkout, including waiting for a free
+connection and opening a new one. Together with the pool events this is kept
+in `pool_stats` and served by ``GET /api/admin/db/pool``.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+from .metrics import DB_POOL_TIMEOUTS, DB_POOL_WAIT
+
+# Checkout waits whose duration is kept for the percentiles
+WAIT_SAMPLES = 1000
+
+
+class PoolStats:
+    """Checkout counters and wait times of this worker's connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self.slow_wait_seconds = 0.05
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._waits: deque = deque(maxlen=WAIT_SAMPLES)
+            self.checkouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.slow_waits = 0
+            self.peak_checked_out = 0
+            self.max_wait = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        DB_POOL_WAIT.observe(seconds)
+        with self._lock:
+            self._waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+            if seconds >= self.slow_wait_seconds:
+                self.slow_waits += 1
+
+    def record_timeout(self) -> None:
+        DB_POOL_TIMEOUTS.inc()
+        with self._lock:
+            self.timeouts += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        pool = self._engine.pool if self._engine is not None else None
+        checked_out = pool.checkedout() if isinstance(pool, QueuePool) else 0
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def init_app(self, app) -> None:
+        """Listen to the pool events of the app's engine."""
+        from ..extensions import db
+        with app.app_context():
+            engine = db.engine
+        self.slow_wait_seconds = app.config.get('DB_POOL_SLOW_WAIT_MS', 50) / 1000.0
+        self.attach(engine)
+
+    def attach(self, engine) -> None:
+        if engine is self._engine:
+            return
+        self._engine = engine
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def snapshot(self, engine, workers: Optional[int] = None) -> Dict[str, Any]:
+        pool = engine.pool
+        with self._lock:
+            waits = sorted(self._waits)
+            stats: Dict[str, Any] = {
+                'pool_class': type(pool).__name__,
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'slow_waits': self.slow_waits,
+                'slow_wait_threshold_ms': round(self.slow_wait_seconds * 1000, 3),
+                'peak_checked_out': self.peak_checked_out,
+                'wait_ms': {
+                    'samples': len(waits),
+                    'p50': round(waits[len(waits) // 2] * 1000, 3) if waits else None,
+                    'p99': round(waits[min(len(waits) - 1, int(0.99 * len(waits)))] * 1000, 3) if waits else None,
+                    'max': round(self.max_wait * 1000, 3) if waits else None,
+                },
+            }
+        if isinstance(pool, QueuePool):
+            per_worker = pool.size() + max(pool._max_overflow, 0)
+            stats.update({
+                'size': pool.size(),
+                'max_overflow': pool._max_overflow,
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                # Negative while the pool has not opened all of its base connections
+                'overflow': pool.overflow(),
+            })
+            workers = workers or int(os.getenv('WEB_CONCURRENCY', '1'))
+            stats['capacity'] = {
+                'workers': workers,
+                'connections_per_worker': per_worker,
+                'max_connections': workers * per_worker,
+            }
+        return stats
+
+
+pool_stats = PoolStats()
+
+
+class _TimedCheckout:
+    """Times how long getting a connection from the pool takes."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def engine_options(config) -> Dict[str, Any]:
+    """SQLALCHEMY_ENGINE_OPTIONS for the DB_* settings and database URL in `config`."""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() != 'postgresql':
+        return {}
+    if config.get('DB_PGBOUNCER'):
+        return {
+            'poolclass': InstrumentedNullPool,
+            'pool_pre_ping': False,
+        }
+    options: Dict[str, Any] = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        # Reuse the most recent connections so surplus ones idle out and get recycled
+        'pool_use_lifo': True,
+    }
+    statement_timeout = config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    if statement_timeout:
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout)}'}
+    return options
+
+
+def replica_bind(config, url: str) -> Dict[str, Any]:
+    """SQLALCHEMY_BINDS entry for the read replica at `url`; on top of SQLALCHEMY_ENGINE_OPTIONS."""
+    if make_url(url).get_backend_name() != 'postgresql':
+        return {'url': url}
+    connect_args: Dict[str, Any] = {'connect_timeout': config.get('REPLICA_CONNECT_TIMEOUT_SECONDS', 2)}
+    statement_timeout = config.get('REPLICA_STATEMENT_TIMEOUT_MS', 0)
+    if statement_timeout:
+        connect_args['options'] = f'-c statement_timeout={int(statement_timeout)}'
+    return {'url': url, 'connect_args': connect_args}
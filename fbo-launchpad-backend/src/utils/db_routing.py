@@ -0,0 +1,233 @@
+"""
+Read/write splitting between the primary database and a read replica.
+
+The replica is the ``replica`` entry of SQLALCHEMY_BINDS (set from
+REPLICA_DATABASE_URL). Without it everything uses the primary.
+
+`RoutingSession.get_bind` sends a query to the replica when all of these hold:
+
+* it is a read: not a flush, not INSERT/UPDATE/DELETE or raw SQL, not
+  ``SELECT ... FOR UPDATE``, and the session has not written yet (later reads
+  in the same request must see those writes);
+* it runs in a GET/HEAD request, or inside ``use_replica()`` / a
+  ``@read_only`` service method, and not inside ``use_primary()``;
+* the requesting user has not made a write in the last
+  REPLICA_READ_YOUR_WRITES_SECONDS. Writes are announced on the invalidation
+  bus, so this holds across workers;
+* the replica answered its last lag probe (at most every
+  REPLICA_LAG_CHECK_SECONDS) with a lag of at most REPLICA_MAX_LAG_SECONDS.
+
+Otherwise the query goes to the primary. Code that fills a cache reads from the
+primary (``use_primary()``), since a stale cache entry would outlive the lag.
+
+Locally, point REPLICA_DATABASE_URL at a second SQLite file or a second
+Postgres instance; SQLite replicas always report zero lag.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Optional
+
+import sqlalchemy as sa
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+from .invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+
+# Postgres standby lag in seconds; 0 when fully replayed or not a standby
+REPLICA_LAG_SQL = sa.text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+_route: ContextVar[Optional[str]] = ContextVar('db_route', default=None)
+
+
+@contextmanager
+def use_replica():
+    """Run reads in this block on the replica (when it is healthy), even outside GET requests."""
+    token = _route.set('replica')
+    try:
+        yield
+    finally:
+        _route.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Run everything in this block on the primary."""
+    token = _route.set('primary')
+    try:
+        yield
+    finally:
+        _route.reset(token)
+
+
+def read_only(f):
+    """Mark a service function as read-only so its queries may use the replica."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return f(*args, **kwargs)
+    return wrapper
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    if isinstance(clause, (sa.sql.expression.UpdateBase, sa.sql.expression.TextClause)):
+        return True
+    return getattr(clause, '_for_update_arg', None) is not None
+
+
+class ReplicaRouter:
+    """Decides per query whether the replica may serve it; one per worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held while one thread probes the replica; never needed by request routing
+        self._probe_lock = threading.Lock()
+        self._engine = None
+        self.max_lag = 5.0
+        self.check_interval = 1.0
+        self.sticky_seconds = 10.0
+        self._lag: Optional[float] = None
+        self._checked_at = 0.0
+        self._recent_writes: Dict[int, float] = {}
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.lag_fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._engine is not None
+
+    def init_app(self, app) -> None:
+        from ..extensions import db
+        self.max_lag = app.config.get('REPLICA_MAX_LAG_SECONDS', 5.0)
+        self.check_interval = app.config.get('REPLICA_LAG_CHECK_SECONDS', 1.0)
+        self.sticky_seconds = app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10.0)
+        self._checked_at = 0.0
+        with app.app_context():
+            self._engine = db.engines.get(REPLICA_BIND)
+        if self._engine is None:
+            return
+        app.before_request(self._mark_read_only_request)
+        app.after_request(self._note_write_request)
+        logger.info(f"Routing read-only requests to the read replica ({self._engine.url.render_as_string()})")
+
+    @staticmethod
+    def _mark_read_only_request() -> None:
+        g.db_read_only = request.method in ('GET', 'HEAD')
+
+    @staticmethod
+    def _note_write_request(response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            user = g.get('current_user')
+            if user is not None:
+                identity = sa.inspect(user).identity
+                if identity:
+                    invalidation_bus.publish('primary_write', identity[0])
+        return response
+
+    def note_write(self, event) -> None:
+        """Bus handler: the user in `event.key` just wrote to the primary."""
+        if event.key is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[int(event.key)] = now
+            if len(self._recent_writes) > 10000:
+                cutoff = now - self.sticky_seconds
+                self._recent_writes = {k: t for k, t in self._recent_writes.items() if t > cutoff}
+
+    def _wrote_recently(self, user_id: int) -> bool:
+        with self._lock:
+            wrote_at = self._recent_writes.get(user_id)
+        return wrote_at is not None and time.monotonic() - wrote_at < self.sticky_seconds
+
+    def probe_lag(self) -> Optional[float]:
+        """Replication lag in seconds, or None if the replica cannot be reached."""
+        try:
+            with self._engine.connect() as conn:
+                if conn.dialect.name != 'postgresql':
+                    return 0.0
+                return float(conn.execute(REPLICA_LAG_SQL).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Read replica lag probe failed, using the primary: {str(e)}")
+            return None
+
+    def replica_lag(self) -> Optional[float]:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval and self._probe_lock.acquire(blocking=False):
+            # One thread probes; the others keep using the last value meanwhile.
+            # The probe is a round trip to the replica, so it runs outside _lock.
+            try:
+                lag = self.probe_lag()
+                with self._lock:
+                    self._lag = lag
+                    self._checked_at = time.monotonic()
+            finally:
+                self._probe_lock.release()
+        return self._lag
+
+    def engine_for_read(self):
+        """The replica engine if the current read may use it, else None."""
+        if self._engine is None:
+            return None
+        route = _route.get()
+        if route == 'primary':
+            return None
+        if route != 'replica':
+            if not has_request_context() or not g.get('db_read_only'):
+                return None
+        if has_request_context():
+            user = g.get('current_user')
+            identity = sa.inspect(user).identity if user is not None else None
+            if identity and self._wrote_recently(identity[0]):
+                self.primary_reads += 1
+                return None
+        lag = self.replica_lag()
+        if lag is None or lag > self.max_lag:
+            self.lag_fallbacks += 1
+            self.primary_reads += 1
+            return None
+        self.replica_reads += 1
+        return self._engine
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'lag_seconds': self._lag,
+            'max_lag_seconds': self.max_lag,
+            'replica_reads': self.replica_reads,
+            'primary_reads': self.primary_reads,
+            'lag_fallbacks': self.lag_fallbacks,
+        }
+
+
+replica_router = ReplicaRouter()
+invalidation_bus.subscribe('primary_write', replica_router.note_write)
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends eligible reads to the read replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and replica_router.enabled:
+            # Autoflush runs before this, so pending changes show up as _flushing
+            if self._flushing or _is_write(clause):
+                self.info['wrote'] = True
+            elif not self.info.get('wrote'):
+                engine = replica_router.engine_for_read()
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
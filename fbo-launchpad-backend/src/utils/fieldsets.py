@@ -0,0 +1,77 @@
+"""
+Sparse fieldset helpers for list endpoints (``?fields=id,status,...``).
+
+A route declares the response fields it can return as a mapping of field
+name to serializer. The requested subset is validated against that
+whitelist and pushed down into the query with ``load_only`` so columns the
+client did not ask for are never read from the database or serialized.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+# Maps a response field to the model column(s) backing it. ``None`` means the
+# field is not a plain column (e.g. a relationship) and needs no column load.
+ColumnMap = Dict[str, Union[str, Tuple[str, ...], None]]
+
+
+def parse_fields(raw: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse and validate a comma separated ``fields`` query parameter.
+
+    Args:
+        raw (Optional[str]): The raw query string value.
+        allowed (Iterable[str]): The field names the endpoint can return.
+
+    Returns:
+        Optional[List[str]]: The requested fields in request order with
+        duplicates removed, or None if no fieldset was requested.
+
+    Raises:
+        ValueError: If any requested field is not in the whitelist.
+    """
+    if raw is None or not raw.strip():
+        return None
+
+    allowed = set(allowed)
+    requested = []
+    for name in raw.split(','):
+        name = name.strip()
+        if name and name not in requested:
+            requested.append(name)
+
+    invalid = [name for name in requested if name not in allowed]
+    if invalid:
+        raise ValueError(
+            f"Invalid field(s) requested: {', '.join(invalid)}. "
+            f"Allowed fields: {', '.join(sorted(allowed))}"
+        )
+    if not requested:
+        return None
+    return requested
+
+
+def load_only_fields(model, fields: Sequence[str], column_map: Optional[ColumnMap] = None):
+    """
+    Build a ``load_only`` loader option for the columns backing ``fields``.
+
+    The primary key is always loaded so identity mapping keeps working.
+    """
+    column_map = column_map or {}
+    names = [column.key for column in inspect(model).primary_key]
+    for field in fields:
+        columns = column_map.get(field, field)
+        if columns is None:
+            continue
+        if isinstance(columns, str):
+            columns = (columns,)
+        for column in columns:
+            if column not in names:
+                names.append(column)
+    return load_only(*[getattr(model, name) for name in names])
+
+
+def serialize_fields(obj: Any, fields: Sequence[str], serializers: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+    """Serialize only the requested ``fields`` of ``obj`` using the endpoint's serializers."""
+    return {field: serializers[field](obj) for field in fields}
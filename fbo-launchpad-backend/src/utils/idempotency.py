@@ -0,0 +1,286 @@
+"""
+Idempotency-Key support for mutating endpoints.
+
+A client that may retry a request (e.g. after a timeout on ramp Wi-Fi) sends
+the same ``Idempotency-Key`` header with every attempt. The first attempt runs
+the endpoint and its response (status, body, content type) is stored for
+IDEMPOTENCY_KEY_TTL_SECONDS; later attempts get that response replayed with an
+``Idempotent-Replayed: true`` header instead of running the endpoint again.
+
+Storage is the ``idempotency_keys`` table, fronted by a per-process LRU so
+replays do not touch the database. Keys are scoped to the authenticated user.
+
+Concurrent duplicates:
+
+* In the same process, a duplicate waits for the running request (up to
+  IDEMPOTENCY_WAIT_SECONDS) and then gets its response replayed.
+* Across processes, the first request inserts an ``in_progress`` row; a
+  duplicate that finds it gets ``409 Conflict`` with ``Retry-After``.
+
+Reusing a key for a different request (method, path or body) returns 422.
+5xx responses and exceptions are not stored, so the client can retry them.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from flask import current_app, g, jsonify, make_response, request
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models.idempotency_key import IdempotencyKey
+from .metrics import cache_counters
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+CacheKey = Tuple[int, str]
+
+_hits, _misses = cache_counters('idempotency')
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status: int
+    body: bytes
+    content_type: Optional[str]
+    expires_at: datetime
+
+    @classmethod
+    def from_record(cls, record: IdempotencyKey) -> 'StoredResponse':
+        return cls(record.request_hash, record.response_status, record.response_body,
+                   record.response_content_type, record.expires_at)
+
+
+class IdempotencyStore:
+    """Per-process LRU of stored responses plus the set of keys currently executing."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._responses: 'OrderedDict[CacheKey, StoredResponse]' = OrderedDict()
+        self._in_flight: Dict[CacheKey, threading.Event] = {}
+
+    def get(self, cache_key: CacheKey) -> Optional[StoredResponse]:
+        with self._lock:
+            stored = self._responses.get(cache_key)
+            if stored is not None and stored.expires_at <= datetime.utcnow():
+                del self._responses[cache_key]
+                stored = None
+            if stored is None:
+                _misses.inc()
+                return None
+            _hits.inc()
+            self._responses.move_to_end(cache_key)
+            return stored
+
+    def put(self, cache_key: CacheKey, stored: StoredResponse) -> None:
+        with self._lock:
+            self._responses[cache_key] = stored
+            self._responses.move_to_end(cache_key)
+            while len(self._responses) > self.maxsize:
+                self._responses.popitem(last=False)
+
+    def begin(self, cache_key: CacheKey) -> Tuple[threading.Event, bool]:
+        """Register an execution of `cache_key`. Returns (event, True) for the
+        caller that should execute, or the running execution's event and False."""
+        with self._lock:
+            event = self._in_flight.get(cache_key)
+            if event is not None:
+                return event, False
+            event = self._in_flight[cache_key] = threading.Event()
+            return event, True
+
+    def end(self, cache_key: CacheKey) -> None:
+        with self._lock:
+            event = self._in_flight.pop(cache_key, None)
+        if event is not None:
+            event.set()
+
+    def clear(self) -> None:
+        """Drop all cached responses (useful for testing)."""
+        with self._lock:
+            self._responses.clear()
+
+
+# Per-process store used by the idempotent decorator
+idempotency_store = IdempotencyStore()
+
+
+def _request_hash() -> str:
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(b'\n')
+    digest.update(request.full_path.encode())
+    digest.update(b'\n')
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def _key_reused():
+    return jsonify({"error": "Idempotency-Key has already been used for a different request."}), 422
+
+
+def _replay(stored: StoredResponse, request_hash: str):
+    if stored.request_hash != request_hash:
+        return _key_reused()
+    response = current_app.response_class(stored.body, status=stored.status, content_type=stored.content_type)
+    response.headers[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def _in_progress():
+    response = jsonify({"error": "A request with this Idempotency-Key is still being processed. Retry shortly."})
+    response.status_code = 409
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+def _claim(user_id: int, key: str, request_hash: str) -> Tuple[Optional[int], datetime, Optional[IdempotencyKey]]:
+    """
+    Insert an in_progress row for the key, or take over an expired or abandoned one.
+
+    Returns:
+        (row id, expires_at, None) if this request should execute, otherwise
+        (None, expires_at, existing row) -- the existing row may be None if it vanished.
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=current_app.config.get('IDEMPOTENCY_KEY_TTL_SECONDS', 86400))
+    record = IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash,
+                            status=IdempotencyKey.STATUS_IN_PROGRESS, created_at=now, expires_at=expires_at)
+    db.session.add(record)
+    try:
+        db.session.commit()
+        return record.id, expires_at, None
+    except IntegrityError:
+        db.session.rollback()
+
+    existing = IdempotencyKey.query.filter_by(user_id=user_id, key=key).first()
+    if existing is None:
+        return None, expires_at, None
+    lock_timeout = timedelta(seconds=current_app.config.get('IDEMPOTENCY_LOCK_TIMEOUT_SECONDS', 60))
+    abandoned = existing.status == IdempotencyKey.STATUS_IN_PROGRESS and existing.created_at <= now - lock_timeout
+    if existing.expires_at <= now or abandoned:
+        # Conditional on created_at so only one of several concurrent retries wins
+        taken = IdempotencyKey.query.filter(
+            IdempotencyKey.id == existing.id,
+            IdempotencyKey.created_at == existing.created_at
+        ).update({
+            'request_hash': request_hash,
+            'status': IdempotencyKey.STATUS_IN_PROGRESS,
+            'response_status': None,
+            'response_body': None,
+            'response_content_type': None,
+            'created_at': now,
+            'expires_at': expires_at,
+        }, synchronize_session=False)
+        db.session.commit()
+        if taken:
+            return existing.id, expires_at, None
+        db.session.refresh(existing)
+    return None, expires_at, existing
+
+
+def _release(record_id: int) -> None:
+    """Forget a key whose request failed so a retry runs it again."""
+    try:
+        db.session.rollback()
+        IdempotencyKey.query.filter_by(id=record_id).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error releasing idempotency key {record_id}: {str(e)}")
+
+
+def _execute(f, args, kwargs, cache_key: CacheKey, request_hash: str):
+    user_id, key = cache_key
+    record_id, expires_at, existing = _claim(user_id, key, request_hash)
+    if record_id is None:
+        if existing is not None and existing.request_hash != request_hash:
+            return _key_reused()
+        if existing is None or existing.status == IdempotencyKey.STATUS_IN_PROGRESS:
+            return _in_progress()
+        stored = StoredResponse.from_record(existing)
+        idempotency_store.put(cache_key, stored)
+        return _replay(stored, request_hash)
+
+    try:
+        response = make_response(f(*args, **kwargs))
+    except Exception:
+        _release(record_id)
+        raise
+    if response.status_code >= 500 or response.is_streamed:
+        _release(record_id)
+        return response
+
+    body = response.get_data()
+    try:
+        IdempotencyKey.query.filter_by(id=record_id).update({
+            'status': IdempotencyKey.STATUS_COMPLETED,
+            'response_status': response.status_code,
+            'response_body': body,
+            'response_content_type': response.content_type,
+        }, synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        # The request itself succeeded; a retry will get 409 until the key is abandoned
+        db.session.rollback()
+        logger.error(f"Error storing response for idempotency key {key}: {str(e)}")
+        return response
+    idempotency_store.put(cache_key, StoredResponse(request_hash, response.status_code, body,
+                                                    response.content_type, expires_at))
+    return response
+
+
+def idempotent(f):
+    """
+    Make a route replay its first response when called again with the same
+    Idempotency-Key header. Must be applied below @token_required, since keys
+    are scoped to g.current_user. Requests without the header are unaffected.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return f(*args, **kwargs)
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters."}), 400
+
+        cache_key = (g.current_user.id, key)
+        request_hash = _request_hash()
+        idempotency_store.maxsize = current_app.config.get('IDEMPOTENCY_CACHE_SIZE', 1024)
+        deadline = time.monotonic() + current_app.config.get('IDEMPOTENCY_WAIT_SECONDS', 10)
+        while True:
+            stored = idempotency_store.get(cache_key)
+            if stored is not None:
+                return _replay(stored, request_hash)
+            event, owner = idempotency_store.begin(cache_key)
+            if owner:
+                break
+            # Same key already running in this process: wait for it, then replay
+            if not event.wait(max(0.0, deadline - time.monotonic())):
+                return _in_progress()
+
+        try:
+            return _execute(f, args, kwargs, cache_key, request_hash)
+        finally:
+            idempotency_store.end(cache_key)
+    return decorated_function
+
+
+def purge_expired_idempotency_keys() -> int:
+    """Delete expired keys. Returns the number of rows removed."""
+    deleted = IdempotencyKey.query.filter(
+        IdempotencyKey.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
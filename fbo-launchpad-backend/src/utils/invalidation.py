@@ -0,0 +1,402 @@
+"""
+Cross-worker cache invalidation bus.
+
+Each gunicorn worker keeps its own caches (permission sets, the tail number,
+ramp and shift indexes). When one worker handles a write, the service
+publishes an event after committing, e.g. ``invalidation_bus.publish('aircraft')``.
+The event is delivered to this worker's subscribers right away and is sent
+through the configured backend to every other worker, where a listener
+thread delivers it to the same subscribers. Handlers get an
+:class:`InvalidationEvent` and must only evict or flag data (they may run on
+the listener thread, outside any app context); caches reload on next use.
+
+Backends (INVALIDATION_BACKEND):
+
+``local``
+    In-process only. Enough for a single worker, and used by the tests, where
+    several buses can share one :class:`InProcessHub` to act as workers.
+``ipc``
+    Unix datagram sockets in INVALIDATION_IPC_DIR, one per worker. Publishing
+    sends one datagram to every other socket in the directory. Only reaches
+    workers on the same host.
+``postgres``
+    ``NOTIFY`` on INVALIDATION_CHANNEL, received with ``LISTEN`` on a
+    dedicated connection. Reaches every worker on every host. The listener
+    needs a session-level connection, so with PgBouncer in transaction mode
+    point INVALIDATION_DATABASE_URL at Postgres directly.
+
+Delivery is at most once. Events carry a per-sender sequence number, and a
+receiver that sees a gap (e.g. a datagram dropped on a full socket buffer) or
+loses its LISTEN connection flushes all of its caches. Caches keep their own
+TTLs as a last resort for a lost event that is never followed by another.
+
+Each bus counts what it published and received and keeps the delivery lag
+(receive time minus send time) of recent remote events; see ``stats()``.
+"""
+import atexit
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = 'fbo_cache_invalidation'
+DEFAULT_IPC_DIR = '/tmp/fbo-launchpad-invalidation'
+# Entity name delivered to every subscriber when events may have been lost
+ALL_ENTITIES = '*'
+# Remote deliveries whose lag is kept for the percentiles in stats()
+LAG_SAMPLES = 1000
+
+
+class InvalidationEvent(NamedTuple):
+    entity: str
+    key: Optional[str]
+    origin: str
+    seq: int
+    sent_at: float
+    remote: bool = False
+
+    def to_json(self) -> str:
+        return json.dumps({'entity': self.entity, 'key': self.key, 'origin': self.origin,
+                           'seq': self.seq, 'sent_at': self.sent_at})
+
+    @classmethod
+    def from_json(cls, payload) -> 'InvalidationEvent':
+        data = json.loads(payload)
+        return cls(data['entity'], data.get('key'), data['origin'], int(data['seq']), float(data['sent_at']), True)
+
+
+Handler = Callable[[InvalidationEvent], None]
+
+
+class InProcessHub:
+    """Connects the buses of one process; each bus stands in for a worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buses: List['InvalidationBus'] = []
+
+    def attach(self, bus: 'InvalidationBus') -> None:
+        with self._lock:
+            if bus not in self._buses:
+                self._buses.append(bus)
+
+    def detach(self, bus: 'InvalidationBus') -> None:
+        with self._lock:
+            if bus in self._buses:
+                self._buses.remove(bus)
+
+    def broadcast(self, sender: 'InvalidationBus', payload: str) -> None:
+        with self._lock:
+            buses = [bus for bus in self._buses if bus is not sender]
+        for bus in buses:
+            bus.receive(payload)
+
+
+class InProcessBackend:
+    name = 'local'
+
+    def __init__(self, hub: Optional[InProcessHub] = None):
+        self.hub = hub or InProcessHub()
+
+    def start(self, bus: 'InvalidationBus') -> None:
+        self.hub.attach(bus)
+
+    def stop(self, bus: 'InvalidationBus') -> None:
+        self.hub.detach(bus)
+
+    def send(self, bus: 'InvalidationBus', payload: str) -> None:
+        self.hub.broadcast(bus, payload)
+
+
+class UnixSocketBackend:
+    """One unix datagram socket per worker in a shared directory."""
+    name = 'ipc'
+
+    def __init__(self, directory: str = DEFAULT_IPC_DIR):
+        self.directory = directory
+        self._sock: Optional[socket.socket] = None
+        self._path: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, bus: 'InvalidationBus') -> None:
+        if self._sock is not None:
+            # Inherited from the parent process, which still owns the path
+            self._sock.close()
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self._path = os.path.join(self.directory, f'{bus.worker_id}.sock')
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self._path)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._listen, args=(bus, sock), daemon=True,
+                                        name='invalidation-ipc')
+        self._thread.start()
+
+    def stop(self, bus: 'InvalidationBus') -> None:
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.close()
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _listen(bus: 'InvalidationBus', sock: socket.socket) -> None:
+        while True:
+            try:
+                payload = sock.recv(65536)
+            except OSError:
+                return  # Socket closed by stop()
+            bus.receive(payload)
+
+    def send(self, bus: 'InvalidationBus', payload: str) -> None:
+        data = payload.encode()
+        sender = self._sock or socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.sock') or entry.path == self._path:
+                continue
+            try:
+                sender.sendto(data, socket.MSG_DONTWAIT, entry.path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a worker that exited without cleaning up
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                # The receiver's buffer is full; it notices the sequence gap
+                bus.dropped += 1
+            except OSError as e:
+                bus.dropped += 1
+                logger.warning(f"Could not send invalidation to {entry.name}: {str(e)}")
+        if sender is not self._sock:
+            sender.close()
+
+
+class PostgresBackend:
+    """NOTIFY to publish, LISTEN on a dedicated connection to receive."""
+    name = 'postgres'
+    RECONNECT_SECONDS = 5
+
+    def __init__(self, dsn: str, channel: str = DEFAULT_CHANNEL):
+        self.dsn = dsn
+        self.channel = channel
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self):
+        import psycopg2
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def start(self, bus: 'InvalidationBus') -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, args=(bus,), daemon=True,
+                                        name='invalidation-listen')
+        self._thread.start()
+
+    def stop(self, bus: 'InvalidationBus') -> None:
+        self._stopped.set()
+
+    def _listen(self, bus: 'InvalidationBus') -> None:
+        connected_before = False
+        while not self._stopped.is_set():
+            try:
+                conn = self._connect()
+            except Exception as e:
+                logger.warning(f"Invalidation listener cannot connect, retrying: {str(e)}")
+                self._stopped.wait(self.RECONNECT_SECONDS)
+                continue
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                if connected_before:
+                    bus.flush('events sent while the listener was reconnecting were lost')
+                connected_before = True
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            bus.receive(conn.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning(f"Invalidation listener connection lost, reconnecting: {str(e)}")
+            finally:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def send(self, bus: 'InvalidationBus', payload: str) -> None:
+        from sqlalchemy import text
+        from ..extensions import db
+        with db.engine.connect() as conn:
+            conn.execute(text('SELECT pg_notify(:channel, :payload)'), {'channel': self.channel, 'payload': payload})
+            conn.commit()
+
+
+class InvalidationBus:
+    """Publishes cache invalidation events and delivers them to subscribers."""
+
+    def __init__(self, backend=None):
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, List[Handler]] = {}
+        self.backend = backend or InProcessBackend()
+        self.worker_id = ''
+        self._pid: Optional[int] = None
+        self._exit_hook = False
+        self._seq = 0
+        self._last_seq: Dict[str, int] = {}
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+        self.flushes = 0
+        self._lags: deque = deque(maxlen=LAG_SAMPLES)
+        self._max_lag = 0.0
+
+    def subscribe(self, entity: str, handler: Handler) -> None:
+        """Call `handler` for every event about `entity`, local or remote."""
+        with self._lock:
+            self._handlers.setdefault(entity, []).append(handler)
+
+    def _deliver(self, event: InvalidationEvent) -> None:
+        with self._lock:
+            if event.entity == ALL_ENTITIES:
+                handlers = [h for hs in self._handlers.values() for h in hs]
+            else:
+                handlers = list(self._handlers.get(event.entity, ()))
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Invalidation handler for {event.entity} failed: {str(e)}", exc_info=True)
+
+    def publish(self, entity: str, key=None) -> None:
+        """Announce that `entity` (optionally one `key` of it) changed. Call after commit."""
+        self.ensure_started()
+        with self._lock:
+            self._seq += 1
+            event = InvalidationEvent(entity, None if key is None else str(key), self.worker_id, self._seq, time.time())
+            self.published += 1
+        self._deliver(event)
+        try:
+            self.backend.send(self, event.to_json())
+        except Exception as e:
+            self.dropped += 1
+            logger.error(f"Could not publish invalidation of {entity}: {str(e)}")
+
+    def receive(self, payload) -> None:
+        """Entry point for backends: deliver an event from another worker."""
+        try:
+            event = InvalidationEvent.from_json(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed invalidation event: {payload!r}")
+            return
+        if event.origin == self.worker_id:
+            return
+        lag = max(0.0, time.time() - event.sent_at)
+        with self._lock:
+            self.received += 1
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            last = self._last_seq.get(event.origin)
+            self._last_seq[event.origin] = max(event.seq, last or 0)
+        if last is not None and event.seq != last + 1:
+            self.flush(f'events {last + 1}..{event.seq - 1} from {event.origin} were lost')
+        self._deliver(event)
+
+    def flush(self, reason: str) -> None:
+        """Evict everything in this worker, after events may have been lost."""
+        logger.warning(f"Flushing all caches: {reason}")
+        self.flushes += 1
+        self._deliver(InvalidationEvent(ALL_ENTITIES, None, self.worker_id, self._seq, time.time(), True))
+
+    def start(self, backend=None) -> None:
+        """Start receiving in this process. Idempotent per process."""
+        if backend is not None:
+            if self._pid is not None:
+                self.stop()
+            self.backend = backend
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        # A forked worker inherits its parent's bus and caches but not its
+        # listener thread, so it starts over with its own identity
+        inherited = self._pid is not None
+        self._pid = pid
+        self.worker_id = f'{socket.gethostname()}-{pid}-{uuid.uuid4().hex[:8]}'
+        self._seq = 0
+        self._last_seq = {}
+        self.backend.start(self)
+        if not self._exit_hook:
+            atexit.register(self.stop)
+            self._exit_hook = True
+        if inherited:
+            self.flush('nothing published between the fork and now was received')
+
+    def ensure_started(self) -> None:
+        if self._pid != os.getpid():
+            self.start()
+
+    def stop(self) -> None:
+        # Only the process that started the backend owns its socket or connection
+        if self._pid == os.getpid():
+            self.backend.stop(self)
+        self._pid = None
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lags = sorted(self._lags)
+            max_lag = self._max_lag
+
+        def percentile(p: float) -> Optional[float]:
+            if not lags:
+                return None
+            return round(lags[min(len(lags) - 1, int(p * len(lags)))] * 1000, 3)
+
+        return {
+            'backend': self.backend.name,
+            'worker_id': self.worker_id,
+            'published': self.published,
+            'received': self.received,
+            'dropped': self.dropped,
+            'flushes': self.flushes,
+            'lag_ms': {
+                'samples': len(lags),
+                'p50': percentile(0.5),
+                'p99': percentile(0.99),
+                'max': round(max_lag * 1000, 3) if lags else None,
+            },
+        }
+
+    def init_app(self, app) -> None:
+        """Pick the backend from the app config and start receiving."""
+        kind = app.config.get('INVALIDATION_BACKEND', 'local')
+        if kind == 'ipc':
+            backend = UnixSocketBackend(app.config.get('INVALIDATION_IPC_DIR') or DEFAULT_IPC_DIR)
+        elif kind == 'postgres':
+            url = make_url(app.config.get('INVALIDATION_DATABASE_URL') or app.config['SQLALCHEMY_DATABASE_URI'])
+            # libpq does not understand SQLAlchemy's "+driver" suffix
+            dsn = url.set(drivername='postgresql').render_as_string(hide_password=False)
+            backend = PostgresBackend(dsn, app.config.get('INVALIDATION_CHANNEL') or DEFAULT_CHANNEL)
+        elif kind == 'local':
+            backend = InProcessBackend()
+        else:
+            raise ValueError(f"Unknown INVALIDATION_BACKEND '{kind}'")
+        self.start(backend)
+        app.before_request(self.ensure_started)
+
+
+# Per-process bus; caches subscribe where they are defined
+invalidation_bus = InvalidationBus()
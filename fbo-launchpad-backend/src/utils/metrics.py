@@ -0,0 +1,167 @@
+"""
+Prometheus metrics, served in the text exposition format by ``GET /metrics``.
+
+* HTTP: request latency histogram and request counter per method, route
+  template and (for the counter) status code, plus the number of requests in
+  flight.
+* Database pool: connections checked out, checkout wait histogram and
+  checkout timeouts.
+* Caches: lookups per cache and result (``hit``/``miss``); the hit ratio is
+  ``rate(cache_requests_total{result="hit"}[5m]) / rate(cache_requests_total[5m])``.
+* Business: fuel orders dispatched and completed; per minute is
+  ``rate(fuel_orders_completed_total[5m]) * 60``.
+
+Gunicorn runs several worker processes and each keeps its own values. Set
+PROMETHEUS_MULTIPROC_DIR in the environment of the gunicorn master (it must be
+set before prometheus_client is imported, and emptied before the workers
+start): every worker then keeps its values in mmapped files in that directory
+and ``/metrics`` merges the files of all workers, so whichever worker answers
+the scrape reports the totals. gunicorn.conf.py sets this up, including
+dropping the gauges of exited workers. Without the variable (development,
+tests) each process reports its own values.
+
+The endpoint is not behind the API's JWT auth. Set METRICS_TOKEN and give
+Prometheus the same value as its bearer token, or keep ``/metrics`` reachable
+from the internal network only.
+
+Requests are recorded by a WSGI middleware: one dict lookup for the cached
+label children, a histogram observation, a counter increment and the
+in-flight gauge, plus a before_request hook that hands it the route, a few
+microseconds per request in total (see tests/test_metrics.py). A request is
+recorded when the server closes its response, so the latency and the
+in-flight gauge include sending a streamed body.
+"""
+import os
+import time
+from typing import Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from flask import request
+from sqlalchemy import event
+from werkzeug.wsgi import ClosingIterator
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by route',
+    ['method', 'endpoint'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS = Counter('http_requests', 'Requests by route and status code', ['method', 'endpoint', 'status'])
+IN_FLIGHT = Gauge('http_requests_in_flight', 'Requests being handled', multiprocess_mode='livesum')
+
+DB_POOL_CHECKED_OUT = Gauge('db_pool_connections_checked_out', 'Database connections in use',
+                            multiprocess_mode='livesum')
+DB_POOL_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent getting a connection from the pool',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+DB_POOL_TIMEOUTS = Counter('db_pool_checkout_timeouts', 'Pool checkouts that timed out')
+
+CACHE_REQUESTS = Counter('cache_requests', 'Cache lookups by cache and result', ['cache', 'result'])
+
+FUEL_ORDERS_DISPATCHED = Counter('fuel_orders_dispatched', 'Fuel orders created and dispatched')
+FUEL_ORDERS_COMPLETED = Counter('fuel_orders_completed', 'Fuel orders completed')
+
+# Environ key holding the matched url_rule (Flask clears its request object from
+# the environ before the middleware gets control back)
+URL_RULE_KEY = 'fbo.url_rule'
+
+
+def cache_counters(cache: str) -> Tuple[Counter, Counter]:
+    """The (hit, miss) counters of a cache, resolved once so lookups only increment."""
+    return CACHE_REQUESTS.labels(cache, 'hit'), CACHE_REQUESTS.labels(cache, 'miss')
+
+
+def render() -> Tuple[bytes, str]:
+    """The metrics of every worker (or of this process) and their content type."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """WSGI middleware recording the HTTP metrics of every request.
+
+    Works on the WSGI environ rather than in Flask hooks, which avoids most
+    context-local lookups of `flask.request`/`g`, and also sees requests that
+    end in an unhandled exception (recorded as 500). The route comes from
+    `remember_url_rule`.
+
+    The request is recorded when the server closes the response iterable,
+    i.e. after the last chunk of a streamed body has been sent.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        # (method, route, status) -> (latency histogram, request counter)
+        self._children: Dict[Tuple[str, str, str], tuple] = {}
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+        status = '500'
+
+        def _start_response(code, headers, exc_info=None):
+            nonlocal status
+            status = code[:3]
+            return start_response(code, headers, exc_info)
+
+        def record():
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            rule = environ.get(URL_RULE_KEY)
+            key = (environ['REQUEST_METHOD'], rule.rule if rule is not None else 'unmatched', status)
+            children = self._children.get(key)
+            if children is None:
+                children = self._children[key] = (REQUEST_LATENCY.labels(key[0], key[1]), REQUESTS.labels(*key))
+            children[0].observe(elapsed)
+            children[1].inc()
+
+        try:
+            body = self.wsgi_app(environ, _start_response)
+        except BaseException:
+            record()
+            raise
+        return ClosingIterator(body, record)
+
+
+def remember_url_rule() -> None:
+    """before_request hook passing the matched route template to the middleware."""
+    req = request._get_current_object()
+    req.environ[URL_RULE_KEY] = req.url_rule
+
+
+class RequestMetrics:
+    """Installs the metrics middleware and the connection pool listeners."""
+
+    def init_app(self, app) -> None:
+        from ..extensions import db
+        app.wsgi_app = MetricsMiddleware(app.wsgi_app)
+        app.before_request(remember_url_rule)
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, 'checkout', self._on_checkout):
+            event.listen(engine, 'checkout', self._on_checkout)
+            event.listen(engine, 'checkin', self._on_checkin)
+
+    @staticmethod
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        DB_POOL_CHECKED_OUT.inc()
+
+    @staticmethod
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        DB_POOL_CHECKED_OUT.dec()
+
+
+request_metrics = RequestMetrics()
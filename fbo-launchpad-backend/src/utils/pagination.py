@@ -0,0 +1,35 @@
+"""
+Opaque cursors for keyset (seek) pagination.
+
+A cursor carries the sort key of the last row of a page. The next page is read
+with ``WHERE (sort columns) > (cursor values)`` on an index, so every page
+costs the same however deep the client pages, unlike OFFSET.
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row returned as an opaque cursor."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """
+    Decode a cursor made by encode_cursor for a sort key of `size` values.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor.")
+    return values
@@ -0,0 +1,95 @@
+"""
+Per-process cache of each user's effective permissions.
+
+A user's permissions are resolved with a single join over user_roles and
+role_permissions and kept as a frozenset, so `User.has_permission` and
+`GET /api/auth/me/permissions` answer from memory after the first lookup.
+
+Services that change role assignments or role permissions publish a
+'permissions' event on the invalidation bus after committing, which evicts
+the entry in every worker. Entries also expire after
+PERMISSION_CACHE_TTL_SECONDS in case an event is lost.
+"""
+import hashlib
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from flask import current_app
+
+from .db_routing import use_primary
+from .invalidation import invalidation_bus
+from .metrics import cache_counters
+
+DEFAULT_TTL_SECONDS = 60
+
+_hits, _misses = cache_counters('permissions')
+
+
+class PermissionCache:
+    """user_id -> frozenset of permission names, with a generation counter."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[FrozenSet[str], float]] = {}
+        # Bumped by every invalidation; a lookup that started before an
+        # invalidation does not store its (possibly stale) result
+        self._generation = 0
+
+    @staticmethod
+    def resolve(user_id: int) -> FrozenSet[str]:
+        """Effective permission names of a user in one query."""
+        from ..extensions import db
+        from ..models.permission import Permission
+        from ..models.role_permission import role_permissions, user_roles
+        # Cached results outlive replica lag, so read them from the primary
+        with use_primary():
+            rows = db.session.query(Permission.name) \
+                .join(role_permissions, role_permissions.c.permission_id == Permission.id) \
+                .join(user_roles, user_roles.c.role_id == role_permissions.c.role_id) \
+                .filter(user_roles.c.user_id == user_id) \
+                .distinct().all()
+        return frozenset(name for name, in rows)
+
+    def get(self, user_id: int) -> FrozenSet[str]:
+        ttl = current_app.config.get('PERMISSION_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            generation = self._generation
+        if entry is not None and now - entry[1] < ttl:
+            _hits.inc()
+            return entry[0]
+        _misses.inc()
+        permissions = self.resolve(user_id)
+        with self._lock:
+            if self._generation == generation:
+                self._entries[user_id] = (permissions, now)
+        return permissions
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop one user's entry, or every entry (e.g. after a role's permissions change)."""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    @staticmethod
+    def etag(user_id: int, permissions: FrozenSet[str]) -> str:
+        """Version tag of a permission set. It is derived from the set itself,
+        so every worker gives the same tag for the same permissions."""
+        digest = hashlib.sha1(f"{user_id}:{','.join(sorted(permissions))}".encode()).hexdigest()
+        return f"perm-{user_id}-{digest[:16]}"
+
+
+# Per-process cache used by User.has_permission and the permissions endpoint
+permission_cache = PermissionCache()
+
+
+def _on_permissions_changed(event) -> None:
+    permission_cache.invalidate(int(event.key) if event.key is not None else None)
+
+
+invalidation_bus.subscribe('permissions', _on_permissions_changed)
@@ -0,0 +1,143 @@
+"""
+Per-request SQL instrumentation.
+
+Every statement run on the app's engines while handling a request is counted
+and timed through SQLAlchemy cursor events. After the request:
+
+* when SQL_QUERY_HEADERS is on (everywhere but production) the response gets
+  ``X-DB-Queries: <count>`` and ``Server-Timing: db;dur=<ms>;desc="<count> queries"``,
+  which browser dev tools show in the request timing;
+* a statement shape that ran SQL_REPEATED_QUERY_THRESHOLD or more times is
+  logged with the endpoint as a likely N+1 pattern. The shape is the SQL with
+  literals and IN lists collapsed, so loading the same row type one id at a
+  time counts as repeats of one shape.
+
+Statements slower than SQL_SLOW_QUERY_MS are logged as they finish, with the
+endpoint that ran them.
+
+`query_stats.capture()` collects the statements of a block, in or out of a
+request; the ``max_queries`` pytest fixture is built on it.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Bound parameters of any DBAPI paramstyle, string and number literals
+_LITERAL = re.compile(r"%\(\w+\)s|%s|\?|(?<!:):\w+|\$\d+|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# A list of placeholders, e.g. an expanded IN (...)
+_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with literals, parameters and IN lists replaced by a single ``?``."""
+    shape = _LITERAL.sub('?', statement)
+    shape = _LIST.sub('?', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+class RequestQueries:
+    """Statements run while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+
+class QueryStats:
+    """Cursor event listeners feeding the per-request counters, slow-query log and captures."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._captures: List[list] = []
+        self.headers = True
+        self.slow_seconds = 0.2
+        self.repeat_threshold = 5
+
+    def init_app(self, app) -> None:
+        from ..extensions import db
+        self.headers = app.config.get('SQL_QUERY_HEADERS', True)
+        self.slow_seconds = app.config.get('SQL_SLOW_QUERY_MS', 200) / 1000.0
+        self.repeat_threshold = app.config.get('SQL_REPEATED_QUERY_THRESHOLD', 5)
+        with app.app_context():
+            for engine in db.engines.values():
+                self.attach(engine)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def attach(self, engine) -> None:
+        if not event.contains(engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        seconds = time.perf_counter() - context._query_started
+        if self._captures:
+            with self._lock:
+                for captured in self._captures:
+                    captured.append(statement)
+        in_request = has_request_context()
+        if in_request:
+            queries = g.get('db_queries')
+            if queries is None:
+                queries = g.db_queries = RequestQueries()
+            queries.record(statement, seconds)
+        if seconds >= self.slow_seconds:
+            endpoint = request.endpoint if in_request else None
+            logger.warning(f"Slow query ({seconds * 1000:.1f} ms) in {endpoint or 'no request'}: "
+                           f"{_SPACE.sub(' ', statement)[:1000]}")
+
+    @staticmethod
+    def _before_request() -> None:
+        # g outlives the request when an app context was already pushed (tests, CLI)
+        g.db_queries = RequestQueries()
+
+    def _after_request(self, response):
+        queries: Optional[RequestQueries] = g.pop('db_queries', None)
+        count = queries.count if queries else 0
+        if self.headers:
+            ms = queries.seconds * 1000 if queries else 0.0
+            response.headers['X-DB-Queries'] = str(count)
+            timing = f'db;dur={ms:.1f};desc="{count} queries"'
+            existing = response.headers.get('Server-Timing')
+            response.headers['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+        if queries and self.repeat_threshold:
+            for shape, times in queries.shapes.items():
+                if times >= self.repeat_threshold:
+                    logger.warning(f"Possible N+1 in {request.method} {request.endpoint}: "
+                                   f"{times} x {shape[:500]}")
+        return response
+
+    @contextmanager
+    def capture(self):
+        """Collect the statements run (by any thread) inside the block."""
+        captured: List[str] = []
+        with self._lock:
+            self._captures.append(captured)
+        try:
+            yield captured
+        finally:
+            with self._lock:
+                self._captures = [c for c in self._captures if c is not captured]
+
+
+query_stats = QueryStats()
@@ -0,0 +1,121 @@
+"""
+Per-process cache of serialized reference data lists.
+
+The truck, aircraft, customer, permission and role lists are read by every
+form and change rarely. Their routes keep the complete JSON body of each list
+(per variant, e.g. filter and ``?fields=`` selection) together with the
+version stamp of its table at the time it was built:
+
+* every table has a version number in this process, bumped by the
+  invalidation bus events services publish after committing a change
+  ('fuel_truck', 'aircraft', 'customer', 'permission', 'role'), whichever
+  worker made it;
+* a request finds the entry for its variant, and if its version is still the
+  table's current one, sends the stored bytes: two dictionary lookups, no
+  query and no serialization;
+* the ETag is a hash of the body, so every worker gives the same tag for the
+  same list and ``If-None-Match`` gets a 304 from any of them.
+
+Entries also expire after REFERENCE_LIST_CACHE_TTL_SECONDS in case an event
+is lost (e.g. a change made from the CLI in another process), and at most
+REFERENCE_LIST_CACHE_MAX_ENTRIES variants are kept, oldest dropped first.
+"""
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Hashable, NamedTuple, Tuple
+
+from flask import current_app, jsonify, request
+
+from .db_routing import use_primary
+from .invalidation import ALL_ENTITIES, invalidation_bus
+from .metrics import cache_counters
+
+# Tables (invalidation bus entities) whose lists are cached
+ENTITIES = ('fuel_truck', 'aircraft', 'customer', 'permission', 'role')
+
+_hits, _misses = cache_counters('reference_lists')
+
+
+class CachedList(NamedTuple):
+    version: int
+    stored_at: float
+    body: bytes
+    etag: str
+
+
+class ReferenceListCache:
+    """(entity, variant) -> serialized list, valid while the entity's version is unchanged."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {entity: 0 for entity in ENTITIES}
+        self._entries: Dict[Tuple[str, Hashable], CachedList] = {}
+        self.ttl = 300.0
+        self.max_entries = 256
+
+    def init_app(self, app) -> None:
+        self.ttl = app.config.get('REFERENCE_LIST_CACHE_TTL_SECONDS', 300)
+        self.max_entries = app.config.get('REFERENCE_LIST_CACHE_MAX_ENTRIES', 256)
+
+    def response(self, entity: str, variant: Hashable, build: Callable[[], Tuple[dict, int]]):
+        """The list response for `variant` of `entity`, from the cache or from `build`.
+
+        `build` returns the response payload and status code; only 200
+        responses are stored. Answers 304 when If-None-Match has the list's tag.
+        """
+        key = (entity, variant)
+        version = self._versions[entity]
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version or time.monotonic() - entry.stored_at >= self.ttl:
+            _misses.inc()
+            # Stored results outlive replica lag, so read them from the primary
+            with use_primary():
+                payload, status_code = build()
+            if status_code != 200:
+                return jsonify(payload), status_code
+            body = current_app.json.response(payload).get_data()
+            entry = CachedList(version, time.monotonic(), body,
+                               f"list-{hashlib.sha1(body).hexdigest()[:16]}")
+            self._store(key, entry)
+        else:
+            _hits.inc()
+
+        if request.if_none_match.contains_weak(entry.etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(entry.body, mimetype='application/json')
+        response.set_etag(entry.etag)
+        # Clients may keep the list but must revalidate it on every use
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def _store(self, key, entry: CachedList) -> None:
+        with self._lock:
+            # A change committed while the list was being built makes it stale
+            if self._versions[key[0]] != entry.version:
+                return
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = entry
+
+    def invalidate(self, event) -> None:
+        """Bump the version of the event's table (of every table when events may have been lost)."""
+        with self._lock:
+            entities = ENTITIES if event.entity == ALL_ENTITIES else (event.entity,)
+            for entity in entities:
+                self._versions[entity] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for entity in ENTITIES:
+                self._versions[entity] += 1
+            self._entries.clear()
+
+
+# Per-process cache used by the reference list routes
+reference_lists = ReferenceListCache()
+
+for _entity in ENTITIES:
+    invalidation_bus.subscribe(_entity, reference_lists.invalidate)
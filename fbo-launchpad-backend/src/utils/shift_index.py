@@ -0,0 +1,162 @@
+"""
+In-memory interval index of LST shifts for "who is on shift at time T".
+
+Each shift is stored as its working intervals (the shift minus its breaks) in
+a centered interval tree. Every node holds the intervals containing its center
+twice, sorted by start and by end. A point query walks one root-to-leaf path
+and, at each node, reads only the intervals that contain the point from one of
+the two lists, so it costs O(log n + k) for k matching intervals.
+
+The tree is static. Rosters change rarely compared with how often assignment
+asks who is on shift, so LSTShiftService rebuilds it after every roster change
+(a few milliseconds for thousands of shifts). Shifts that already ended when
+the index was loaded are left out.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from .db_routing import use_primary
+from .invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+Interval = Tuple[Any, Any, T]
+
+
+class _Node(Generic[T]):
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+    def __init__(self, center, by_start, by_end, left, right):
+        self.center = center
+        self.by_start: List[Interval] = by_start
+        self.by_end: List[Interval] = by_end
+        self.left: Optional['_Node[T]'] = left
+        self.right: Optional['_Node[T]'] = right
+
+
+class IntervalIndex(Generic[T]):
+    """Static centered interval tree over half-open [start, end) intervals."""
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        items = [iv for iv in intervals if iv[0] < iv[1]]
+        self._size = len(items)
+        self._root = self._build(sorted(items, key=lambda iv: iv[0]))
+
+    @classmethod
+    def _build(cls, items: List[Interval]) -> Optional[_Node[T]]:
+        """Build from intervals sorted by start. The center is the median start,
+        so the interval it came from always stays at the node and each side
+        gets at most half of the intervals."""
+        if not items:
+            return None
+        center = items[len(items) // 2][0]
+        left, here, right = [], [], []
+        for iv in items:
+            if iv[1] <= center:
+                left.append(iv)
+            elif iv[0] > center:
+                right.append(iv)
+            else:
+                here.append(iv)
+        return _Node(center, here, sorted(here, key=lambda iv: iv[1], reverse=True),
+                     cls._build(left), cls._build(right))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stab(self, point) -> List[Interval]:
+        """All intervals with start <= point < end."""
+        found = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                # Every interval here ends after the center, hence after the point
+                for iv in node.by_start:
+                    if iv[0] > point:
+                        break
+                    found.append(iv)
+                node = node.left
+            else:
+                # Every interval here starts at or before the center, hence before the point
+                for iv in node.by_end:
+                    if iv[1] <= point:
+                        break
+                    found.append(iv)
+                node = node.right
+        return found
+
+
+class ShiftIndex:
+    """Working intervals of upcoming and current LST shifts of one worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index: IntervalIndex[int] = IntervalIndex()
+        # End of the last working interval; the roster is in use until then
+        self._last_end: Optional[datetime] = None
+        self.loaded = False
+
+    def load(self, shifts: Iterable[Any]) -> None:
+        """Replace the index contents with the given LSTShift rows."""
+        intervals = [(start, end, shift.user_id) for shift in shifts for start, end in shift.working_intervals()]
+        index = IntervalIndex(intervals)
+        last_end = max((end for start, end, _ in intervals if start < end), default=None)
+        with self._lock:
+            self._index = index
+            self._last_end = last_end
+            self.loaded = True
+
+    def load_from_db(self) -> None:
+        """Load every shift that has not ended yet."""
+        from ..models.lst_shift import LSTShift
+        with use_primary():
+            shifts = LSTShift.query.filter(LSTShift.end_time > datetime.utcnow()).all()
+        self.load(shifts)
+        logger.info(f"Loaded {len(shifts)} LST shifts into the shift index")
+
+    @property
+    def has_roster(self) -> bool:
+        """False when no current or upcoming shifts exist, i.e. the roster is not in use.
+
+        Checked against the clock rather than the loaded intervals, so the
+        roster stops being in use when its last shift ends, as it would for
+        a worker loading the index after that.
+        """
+        last_end = self._last_end
+        return last_end is not None and last_end > datetime.utcnow()
+
+    def on_shift(self, at: Optional[datetime] = None) -> Set[int]:
+        """Ids of users working (on shift and not on a break) at `at` (UTC, default now)."""
+        with self._lock:
+            index = self._index
+        return {user_id for _, _, user_id in index.stab(at or datetime.utcnow())}
+
+    def init_app(self, app) -> None:
+        """Load the index at startup. If the schema is not there yet (e.g. before
+        migrations run) loading is retried on first use instead."""
+        with app.app_context():
+            try:
+                self.load_from_db()
+            except Exception as e:
+                from ..extensions import db
+                db.session.rollback()
+                logger.warning(f"Shift index not loaded at startup, will load on first use: {str(e)}")
+
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.load_from_db()
+
+    def invalidate(self, event=None) -> None:
+        """Reload from the database on next use. Subscribed to the invalidation
+        bus for changes made by other workers; this worker's own changes are
+        applied in place by the services."""
+        if event is None or event.remote:
+            self.loaded = False
+
+
+# Per-process index used by LST auto-assignment and the shift routes
+lst_shift_index = ShiftIndex()
+invalidation_bus.subscribe('lst_shift', lst_shift_index.invalidate)
@@ -0,0 +1,284 @@
+"""
+In-memory spatial index of ramp spots and last-known fuel truck positions.
+
+Coordinates are planar metres on the airport's ramp grid (see RampSpot). Both
+sets of points live in a uniform grid of GRID_CELL_SIZE metre cells. A nearest
+lookup searches outward ring by ring from the query's cell and stops once the
+next ring cannot hold anything closer than what was found, so its cost depends
+on how many points are near the query rather than on the size of the fleet or
+the spot map. Unlike a KD-tree the grid takes point moves in O(1), which suits
+truck positions that change all day.
+
+Each worker loads the index at startup and keeps it current from the ramp spot
+and truck services, like the tail number index.
+"""
+import heapq
+import logging
+import math
+import threading
+from typing import Any, Callable, Dict, Generic, Iterable, List, NamedTuple, Optional, Set, Tuple, TypeVar
+
+from .db_routing import use_primary
+from .invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+# Cell edge in metres; roughly one parking position
+GRID_CELL_SIZE = 50.0
+
+T = TypeVar('T')
+Cell = Tuple[int, int]
+
+
+class GridIndex(Generic[T]):
+    """Points with payloads in a uniform grid, supporting moves and k-nearest lookups."""
+
+    def __init__(self, cell_size: float = GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[int]] = {}
+        self._points: Dict[int, Tuple[float, float, T]] = {}
+        # Bounding box of occupied cells; only grows until clear()
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def upsert(self, key: int, x: float, y: float, payload: T) -> None:
+        self.remove(key)
+        self._points[key] = (x, y, payload)
+        i, j = cell = self._cell(x, y)
+        self._cells.setdefault(cell, set()).add(key)
+        if self._bounds is None:
+            self._bounds = (i, i, j, j)
+        else:
+            min_i, max_i, min_j, max_j = self._bounds
+            self._bounds = (min(min_i, i), max(max_i, i), min(min_j, j), max(max_j, j))
+
+    def remove(self, key: int) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(point[0], point[1])
+        members = self._cells[cell]
+        members.discard(key)
+        if not members:
+            del self._cells[cell]
+
+    def get(self, key: int) -> Optional[Tuple[float, float, T]]:
+        return self._points.get(key)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._points.clear()
+        self._bounds = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        accept: Optional[Callable[[T], bool]] = None,
+        max_distance: Optional[float] = None
+    ) -> List[Tuple[float, int, T]]:
+        """
+        The `k` closest points to (x, y) whose payload passes `accept`, as
+        (distance, key, payload) sorted by distance.
+        """
+        if not self._cells or k <= 0:
+            return []
+        cx, cy = self._cell(x, y)
+        # Rings beyond this cannot contain any point
+        min_i, max_i, min_j, max_j = self._bounds
+        max_ring = max(cx - min_i, max_i - cx, cy - min_j, max_j - cy)
+        if max_distance is not None:
+            max_ring = min(max_ring, int(max_distance // self.cell_size) + 1)
+
+        best: List[Tuple[float, int]] = []  # max-heap of (-distance, key)
+        limit = max_distance if max_distance is not None else math.inf
+        for ring in range(max_ring + 1):
+            # Everything in this ring is at least (ring - 1) cells away
+            if len(best) == k and -best[0][0] <= (ring - 1) * self.cell_size:
+                break
+            if ring == 0:
+                cells = [(cx, cy)]
+            else:
+                cells = [(cx + d, cy - ring) for d in range(-ring, ring + 1)]
+                cells += [(cx + d, cy + ring) for d in range(-ring, ring + 1)]
+                cells += [(cx - ring, cy + d) for d in range(-ring + 1, ring)]
+                cells += [(cx + ring, cy + d) for d in range(-ring + 1, ring)]
+            for cell in cells:
+                for key in self._cells.get(cell, ()):
+                    px, py, payload = self._points[key]
+                    if accept is not None and not accept(payload):
+                        continue
+                    distance = math.hypot(px - x, py - y)
+                    if distance > limit:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+        return [(-d, key, self._points[key][2]) for d, key in sorted(best, reverse=True)]
+
+
+class SpotEntry(NamedTuple):
+    id: int
+    code: str
+    zone: Optional[str]
+    x: float
+    y: float
+
+
+class TruckEntry(NamedTuple):
+    id: int
+    truck_number: str
+    fuel_type: str
+    capacity: float
+
+
+def _fuel_key(fuel_type: Optional[str]) -> str:
+    return (fuel_type or '').strip().lower()
+
+
+class RampIndex:
+    """Active ramp spots and positioned active trucks of one worker process."""
+
+    def __init__(self, cell_size: float = GRID_CELL_SIZE):
+        self._lock = threading.Lock()
+        self.spots: GridIndex[SpotEntry] = GridIndex(cell_size)
+        self.trucks: GridIndex[TruckEntry] = GridIndex(cell_size)
+        self._spot_codes: Dict[str, int] = {}
+        self.loaded = False
+
+    def load(self, spots: Iterable[Any], trucks: Iterable[Any]) -> None:
+        """Replace the index contents with the given RampSpot and FuelTruck rows."""
+        with self._lock:
+            self.spots.clear()
+            self.trucks.clear()
+            self._spot_codes = {}
+            for spot in spots:
+                self._upsert_spot(spot)
+            for truck in trucks:
+                self._upsert_truck(truck)
+            self.loaded = True
+
+    def load_from_db(self) -> None:
+        """Load active spots and active trucks that have reported a position."""
+        from ..extensions import db
+        from ..models.fuel_truck import FuelTruck
+        from ..models.ramp_spot import RampSpot
+        with use_primary():
+            spots = db.session.query(RampSpot.id, RampSpot.code, RampSpot.zone, RampSpot.x, RampSpot.y,
+                                     RampSpot.is_active).filter(RampSpot.is_active == True).all()
+            trucks = db.session.query(FuelTruck.id, FuelTruck.truck_number, FuelTruck.fuel_type, FuelTruck.capacity,
+                                      FuelTruck.is_active, FuelTruck.last_x, FuelTruck.last_y) \
+                .filter(FuelTruck.is_active == True, FuelTruck.last_x.isnot(None)).all()
+        self.load(spots, trucks)
+        logger.info(f"Loaded {len(spots)} ramp spots and {len(trucks)} truck positions into the spatial index")
+
+    def _upsert_spot(self, spot: Any) -> None:
+        previous = self.spots.get(spot.id)
+        if previous is not None:
+            self._spot_codes.pop(previous[2].code.upper(), None)
+        if not spot.is_active:
+            self.spots.remove(spot.id)
+            return
+        entry = SpotEntry(spot.id, spot.code, spot.zone, float(spot.x), float(spot.y))
+        self.spots.upsert(spot.id, entry.x, entry.y, entry)
+        self._spot_codes[spot.code.upper()] = spot.id
+
+    def _upsert_truck(self, truck: Any) -> None:
+        if not truck.is_active or truck.last_x is None or truck.last_y is None:
+            self.trucks.remove(truck.id)
+            return
+        entry = TruckEntry(truck.id, truck.truck_number, truck.fuel_type, float(truck.capacity))
+        self.trucks.upsert(truck.id, float(truck.last_x), float(truck.last_y), entry)
+
+    def upsert_spot(self, spot: Any) -> None:
+        """Add, move or (if inactive) drop one ramp spot."""
+        with self._lock:
+            self._upsert_spot(spot)
+
+    def remove_spot(self, spot_id: int) -> None:
+        with self._lock:
+            previous = self.spots.get(spot_id)
+            if previous is not None:
+                self._spot_codes.pop(previous[2].code.upper(), None)
+                self.spots.remove(spot_id)
+
+    def upsert_truck(self, truck: Any) -> None:
+        """Add, move or (if inactive or unpositioned) drop one truck."""
+        with self._lock:
+            self._upsert_truck(truck)
+
+    def remove_truck(self, truck_id: int) -> None:
+        with self._lock:
+            self.trucks.remove(truck_id)
+
+    def get_spot(self, spot_id: int) -> Optional[SpotEntry]:
+        with self._lock:
+            point = self.spots.get(spot_id)
+        return point[2] if point is not None else None
+
+    def get_spot_by_code(self, code: str) -> Optional[SpotEntry]:
+        with self._lock:
+            spot_id = self._spot_codes.get(code.strip().upper())
+        return self.get_spot(spot_id) if spot_id is not None else None
+
+    def nearest_spots(self, x: float, y: float, limit: int = 1) -> List[Dict[str, Any]]:
+        with self._lock:
+            found = self.spots.nearest(x, y, limit)
+        return [dict(spot._asdict(), distance=round(d, 1)) for d, _, spot in found]
+
+    def nearest_trucks(
+        self,
+        x: float,
+        y: float,
+        fuel_type: Optional[str] = None,
+        min_capacity: Optional[float] = None,
+        limit: int = 1,
+        exclude: Iterable[int] = ()
+    ) -> List[Dict[str, Any]]:
+        """Closest positioned trucks carrying `fuel_type` with at least `min_capacity`."""
+        fuel = _fuel_key(fuel_type) if fuel_type else None
+        excluded = set(exclude)
+
+        def accept(truck: TruckEntry) -> bool:
+            return (fuel is None or _fuel_key(truck.fuel_type) == fuel) \
+                and (min_capacity is None or truck.capacity >= min_capacity) \
+                and truck.id not in excluded
+
+        with self._lock:
+            found = self.trucks.nearest(x, y, limit, accept)
+        return [dict(truck._asdict(), distance=round(d, 1)) for d, _, truck in found]
+
+    def init_app(self, app) -> None:
+        """Load the index at startup. If the schema is not there yet (e.g. before
+        migrations run) loading is retried on first use instead."""
+        with app.app_context():
+            try:
+                self.load_from_db()
+            except Exception as e:
+                from ..extensions import db
+                db.session.rollback()
+                logger.warning(f"Spatial index not loaded at startup, will load on first use: {str(e)}")
+
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.load_from_db()
+
+    def invalidate(self, event=None) -> None:
+        """Reload from the database on next use. Subscribed to the invalidation
+        bus for changes made by other workers; this worker's own changes are
+        applied in place by the services."""
+        if event is None or event.remote:
+            self.loaded = False
+
+
+# Per-process index used by the ramp spot, truck and fuel order code
+ramp_index = RampIndex()
+invalidation_bus.subscribe('ramp_spot', ramp_index.invalidate)
+invalidation_bus.subscribe('fuel_truck', ramp_index.invalidate)
@@ -0,0 +1,123 @@
+"""
+In-memory prefix index of aircraft tail numbers for typeahead lookups.
+
+Each worker process keeps a sorted array of normalized (upper-case) tail
+numbers alongside the aircraft type and fuel type, so a prefix lookup is a
+binary search plus a short scan: O(log n + k) with no database round trip.
+
+The index is loaded from the aircraft table at startup and kept current by
+AircraftService (create/update/delete) and by aircraft auto-creation when a
+fuel order is placed for an unknown tail number.
+"""
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional
+
+from .db_routing import use_primary
+from .invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+
+class TailNumberIndex:
+    """Sorted-array prefix index of tail numbers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+
+    @staticmethod
+    def _normalize(tail_number: str) -> str:
+        return tail_number.strip().upper()
+
+    def load(self, aircraft: Iterable[Any]) -> None:
+        """Replace the index contents with the given Aircraft rows."""
+        entries = {}
+        for a in aircraft:
+            entries[self._normalize(a.tail_number)] = {
+                'tail_number': a.tail_number,
+                'aircraft_type': a.aircraft_type,
+                'fuel_type': a.fuel_type,
+            }
+        with self._lock:
+            self._entries = entries
+            self._keys = sorted(entries)
+            self.loaded = True
+
+    def load_from_db(self) -> None:
+        """Load all aircraft, reading only the indexed columns."""
+        from ..models.aircraft import Aircraft
+        from ..extensions import db
+        with use_primary():
+            rows = db.session.query(Aircraft.tail_number, Aircraft.aircraft_type, Aircraft.fuel_type).all()
+        self.load(rows)
+        logger.info(f"Loaded {len(rows)} tail numbers into the typeahead index")
+
+    def upsert(self, tail_number: str, aircraft_type: str, fuel_type: str) -> None:
+        """Add or update one aircraft."""
+        key = self._normalize(tail_number)
+        with self._lock:
+            if key not in self._entries:
+                insort(self._keys, key)
+            self._entries[key] = {
+                'tail_number': tail_number,
+                'aircraft_type': aircraft_type,
+                'fuel_type': fuel_type,
+            }
+
+    def remove(self, tail_number: str) -> None:
+        """Remove one aircraft if present."""
+        key = self._normalize(tail_number)
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return up to `limit` aircraft whose tail number starts with `prefix`, in sorted order."""
+        prefix = self._normalize(prefix)
+        results = []
+        with self._lock:
+            i = bisect_left(self._keys, prefix)
+            while i < len(self._keys) and len(results) < limit:
+                key = self._keys[i]
+                if not key.startswith(prefix):
+                    break
+                results.append(dict(self._entries[key]))
+                i += 1
+        return results
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def init_app(self, app) -> None:
+        """Load the index at startup. If the schema is not there yet (e.g. before
+        migrations run) loading is retried on first use instead."""
+        with app.app_context():
+            try:
+                self.load_from_db()
+            except Exception as e:
+                from ..extensions import db
+                db.session.rollback()
+                logger.warning(f"Tail number index not loaded at startup, will load on first use: {str(e)}")
+
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.load_from_db()
+
+    def invalidate(self, event=None) -> None:
+        """Reload from the database on next use. Subscribed to the invalidation
+        bus for changes made by other workers; this worker's own changes are
+        applied in place by the services."""
+        if event is None or event.remote:
+            self.loaded = False
+
+
+# Per-process index used by the aircraft routes and services
+tail_number_index = TailNumberIndex()
+invalidation_bus.subscribe('aircraft', tail_number_index.invalidate)
@@ -1,8 +1,11 @@
 import os
+from contextlib import contextmanager
+
 import pytest
 import jwt
 from datetime import datetime, timedelta
-from src import create_app, config as app_config
+from src import config as app_config
+from src.app import create_app
 from src.models.user import User
 from src.models.role import Role
 from src.models.permission import Permission
@@ -11,6 +14,9 @@ from src.models.customer import Customer
 from src.models.fuel_truck import FuelTruck
 from src.models.fuel_order import FuelOrder
 from src.extensions import db as _db
+from src.seeds import all_permissions as seed_permissions, role_permission_mapping
+from src.utils.query_stats import query_stats
+from src.utils.reference_cache import reference_lists
 
 # Patch: Use SQLite in-memory DB for local testing if LOCAL_TEST=1
 if os.environ.get('LOCAL_TEST') == '1':
@@ -20,6 +26,15 @@ if os.environ.get('LOCAL_TEST') == '1':
     app_config_dict['testing'] = LocalTestConfig
     print('*** Forcing SQLite in-memory DB for all test runs (LOCAL_TEST=1) ***')
 
+def _detached(*objects):
+    """Load session-scoped fixture rows and detach them, so later tests can read
+    their attributes after db_session has removed the session."""
+    for obj in objects:
+        _db.session.refresh(obj)
+        _db.session.expunge(obj)
+    return objects[0] if len(objects) == 1 else objects
+
+
 @pytest.fixture(scope='session')
 def app():
     """Create application for the tests."""
@@ -59,6 +74,11 @@ def db_session(app, db):
     session.rollback()
     session.remove()
 
+@pytest.fixture(autouse=True)
+def fresh_reference_lists():
+    """Fixtures write rows without publishing invalidations; start each test uncached."""
+    reference_lists.clear()
+
 @pytest.fixture(scope='function')
 def client(app):
     """Create test client."""
@@ -80,6 +100,10 @@ def test_permissions(app, db):
             Permission(name='MANAGE_TRUCKS', description='Can manage fuel trucks'),
             Permission(name='VIEW_TRUCKS', description='Can view fuel trucks')
         ]
+        # Plus the rest of the application's permissions (src/seeds.py)
+        names = {p.name for p in permissions}
+        permissions += [Permission(name=p['name'], description=p['description'])
+                        for p in seed_permissions if p['name'] not in names]
         for p in permissions:
             db.session.add(p)
         db.session.commit()
@@ -96,15 +120,17 @@ def test_roles(app, db, test_permissions):
         admin_role.permissions.extend(all_permissions)
         # CSR role gets customer service permissions
         csr_role = Role(name='Customer Service Representative', description='Customer service access')
-        csr_permissions = [perm_dict[n] for n in [
-            'CREATE_ORDER', 'MANAGE_ORDERS', 'VIEW_ORDERS', 'VIEW_USERS'
-        ] if n in perm_dict]
+        csr_permissions = [perm_dict[n] for n in dict.fromkeys([
+            'CREATE_ORDER', 'MANAGE_ORDERS', 'VIEW_ORDERS', 'VIEW_USERS',
+            *role_permission_mapping['Customer Service Representative']
+        ]) if n in perm_dict]
         csr_role.permissions.extend(csr_permissions)
         # LST role gets limited permissions
         lst_role = Role(name='Line Service Technician', description='Line service access')
-        lst_permissions = [perm_dict[n] for n in [
-            'VIEW_ORDERS', 'COMPLETE_ORDER', 'VIEW_TRUCKS'
-        ] if n in perm_dict]
+        lst_permissions = [perm_dict[n] for n in dict.fromkeys([
+            'VIEW_ORDERS', 'COMPLETE_ORDER', 'VIEW_TRUCKS',
+            *role_permission_mapping['Line Service Technician']
+        ]) if n in perm_dict]
         lst_role.permissions.extend(lst_permissions)
         roles = [admin_role, csr_role, lst_role]
         for role in roles:
@@ -155,7 +181,11 @@ def test_users(app, db, test_roles):
         for user in users:
             db.session.add(user)
         db.session.commit()
-        # Do not return the list
+        for user in users:
+            # Roles are read by tests after the session is gone
+            user.roles
+        _detached(*users)
+        return {user.username: user for user in users}
 
 @pytest.fixture(scope='session')
 def test_admin_user(app, test_users):
@@ -193,8 +223,7 @@ def auth_headers(app, test_users):
                     app.config['JWT_SECRET_KEY'],
                     algorithm='HS256'
                 )
-                role_key = user.roles[0].name.lower().split()[0]
-                headers[role_key] = {'Authorization': f'Bearer {token}'}
+                headers[user.username] = {'Authorization': f'Bearer {token}'}
     return headers
 
 @pytest.fixture(scope='session')
@@ -207,7 +236,7 @@ def test_customer(db):
     )
     db.session.add(customer)
     db.session.commit()
-    return customer
+    return _detached(customer)
 
 @pytest.fixture(scope='session')
 def test_aircraft(db, test_customer):
@@ -219,7 +248,7 @@ def test_aircraft(db, test_customer):
     )
     db.session.add(aircraft)
     db.session.commit()
-    return aircraft
+    return _detached(aircraft)
 
 @pytest.fixture(scope='session')
 def test_fuel_truck(db):
@@ -233,7 +262,7 @@ def test_fuel_truck(db):
     )
     db.session.add(truck)
     db.session.commit()
-    return truck
+    return _detached(truck)
 
 @pytest.fixture
 def test_fuel_order(db, test_aircraft, test_fuel_truck, test_lst_user):
@@ -253,4 +282,19 @@ def test_fuel_order(db, test_aircraft, test_fuel_truck, test_lst_user):
 @pytest.fixture(scope='function')
 def runner(app):
     """Create a test CLI runner."""
-    return app.test_cli_runner() 
\ No newline at end of file
+    return app.test_cli_runner()
+
+
+@pytest.fixture(scope='function')
+def max_queries(app):
+    """Fail the test if a block runs more than `limit` SQL statements.
+
+    Usage: ``with max_queries(3): client.get('/api/users', headers=...)``
+    """
+    @contextmanager
+    def limit(n):
+        with query_stats.capture() as statements:
+            yield statements
+        assert len(statements) <= n, \
+            f"{len(statements)} SQL statements, expected at most {n}:\n" + "\n".join(statements)
+    return limit
@@ -60,9 +60,9 @@ def test_get_permissions_response_format(client, auth_headers):
 
 def test_get_permissions_empty_db(client, auth_headers, db_session):
     """Test permissions endpoint with empty database."""
-    # Delete all permissions
+    # Delete all permissions (rolled back after the test; the session's data is shared)
     Permission.query.delete()
-    db_session.commit()
+    db_session.flush()
     
     response = client.get('/api/admin/permissions', headers=auth_headers['admin'])
     assert response.status_code == 200
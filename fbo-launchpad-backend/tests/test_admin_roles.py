@@ -4,6 +4,8 @@ import pytest
 from flask import json
 from src.models.role import Role
 from src.models.permission import Permission
+from src.models import role_permissions
+from src.services.role_service import RoleService
 
 def test_get_roles(client, auth_headers, test_roles):
     """Test GET /api/admin/roles endpoint."""
@@ -205,4 +207,78 @@ def test_role_permissions(client, auth_headers, db_session, test_permissions):
     response = client.post(f'/api/admin/roles/{role_id}/permissions',
                          headers=auth_headers['admin'],
                          json={'permission_id': 99999})
-    assert response.status_code == 400 
\ No newline at end of file
+    assert response.status_code == 400
+
+
+def test_set_role_permissions(client, auth_headers, db_session, test_permissions):
+    """Test PUT /api/admin/roles/<id>/permissions applies the desired set."""
+    role = Role(name='Bulk Permission Role')
+    db_session.add(role)
+    db_session.commit()
+    role_id = role.id
+    perms = {p.name: p.id for p in Permission.query.all()}
+
+    response = client.put(f'/api/admin/roles/{role_id}/permissions',
+                          headers=auth_headers['admin'],
+                          json={'permission_ids': [perms['CREATE_ORDER'], perms['VIEW_ORDERS']]})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['added'] == sorted([perms['CREATE_ORDER'], perms['VIEW_ORDERS']])
+    assert data['removed'] == []
+
+    # Replace one permission: only the difference is written
+    response = client.put(f'/api/admin/roles/{role_id}/permissions',
+                          headers=auth_headers['admin'],
+                          json={'permission_ids': [perms['VIEW_ORDERS'], perms['MANAGE_USERS']]})
+    data = json.loads(response.data)
+    assert data['added'] == [perms['MANAGE_USERS']]
+    assert data['removed'] == [perms['CREATE_ORDER']]
+    assert {p.name for p in db_session.get(Role, role_id).permissions} == {'VIEW_ORDERS', 'MANAGE_USERS'}
+
+    # Unknown IDs reject the whole update
+    response = client.put(f'/api/admin/roles/{role_id}/permissions',
+                          headers=auth_headers['admin'],
+                          json={'permission_ids': [99999]})
+    assert response.status_code == 400
+    assert client.put('/api/admin/roles/99999/permissions', headers=auth_headers['admin'],
+                      json={'permission_ids': []}).status_code == 404
+
+    response = client.put(f'/api/admin/roles/{role_id}/permissions',
+                          headers=auth_headers['admin'], json={'permission_ids': []})
+    assert json.loads(response.data)['removed'] == sorted([perms['VIEW_ORDERS'], perms['MANAGE_USERS']])
+
+
+def test_set_role_permissions_errors_release_the_role_lock(db_session, test_roles):
+    """The 404 and 400 returns roll back the SELECT ... FOR UPDATE transaction."""
+    role_id = Role.query.filter_by(name='Administrator').first().id
+    assert RoleService.set_role_permissions(99999, [])[2] == 404
+    assert not db_session().in_transaction()
+    assert RoleService.set_role_permissions(role_id, [99999])[2] == 400
+    assert not db_session().in_transaction()
+
+
+def test_permission_matrix(client, auth_headers, test_roles, test_permissions):
+    """Test GET /api/admin/roles/permission-matrix."""
+    response = client.get('/api/admin/roles/permission-matrix', headers=auth_headers['lst'])
+    assert response.status_code == 403
+
+    response = client.get('/api/admin/roles/permission-matrix', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data['permissions']) == Permission.query.count()
+    assert len(data['roles']) == Role.query.count()
+    for row in data['roles']:
+        role = Role.query.get(row['id'])
+        assert set(row['permission_ids']) == {p.id for p in role.permissions}
+
+
+def test_permission_matrix_without_permissions(db_session, test_roles):
+    """Roles are listed even when no permissions exist."""
+    db_session.execute(role_permissions.delete())
+    db_session.execute(Permission.__table__.delete())
+    db_session.flush()
+    matrix, _, status = RoleService.get_permission_matrix()
+    assert status == 200
+    assert matrix['permissions'] == []
+    assert len(matrix['roles']) == Role.query.count() > 0
+    assert all(role['permission_ids'] == [] for role in matrix['roles'])
@@ -190,41 +190,55 @@ def test_permission_inheritance(client, db_session, test_users):
     assert not lst.has_permission('MANAGE_USERS')
 
 def test_permission_caching(client, db_session, test_users, app):
-    """Test that permission checks are properly cached within a request."""
-    from flask import g
-    
+    """Test that a user's permission set is resolved once and then served from the cache."""
+    from sqlalchemy import event
+    from src.utils.permission_cache import permission_cache
+
+    user = test_users['csr']
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
     with app.test_request_context():
-        user = test_users['csr']
-        
-        # First check should cache the result
-        assert user.has_permission('CREATE_ORDER')
-        cache_key = f'user_{user.id}_perm_CREATE_ORDER'
-        assert hasattr(g, '_permission_cache')
-        assert cache_key in g._permission_cache
-        assert g._permission_cache[cache_key] is True
+        permission_cache.invalidate()
+        event.listen(db_session.get_bind(), 'before_cursor_execute', before_cursor_execute)
+        try:
+            assert user.has_permission('CREATE_ORDER')
+            assert not user.has_permission('MANAGE_USERS')
+            assert user.has_permission('VIEW_ORDERS')
+        finally:
+            event.remove(db_session.get_bind(), 'before_cursor_execute', before_cursor_execute)
+        assert len(statements) == 1
+        assert 'CREATE_ORDER' in permission_cache.get(user.id)
 
 def test_permission_cache_invalidation(client, db_session, test_users, app):
-    """Test that permission cache is request-scoped."""
-    from flask import g
-    
+    """Test that invalidation makes the next check resolve the permissions again."""
+    from src.utils.permission_cache import permission_cache
+
     user = test_users['csr']
-    
-    # Check permission in first request
-    with app.test_request_context():
-        assert not hasattr(g, '_permission_cache')  # Should not exist yet
-        assert user.has_permission('CREATE_ORDER')
-        cache_key = f'user_{user.id}_perm_CREATE_ORDER'
-        assert hasattr(g, '_permission_cache')
-        assert cache_key in g._permission_cache
-        assert g._permission_cache[cache_key] is True
-        
-    # Check permission in new request (should not have cached value)
     with app.test_request_context():
-        assert not hasattr(g, '_permission_cache')  # New request, no cache
-        assert user.has_permission('CREATE_ORDER')  # Should recalculate
-        assert hasattr(g, '_permission_cache')  # Cache should be created
-        cache_key = f'user_{user.id}_perm_CREATE_ORDER'
-        assert cache_key in g._permission_cache  # Permission should be cached
+        cached = permission_cache.get(user.id)
+        assert permission_cache.get(user.id) is cached
+        permission_cache.invalidate(user.id)
+        assert permission_cache.get(user.id) is not cached
+        assert permission_cache.get(user.id) == cached
+
+def test_my_permissions_etag(client, test_users, auth_headers):
+    """Test that unchanged permission sets come back as 304 for the same ETag."""
+    response = client.get('/api/auth/me/permissions', headers=auth_headers['csr'])
+    assert response.status_code == 200
+    assert 'CREATE_ORDER' in response.get_json()['permissions']
+    etag = response.headers['ETag']
+
+    headers = dict(auth_headers['csr'], **{'If-None-Match': etag})
+    response = client.get('/api/auth/me/permissions', headers=headers)
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert not response.data
+
+    headers = dict(auth_headers['admin'], **{'If-None-Match': etag})
+    assert client.get('/api/auth/me/permissions', headers=headers).status_code == 200
 
 def test_inactive_user_permissions(client, db_session, test_inactive_user):
     """Test that inactive users have no permissions regardless of roles."""
@@ -0,0 +1,80 @@
+"""Tests for the pull-mode claim queue (POST /api/fuel-orders/claim-next)."""
+
+from datetime import datetime, timedelta
+
+from src.models import FuelOrder, FuelOrderStatus, FuelTruck
+from src.services.fuel_order_service import FuelOrderService
+
+
+def _queued_order(db, aircraft, minutes_ago, fuel_type='Jet-A', amount=100, truck_id=None):
+    order = FuelOrder(tail_number=aircraft.tail_number, fuel_type=fuel_type, requested_amount=amount,
+                      assigned_truck_id=truck_id, created_at=datetime.utcnow() - timedelta(minutes=minutes_ago))
+    db.session.add(order)
+    db.session.commit()
+    return order
+
+
+def _clear_queue(db):
+    FuelOrder.query.filter(FuelOrder.status == FuelOrderStatus.DISPATCHED,
+                           FuelOrder.assigned_lst_user_id.is_(None)).delete()
+    db.session.commit()
+
+
+def test_claim_takes_oldest_unassigned_order(app, db, test_aircraft, test_lst_user):
+    _clear_queue(db)
+    newer = _queued_order(db, test_aircraft, minutes_ago=5)
+    older = _queued_order(db, test_aircraft, minutes_ago=10)
+
+    order, _, status = FuelOrderService.claim_next_order(test_lst_user)
+    assert status == 200
+    assert order.id == older.id
+    assert order.assigned_lst_user_id == test_lst_user.id
+    assert order.status == FuelOrderStatus.ACKNOWLEDGED
+    assert order.acknowledge_timestamp is not None
+
+    order, _, _ = FuelOrderService.claim_next_order(test_lst_user)
+    assert order.id == newer.id
+    order, message, status = FuelOrderService.claim_next_order(test_lst_user)
+    assert (order, status) == (None, 200)
+
+
+def test_claim_with_truck_only_takes_compatible_orders(app, db, test_aircraft, test_lst_user):
+    _clear_queue(db)
+    truck = FuelTruck(truck_number='CLAIM-1', fuel_type='100LL', capacity=500, current_meter_reading=0)
+    db.session.add(truck)
+    db.session.commit()
+    _queued_order(db, test_aircraft, minutes_ago=30, fuel_type='Jet-A')
+    _queued_order(db, test_aircraft, minutes_ago=20, fuel_type='100LL', amount=800)
+    fits = _queued_order(db, test_aircraft, minutes_ago=10, fuel_type='100ll', amount=400)
+
+    order, _, status = FuelOrderService.claim_next_order(test_lst_user, truck_id=truck.id)
+    assert status == 200
+    assert order.id == fits.id
+    assert order.assigned_truck_id == truck.id
+
+    order, _, status = FuelOrderService.claim_next_order(test_lst_user, fuel_type='jet-a')
+    assert order.fuel_type == 'Jet-A'
+
+
+def test_claim_rejects_unknown_truck(app, db, test_lst_user):
+    order, _, status = FuelOrderService.claim_next_order(test_lst_user, truck_id=999999)
+    assert (order, status) == (None, 400)
+
+
+def test_claim_respects_active_order_limit(app, db, test_aircraft, test_lst_user):
+    _clear_queue(db)
+    _queued_order(db, test_aircraft, minutes_ago=1)
+    app.config['DISPATCH_MAX_ACTIVE_ORDERS_PER_LST'] = 0
+    try:
+        order, _, status = FuelOrderService.claim_next_order(test_lst_user)
+    finally:
+        app.config['DISPATCH_MAX_ACTIVE_ORDERS_PER_LST'] = 8
+    assert (order, status) == (None, 409)
+
+
+def test_optimizer_leaves_queued_orders_alone(app, db, test_aircraft):
+    _clear_queue(db)
+    queued = _queued_order(db, test_aircraft, minutes_ago=1)
+    result, _, status = FuelOrderService.optimize_assignments(dry_run=True)
+    assert status == 200
+    assert queued.id not in [entry['order_id'] for entry in result['plan']]
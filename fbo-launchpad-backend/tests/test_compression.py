@@ -0,0 +1,98 @@
+"""Tests for response compression."""
+
+import gzip
+import json
+
+import brotli
+from flask import Flask, Response, request, stream_with_context
+from src.utils.compression import Compression
+
+ORDERS = [{'id': i, 'tail_number': f'N{i:03d}AB', 'status': 'DISPATCHED', 'csr_notes': 'Top off mains'}
+          for i in range(200)]
+
+
+def _compressed_app(**config):
+    app = Flask(__name__)
+    app.config.update(COMPRESS_MIMETYPES=['application/json', 'text/csv'], COMPRESS_MIN_SIZE=1024, **config)
+    Compression().init_app(app)
+
+    @app.route('/orders')
+    def orders():
+        response = app.json.response({'orders': ORDERS})
+        response.set_etag('orders-1')
+        if request.if_none_match.contains_weak('orders-1'):
+            return Response(status=304)
+        return response
+
+    @app.route('/small')
+    def small():
+        return {'orders': ORDERS[:1]}
+
+    @app.route('/export')
+    def export():
+        def rows():
+            for order in ORDERS:
+                yield f"{order['id']},{order['tail_number']},{order['status']}\n"
+        return Response(stream_with_context(rows()), mimetype='text/csv')
+
+    @app.route('/page')
+    def page():
+        return 'x' * 4096, 200, {'Content-Type': 'image/svg+xml'}
+
+    return app
+
+
+def test_prefers_brotli_and_honours_quality_values():
+    client = _compressed_app().test_client()
+
+    response = client.get('/orders', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(response.data)) == {'orders': ORDERS}
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    response = client.get('/orders', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data)) == {'orders': ORDERS}
+
+    response = client.get('/orders')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_small_and_excluded_responses_are_not_compressed():
+    client = _compressed_app().test_client()
+    headers = {'Accept-Encoding': 'gzip, br'}
+
+    small = client.get('/small', headers=headers)
+    assert 'Content-Encoding' not in small.headers
+    assert 'Vary' not in small.headers
+    assert 'Content-Encoding' not in client.get('/page', headers=headers).headers
+    assert 'Content-Encoding' not in client.head('/orders', headers=headers).headers
+
+
+def test_streamed_responses_are_compressed_incrementally():
+    client = _compressed_app().test_client()
+
+    response = client.get('/export', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    body = b''.join(response.response)
+    response.close()
+    expected = ''.join(f"{o['id']},{o['tail_number']},{o['status']}\n" for o in ORDERS)
+    assert gzip.decompress(body).decode() == expected
+
+
+def test_etag_is_weakened_and_still_revalidates():
+    client = _compressed_app().test_client()
+
+    response = client.get('/orders', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['ETag'] == 'W/"orders-1"'
+    revalidated = client.get('/orders', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert 'Content-Encoding' not in revalidated.headers
+
+
+def test_disabled_by_config():
+    client = _compressed_app(COMPRESS_ENABLED=False).test_client()
+    assert 'Content-Encoding' not in client.get('/orders', headers={'Accept-Encoding': 'gzip'}).headers
@@ -0,0 +1,77 @@
+"""Tests for the connection pool settings and pool telemetry."""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from src.config import DevelopmentConfig, ProductionConfig
+from src.utils.db_pool import InstrumentedNullPool, InstrumentedQueuePool, engine_options, pool_stats, replica_bind
+
+
+def _config(cls, **overrides):
+    config = {k: getattr(cls, k) for k in dir(cls) if k.isupper()}
+    config.update(overrides)
+    return config
+
+
+def test_engine_options_per_environment():
+    production = engine_options(_config(ProductionConfig, SQLALCHEMY_DATABASE_URI='postgresql://u:p@db/fbo'))
+    assert production['poolclass'] is InstrumentedQueuePool
+    assert production['pool_size'] == ProductionConfig.DB_POOL_SIZE
+    assert production['max_overflow'] == ProductionConfig.DB_MAX_OVERFLOW
+    assert production['pool_pre_ping'] is True
+    assert production['connect_args'] == {'options': f'-c statement_timeout={ProductionConfig.DB_STATEMENT_TIMEOUT_MS}'}
+
+    development = engine_options(_config(DevelopmentConfig, SQLALCHEMY_DATABASE_URI='postgresql://u:p@db/fbo'))
+    assert development['pool_size'] < production['pool_size']
+    assert 'connect_args' not in development
+
+    # PgBouncer owns the pool and rejects startup options
+    pgbouncer = engine_options(_config(ProductionConfig, SQLALCHEMY_DATABASE_URI='postgresql://u:p@pgbouncer/fbo',
+                                       DB_PGBOUNCER=True))
+    assert pgbouncer == {'poolclass': InstrumentedNullPool, 'pool_pre_ping': False}
+
+    assert engine_options(_config(ProductionConfig, SQLALCHEMY_DATABASE_URI='sqlite:///:memory:')) == {}
+
+
+def test_replica_bind_fails_fast():
+    bind = replica_bind(_config(ProductionConfig), 'postgresql://u:p@replica/fbo')
+    assert bind['url'] == 'postgresql://u:p@replica/fbo'
+    assert bind['connect_args'] == {'connect_timeout': 2, 'options': '-c statement_timeout=10000'}
+    assert replica_bind(_config(ProductionConfig), 'sqlite:///replica.db') == {'url': 'sqlite:///replica.db'}
+
+
+def test_checkout_waits_and_timeouts_are_recorded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.2)
+    attached = pool_stats._engine
+    pool_stats.reset()
+    pool_stats.attach(engine)
+    try:
+        held = engine.connect()
+        released = threading.Timer(0.05, held.close)
+        released.start()
+        # Waits for the only connection until the timer returns it
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        released.join()
+
+        snapshot = pool_stats.snapshot(engine, workers=4)
+        assert snapshot['checkouts'] == 2
+        assert snapshot['connects'] == 1
+        assert snapshot['timeouts'] == 1
+        assert snapshot['wait_ms']['samples'] == 2
+        assert snapshot['wait_ms']['max'] >= 40
+        assert snapshot['slow_waits'] == 1
+        assert snapshot['capacity'] == {'workers': 4, 'connections_per_worker': 1, 'max_connections': 4}
+    finally:
+        pool_stats._engine = attached
+        pool_stats.reset()
+        engine.dispose()
+
+
+def test_pool_stats_endpoint(client, auth_headers):
+    response = client.get('/api/admin/db/pool', headers=auth_headers['csr'])
+    assert response.status_code == 403
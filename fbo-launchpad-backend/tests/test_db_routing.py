@@ -0,0 +1,116 @@
+"""Tests for routing reads to the read replica."""
+
+import threading
+import time
+
+import pytest
+from flask import Flask, g
+from flask_sqlalchemy import SQLAlchemy
+from src.utils.db_routing import RoutingSession, read_only, replica_router, use_primary, use_replica
+from src.utils.invalidation import InvalidationEvent
+
+routed_db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+class Item(routed_db.Model):
+    __tablename__ = 'routing_items'
+    id = routed_db.Column(routed_db.Integer, primary_key=True)
+    source = routed_db.Column(routed_db.String(20), nullable=False)
+
+
+@pytest.fixture
+def routed_app(tmp_path, monkeypatch):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config['SQLALCHEMY_BINDS'] = {'replica': f"sqlite:///{tmp_path / 'replica.db'}"}
+    routed_db.init_app(app)
+    app.before_request(replica_router._mark_read_only_request)
+    with app.app_context():
+        for name, engine in (('primary', routed_db.engine), ('replica', routed_db.engines['replica'])):
+            routed_db.metadata.create_all(engine)
+            with engine.begin() as conn:
+                conn.execute(Item.__table__.insert(), {'id': 1, 'source': name})
+        monkeypatch.setattr(replica_router, '_engine', routed_db.engines['replica'])
+    monkeypatch.setattr(replica_router, '_lag', None)
+    monkeypatch.setattr(replica_router, '_checked_at', 0.0)
+    monkeypatch.setattr(replica_router, '_recent_writes', {})
+    monkeypatch.setattr(replica_router, 'max_lag', 5.0)
+    yield app
+    with app.app_context():
+        routed_db.engine.dispose()
+        routed_db.engines['replica'].dispose()
+
+
+def _source():
+    return routed_db.session.get(Item, 1, populate_existing=True).source
+
+
+def test_get_requests_read_from_the_replica(routed_app):
+    with routed_app.test_request_context('/items', method='GET'):
+        routed_app.preprocess_request()
+        assert _source() == 'replica'
+        with use_primary():
+            assert _source() == 'primary'
+    with routed_app.test_request_context('/items', method='POST'):
+        routed_app.preprocess_request()
+        assert _source() == 'primary'
+    with routed_app.app_context():
+        assert _source() == 'primary'
+        # Read-only service methods may use the replica anywhere
+        assert read_only(_source)() == 'replica'
+
+
+def test_writes_and_later_reads_use_the_primary(routed_app):
+    with routed_app.app_context(), use_replica():
+        locked = routed_db.session.execute(routed_db.select(Item.source).with_for_update()).scalar_one()
+        assert locked == 'primary'
+        routed_db.session.add(Item(id=2, source='new'))
+        routed_db.session.flush()
+        # Reads after a write in the same session must see it
+        assert routed_db.session.get(Item, 2).source == 'new'
+        assert _source() == 'primary'
+        routed_db.session.rollback()
+
+
+def test_recent_writer_reads_from_the_primary(routed_app):
+    with routed_app.test_request_context('/items', method='GET'):
+        routed_app.preprocess_request()
+        g.current_user = routed_db.session.get(Item, 1)
+        replica_router.note_write(InvalidationEvent('primary_write', '1', 'other-worker', 1, 0.0, True))
+        assert _source() == 'primary'
+        replica_router._recent_writes.clear()
+        assert _source() == 'replica'
+
+
+@pytest.mark.parametrize('lag', [None, 60.0])
+def test_lagging_or_unreachable_replica_falls_back_to_the_primary(routed_app, monkeypatch, lag):
+    monkeypatch.setattr(replica_router, 'probe_lag', lambda: lag)
+    fallbacks = replica_router.lag_fallbacks
+    with routed_app.app_context(), use_replica():
+        assert _source() == 'primary'
+    assert replica_router.lag_fallbacks == fallbacks + 1
+
+
+def test_slow_lag_probe_does_not_block_routing(routed_app, monkeypatch):
+    probing, release = threading.Event(), threading.Event()
+
+    def hung_probe():
+        probing.set()
+        release.wait(5)
+        return 0.0
+
+    monkeypatch.setattr(replica_router, 'probe_lag', hung_probe)
+    prober = threading.Thread(target=replica_router.replica_lag)
+    prober.start()
+    try:
+        assert probing.wait(5)
+        started = time.perf_counter()
+        replica_router.note_write(InvalidationEvent('primary_write', '3', 'other-worker', 1, 0.0, True))
+        assert replica_router._wrote_recently(3)
+        # Other threads keep the last known lag instead of waiting for the probe
+        assert replica_router.replica_lag() is None
+        assert time.perf_counter() - started < 0.5
+    finally:
+        release.set()
+        prober.join()
+    assert replica_router._lag == 0.0
@@ -0,0 +1,47 @@
+"""Tests for sparse fieldsets (?fields=) on list endpoints."""
+
+import pytest
+from flask import json
+from sqlalchemy import select
+from src.models.fuel_order import FuelOrder
+from src.utils.fieldsets import parse_fields, load_only_fields, serialize_fields
+
+ALLOWED = {'id': lambda o: o['id'], 'status': lambda o: o['status'], 'tail_number': lambda o: o['tail']}
+
+def test_parse_fields_absent():
+    assert parse_fields(None, ALLOWED) is None
+    assert parse_fields('', ALLOWED) is None
+    assert parse_fields(' , ', ALLOWED) is None
+
+def test_parse_fields_keeps_order_and_dedupes():
+    assert parse_fields('status, id,status', ALLOWED) == ['status', 'id']
+
+def test_parse_fields_rejects_unknown():
+    with pytest.raises(ValueError) as exc:
+        parse_fields('id,password_hash', ALLOWED)
+    assert 'password_hash' in str(exc.value)
+
+def test_load_only_fields_selects_requested_columns():
+    stmt = select(FuelOrder).options(load_only_fields(FuelOrder, ['status', 'calculated_gallons_dispensed'], {
+        'calculated_gallons_dispensed': ('start_meter_reading', 'end_meter_reading'),
+    }))
+    sql = str(stmt.compile())
+    assert 'fuel_orders.id' in sql
+    assert 'fuel_orders.status' in sql
+    assert 'fuel_orders.start_meter_reading' in sql
+    assert 'fuel_orders.csr_notes' not in sql
+    assert 'fuel_orders.lst_notes' not in sql
+
+def test_serialize_fields():
+    row = {'id': 1, 'status': 'Dispatched', 'tail': 'N1'}
+    assert serialize_fields(row, ['tail_number'], ALLOWED) == {'tail_number': 'N1'}
+
+def test_fuel_order_list_fields(client, auth_headers):
+    """GET /api/fuel-orders?fields= returns only the requested keys."""
+    response = client.get('/api/fuel-orders?fields=id,status', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    for order in json.loads(response.data)['orders']:
+        assert set(order.keys()) == {'id', 'status'}
+
+    response = client.get('/api/fuel-orders?fields=id,password_hash', headers=auth_headers['admin'])
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+"""Tests for archiving reviewed fuel orders and restoring them."""
+
+import glob
+import json
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.models import FuelOrder, FuelOrderStatus
+from src.services.fuel_order_archive_service import _decode_row, _dump_line, _encode_row, _read_archive
+
+
+def test_row_round_trip():
+    row = {
+        'id': 7,
+        'status': FuelOrderStatus.REVIEWED,
+        'requested_amount': Decimal('125.50'),
+        'created_at': datetime(2025, 3, 4, 5, 6, 7),
+        'csr_notes': None,
+    }
+    assert _decode_row(json.loads(_dump_line(row))) == row
+    assert _encode_row(row)['status'] == 'REVIEWED'
+
+
+def test_archive_and_restore(app, db, runner, test_aircraft, tmp_path):
+    """Old REVIEWED orders move to verified archive files and can be restored."""
+    created_at = datetime.utcnow() - timedelta(days=400)
+    orders = [
+        FuelOrder(tail_number=test_aircraft.tail_number, fuel_type='Jet-A', status=status, created_at=created_at)
+        for status in (FuelOrderStatus.REVIEWED, FuelOrderStatus.REVIEWED, FuelOrderStatus.COMPLETED)
+    ]
+    db.session.add_all(orders)
+    db.session.commit()
+    archived_ids = {orders[0].id, orders[1].id}
+
+    result = runner.invoke(args=['orders', 'archive', '--older-than', '180d', '--archive-dir', str(tmp_path), '--batch-size', '1'])
+    assert result.exit_code == 0, result.output
+    assert FuelOrder.query.filter(FuelOrder.id.in_(archived_ids)).count() == 0
+    assert db.session.get(FuelOrder, orders[2].id) is not None
+
+    manifests = glob.glob(os.path.join(str(tmp_path), '*', '*.manifest.json'))
+    assert manifests
+    rows = 0
+    for manifest_path in manifests:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        path = os.path.join(os.path.dirname(manifest_path), manifest['file'])
+        assert _read_archive(path) == (manifest['rows'], manifest['sha256'])
+        rows += manifest['rows']
+    assert rows >= len(archived_ids)
+
+    day = created_at.date()
+    result = runner.invoke(args=['orders', 'restore', '--from', str(day), '--to', str(day + timedelta(days=1)),
+                                 '--archive-dir', str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert FuelOrder.query.filter(FuelOrder.id.in_(archived_ids)).count() == len(archived_ids)
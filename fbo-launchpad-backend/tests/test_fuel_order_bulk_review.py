@@ -0,0 +1,39 @@
+"""Tests for PATCH /api/fuel-orders/review (bulk review)."""
+
+from src.models import FuelOrder, FuelOrderStatus
+
+
+def _order(db, aircraft, status):
+    order = FuelOrder(tail_number=aircraft.tail_number, fuel_type='Jet-A', status=status)
+    db.session.add(order)
+    db.session.commit()
+    return order
+
+
+def test_bulk_review_by_ids(client, db, auth_headers, test_aircraft, test_csr_user):
+    completed = [_order(db, test_aircraft, FuelOrderStatus.COMPLETED) for _ in range(2)]
+    fueling = _order(db, test_aircraft, FuelOrderStatus.FUELING)
+    ids = [o.id for o in completed] + [fueling.id, 999999]
+
+    response = client.patch('/api/fuel-orders/review', headers=auth_headers['csr'], json={'order_ids': ids})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['reviewed'] == sorted(o.id for o in completed)
+    assert [s['id'] for s in data['skipped']] == [fueling.id, 999999]
+
+    for order in completed:
+        db.session.refresh(order)
+        assert order.status == FuelOrderStatus.REVIEWED
+        assert order.reviewed_by_csr_user_id == test_csr_user.id
+        assert order.reviewed_timestamp is not None
+    db.session.refresh(fueling)
+    assert fueling.status == FuelOrderStatus.FUELING
+
+
+def test_bulk_review_rejects_bad_requests(client, auth_headers):
+    response = client.patch('/api/fuel-orders/review', headers=auth_headers['csr'], json={})
+    assert response.status_code == 400
+    response = client.patch('/api/fuel-orders/review', headers=auth_headers['csr'], json={'order_ids': ['1']})
+    assert response.status_code == 400
+    response = client.patch('/api/fuel-orders/review', headers=auth_headers['lst'], json={'order_ids': [1]})
+    assert response.status_code == 403
@@ -0,0 +1,110 @@
+"""Tests for monthly fuel_orders partitioning and date-bounded order queries."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask, json
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+from src.models.fuel_order import FuelOrder, FuelOrderStatus
+from src.models.fuel_order_partitioning import (
+    _ensure_partition_before_insert, _known_months, add_months, ensure_partitions, month_start, partition_name
+)
+from src.services.fuel_order_service import FuelOrderService
+
+
+def test_month_helpers():
+    start = month_start(datetime(2026, 11, 17, 8, 30))
+    assert start == datetime(2026, 11, 1)
+    assert add_months(start, 2) == datetime(2027, 1, 1)
+    assert add_months(start, -11) == datetime(2025, 12, 1)
+    assert partition_name(datetime(2027, 1, 5)) == 'fuel_orders_p2027_01'
+
+
+def test_create_table_is_partitioned_on_postgres_only():
+    pg = str(CreateTable(FuelOrder.__table__).compile(dialect=postgresql.dialect()))
+    assert 'PRIMARY KEY (id, created_at)' in pg
+    assert 'PARTITION BY RANGE (created_at)' in pg
+
+    lite = str(CreateTable(FuelOrder.__table__).compile(dialect=sqlite.dialect()))
+    assert 'PRIMARY KEY (id)' in lite
+    assert 'PARTITION' not in lite
+
+
+def test_ensure_partitions_is_noop_on_sqlite():
+    with create_engine('sqlite://').connect() as connection:
+        assert ensure_partitions(connection, datetime.utcnow(), 3) == []
+
+
+def test_active_window_only_drops_old_finished_orders():
+    app = Flask(__name__)
+    app.config['FUEL_ORDER_ACTIVE_WINDOW_DAYS'] = 30
+    with app.app_context():
+        assert FuelOrderService._get_date_bounds({}) == (None, None)
+        window = str(FuelOrderService._active_window({}).compile())
+        assert 'status NOT IN' in window and 'created_at >=' in window
+        # Queries limited to finished orders get a plain bound that prunes partitions
+        window = str(FuelOrderService._active_window({}, [FuelOrderStatus.COMPLETED]).compile())
+        assert 'status' not in window and 'created_at >=' in window
+        assert FuelOrderService._active_window({}, [FuelOrderStatus.DISPATCHED]) is None
+        assert FuelOrderService._active_window({'window': 'all'}) is None
+        assert FuelOrderService._active_window({'date_from': '2026-01-01'}) is None
+
+
+def test_fuel_order_list_keeps_old_open_orders(client, db, auth_headers, test_aircraft):
+    old = datetime.utcnow() - timedelta(days=400)
+    open_order, finished_order = (
+        FuelOrder(tail_number=test_aircraft.tail_number, fuel_type='Jet-A', status=status, created_at=old)
+        for status in (FuelOrderStatus.DISPATCHED, FuelOrderStatus.COMPLETED)
+    )
+    db.session.add_all([open_order, finished_order])
+    db.session.commit()
+
+    def listed_ids(query=''):
+        response = client.get(f'/api/fuel-orders?per_page=100{query}', headers=auth_headers['admin'])
+        assert response.status_code == 200
+        return {order['id'] for order in json.loads(response.data)['orders']}
+
+    ids = listed_ids()
+    assert open_order.id in ids
+    assert finished_order.id not in ids
+    assert finished_order.id in listed_ids('&window=all')
+    assert open_order.id in listed_ids('&status=DISPATCHED')
+    assert finished_order.id not in listed_ids('&status=COMPLETED')
+
+
+def test_date_bounds_explicit_range():
+    assert FuelOrderService._get_date_bounds({'date_from': '2026-01-01', 'date_to': '2026-01-31'}) == (
+        datetime(2026, 1, 1), datetime(2026, 2, 1)
+    )
+    with pytest.raises(ValueError):
+        FuelOrderService._get_date_bounds({'date_from': 'yesterday'})
+
+
+def test_fuel_order_list_date_range(client, auth_headers):
+    """GET /api/fuel-orders honours date_from/date_to and rejects bad dates."""
+    response = client.get('/api/fuel-orders?date_from=2000-01-01', headers=auth_headers['admin'])
+    assert response.status_code == 200
+
+    response = client.get('/api/fuel-orders?date_from=not-a-date', headers=auth_headers['admin'])
+    assert response.status_code == 400
+    assert 'date_from' in json.loads(response.data)['error']
+
+
+def test_failed_partition_check_keeps_the_insert_transaction(monkeypatch):
+    engine = create_engine('sqlite://')
+    with engine.connect() as connection:
+        connection.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        connection.commit()
+        transaction = connection.begin()
+        connection.exec_driver_sql("INSERT INTO t VALUES (1)")
+        # Make the listener run; SQLite has no fuel_orders_ensure_partition so the call fails
+        monkeypatch.setattr(connection.dialect, 'name', 'postgresql')
+        order = FuelOrder(created_at=datetime(2001, 2, 3))
+        _ensure_partition_before_insert(None, connection, order)
+        monkeypatch.undo()
+        connection.exec_driver_sql("INSERT INTO t VALUES (2)")
+        transaction.commit()
+        assert connection.exec_driver_sql("SELECT count(*) FROM t").scalar() == 2
+    assert (2001, 2) not in _known_months
@@ -0,0 +1,43 @@
+"""Tests for full-text fuel order search."""
+
+import pytest
+from flask import json
+from src.models.fuel_order import FuelOrder
+
+@pytest.fixture
+def searchable_orders(db, test_aircraft, test_fuel_truck, test_lst_user):
+    orders = [
+        FuelOrder(tail_number=test_aircraft.tail_number, fuel_type='Jet-A',
+                  assigned_lst_user_id=test_lst_user.id, assigned_truck_id=test_fuel_truck.id,
+                  lst_notes='Fuel cap was stuck, reported issue to CSR'),
+        FuelOrder(tail_number=test_aircraft.tail_number, fuel_type='Jet-A',
+                  assigned_lst_user_id=test_lst_user.id, assigned_truck_id=test_fuel_truck.id,
+                  location_on_ramp='Gate 4', csr_notes='Quick turn requested'),
+    ]
+    db.session.add_all(orders)
+    db.session.commit()
+    yield orders
+    for order in orders:
+        db.session.delete(order)
+    db.session.commit()
+
+def test_search_requires_query(client, auth_headers):
+    response = client.get('/api/fuel-orders/search', headers=auth_headers['admin'])
+    assert response.status_code == 400
+
+def test_search_matches_notes(client, auth_headers, searchable_orders):
+    response = client.get('/api/fuel-orders/search?q=fuel cap issues', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [o['id'] for o in data['orders']] == [searchable_orders[0].id]
+    assert data['pagination']['total'] == 1
+
+def test_search_matches_location(client, auth_headers, searchable_orders):
+    response = client.get('/api/fuel-orders/search?q=gate&fields=id,location_on_ramp', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    orders = json.loads(response.data)['orders']
+    assert orders == [{'id': searchable_orders[1].id, 'location_on_ramp': 'Gate 4'}]
+
+def test_search_query_syntax_is_escaped(client, auth_headers):
+    response = client.get('/api/fuel-orders/search?q="OR NOT', headers=auth_headers['admin'])
+    assert response.status_code == 200
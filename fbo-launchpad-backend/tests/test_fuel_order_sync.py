@@ -0,0 +1,61 @@
+"""Tests for POST /api/fuel-orders/sync (offline batch of LST status changes)."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from src.models import FuelOrder, FuelOrderStatus
+from src.services.fuel_order_service import FuelOrderService
+
+
+def test_parse_client_timestamp_normalizes_to_utc():
+    assert FuelOrderService._parse_client_timestamp('2026-10-19T12:00:00+02:00') == datetime(2026, 10, 19, 10, 0)
+    assert FuelOrderService._parse_client_timestamp('2026-10-19T10:00:00Z') == datetime(2026, 10, 19, 10, 0)
+    with pytest.raises(ValueError):
+        FuelOrderService._parse_client_timestamp('yesterday')
+
+
+def test_parse_meter_readings():
+    assert FuelOrderService._parse_meter_readings({'start_meter_reading': '10', 'end_meter_reading': 12.5}) == (
+        Decimal('10'), Decimal('12.5'), None
+    )
+    assert FuelOrderService._parse_meter_readings({'start_meter_reading': '10', 'end_meter_reading': '9'})[2]
+    assert FuelOrderService._parse_meter_readings({'start_meter_reading': 'NaN', 'end_meter_reading': '9'})[2]
+
+
+def test_sync_applies_queued_transitions(client, db, auth_headers, test_aircraft, test_lst_user):
+    dispatched_at = datetime.utcnow() - timedelta(hours=1)
+    order = FuelOrder(tail_number=test_aircraft.tail_number, fuel_type='Jet-A', status=FuelOrderStatus.DISPATCHED,
+                      assigned_lst_user_id=test_lst_user.id, dispatch_timestamp=dispatched_at)
+    db.session.add(order)
+    db.session.commit()
+    at = lambda minutes: (dispatched_at + timedelta(minutes=minutes)).isoformat()
+
+    items = [
+        {'order_id': order.id, 'status': 'ACKNOWLEDGED', 'timestamp': at(1)},
+        {'order_id': order.id, 'status': 'EN_ROUTE', 'timestamp': at(2)},
+        {'order_id': order.id, 'status': 'EN_ROUTE', 'timestamp': at(3)},
+        {'order_id': 999999, 'status': 'ACKNOWLEDGED', 'timestamp': at(1)},
+    ]
+    response = client.post('/api/fuel-orders/sync', headers=auth_headers['lst'], json={'items': items})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [r['result'] for r in data['results']] == ['applied', 'applied', 'conflict', 'rejected']
+
+    db.session.refresh(order)
+    assert order.status == FuelOrderStatus.EN_ROUTE
+    assert order.acknowledge_timestamp == dispatched_at + timedelta(minutes=1)
+    assert order.en_route_timestamp == dispatched_at + timedelta(minutes=2)
+
+
+def test_sync_rejects_empty_batch(client, auth_headers):
+    response = client.post('/api/fuel-orders/sync', headers=auth_headers['lst'], json={'items': []})
+    assert response.status_code == 400
+
+
+def test_sync_rejects_malformed_order_ids(client, auth_headers):
+    items = [{'order_id': [1], 'status': 'ACKNOWLEDGED'}, {'order_id': {}, 'status': 'ACKNOWLEDGED'},
+             {'order_id': True, 'status': 'ACKNOWLEDGED'}, {'order_id': '7', 'status': 'ACKNOWLEDGED'}]
+    response = client.post('/api/fuel-orders/sync', headers=auth_headers['lst'], json={'items': items})
+    assert response.status_code == 200
+    assert [r['result'] for r in response.get_json()['results']] == ['rejected'] * 4
@@ -0,0 +1,53 @@
+"""Boots the production gunicorn profile (gunicorn.conf.py)."""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+pytest.importorskip('gunicorn')
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_boots_with_preload_when_metrics_dir_does_not_exist(tmp_path):
+    metrics_dir = tmp_path / 'metrics'
+    port = _free_port()
+    env = {
+        **os.environ,
+        'PROMETHEUS_MULTIPROC_DIR': str(metrics_dir),
+        'FLASK_ENV': 'testing',
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}",
+        'WEB_CONCURRENCY': '2',
+        'GUNICORN_BIND': f'127.0.0.1:{port}',
+        'GUNICORN_PRELOAD': 'true',
+    }
+    env.pop('FBO_METRICS_DIR_OWNER', None)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'src.app:create_app()'],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            assert server.poll() is None, server.stdout.read().decode()
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=2) as response:
+                    assert response.status == 200
+                    break
+            except OSError:
+                assert time.monotonic() < deadline, 'gunicorn did not start serving'
+                time.sleep(0.2)
+        # The master's files survive startup next to the workers'
+        assert any(name.endswith(f'_{server.pid}.db') for name in os.listdir(metrics_dir))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
@@ -0,0 +1,64 @@
+"""Tests for Idempotency-Key handling on mutating fuel order endpoints."""
+
+import threading
+from datetime import datetime, timedelta
+
+from src.models import FuelOrder
+from src.utils.idempotency import IdempotencyStore, StoredResponse
+
+
+def _stored(expires_in=60):
+    return StoredResponse('hash', 201, b'{}', 'application/json', datetime.utcnow() + timedelta(seconds=expires_in))
+
+
+def test_store_lru_eviction_and_expiry():
+    store = IdempotencyStore(maxsize=2)
+    store.put((1, 'a'), _stored())
+    store.put((1, 'b'), _stored())
+    store.get((1, 'a'))  # a is now most recently used
+    store.put((1, 'c'), _stored())
+    assert store.get((1, 'b')) is None
+    assert store.get((1, 'a')) is not None
+
+    store.put((1, 'old'), _stored(expires_in=-1))
+    assert store.get((1, 'old')) is None
+
+
+def test_store_collapses_in_flight_duplicates():
+    store = IdempotencyStore()
+    event, owner = store.begin((1, 'k'))
+    assert owner
+    duplicate_event, duplicate_owner = store.begin((1, 'k'))
+    assert not duplicate_owner and duplicate_event is event
+
+    waiter = threading.Thread(target=event.wait)
+    waiter.start()
+    store.end((1, 'k'))
+    waiter.join(timeout=1)
+    assert not waiter.is_alive()
+    assert store.begin((1, 'k'))[1]
+
+
+def test_create_fuel_order_replays_with_same_key(client, db_session, auth_headers, test_aircraft, test_fuel_truck, test_lst_user):
+    """Retrying POST /api/fuel-orders with the same key creates one order."""
+    payload = {
+        'tail_number': test_aircraft.tail_number,
+        'fuel_type': 'Jet-A',
+        'requested_amount': 100,
+        'assigned_lst_user_id': test_lst_user.id,
+        'assigned_truck_id': test_fuel_truck.id,
+        'location_on_ramp': 'Ramp 1',
+    }
+    headers = dict(auth_headers['admin'], **{'Idempotency-Key': 'test-create-1'})
+    before = FuelOrder.query.count()
+
+    first = client.post('/api/fuel-orders', headers=headers, json=payload)
+    retry = client.post('/api/fuel-orders', headers=headers, json=payload)
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.headers.get('Idempotent-Replayed') == 'true'
+    assert retry.data == first.data
+    assert FuelOrder.query.count() == before + 1
+
+    reused = client.post('/api/fuel-orders', headers=headers, json=dict(payload, requested_amount=5))
+    assert reused.status_code == 422
@@ -0,0 +1,123 @@
+"""Tests for the cross-worker cache invalidation bus."""
+
+import time
+
+import pytest
+from src.utils.invalidation import (
+    ALL_ENTITIES,
+    InProcessBackend,
+    InProcessHub,
+    InvalidationBus,
+    PostgresBackend,
+    UnixSocketBackend,
+)
+
+
+def _workers(n, backend_factory):
+    buses = []
+    for _ in range(n):
+        bus = InvalidationBus()
+        bus.start(backend_factory())
+        buses.append(bus)
+    return buses
+
+
+def _recorder(bus, entity):
+    events = []
+    bus.subscribe(entity, events.append)
+    return events
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_in_process_delivery_and_lag_stats():
+    hub = InProcessHub()
+    a, b, c = _workers(3, lambda: InProcessBackend(hub))
+    seen = [_recorder(bus, 'aircraft') for bus in (a, b, c)]
+    other = _recorder(b, 'fuel_truck')
+
+    a.publish('aircraft', 'N123AB')
+
+    assert [(e.key, e.remote) for e in seen[0]] == [('N123AB', False)]
+    assert [(e.key, e.remote) for e in seen[1]] == [('N123AB', True)]
+    assert [(e.key, e.remote) for e in seen[2]] == [('N123AB', True)]
+    assert other == []
+    stats = b.stats()
+    assert stats['received'] == 1 and stats['lag_ms']['samples'] == 1
+    assert a.stats()['published'] == 1 and a.stats()['received'] == 0
+
+
+def test_sequence_gap_flushes_every_cache():
+    hub = InProcessHub()
+    a, b = _workers(2, lambda: InProcessBackend(hub))
+    aircraft, trucks = _recorder(b, 'aircraft'), _recorder(b, 'fuel_truck')
+
+    a.publish('aircraft')
+    hub.detach(b)
+    a.publish('aircraft')  # lost
+    hub.attach(b)
+    a.publish('aircraft')
+
+    assert [e.entity for e in trucks] == [ALL_ENTITIES]
+    assert [e.entity for e in aircraft] == ['aircraft', ALL_ENTITIES, 'aircraft']
+    assert b.stats()['flushes'] == 1
+
+
+def test_unix_socket_backend(tmp_path):
+    a, b = _workers(2, lambda: UnixSocketBackend(str(tmp_path)))
+    events = _recorder(b, 'permissions')
+    try:
+        # A socket left behind by a dead worker is removed on the next publish
+        stale = UnixSocketBackend(str(tmp_path))
+        dead = InvalidationBus(stale)
+        dead.start()
+        dead.stop()
+        (tmp_path / 'dead-worker.sock').touch()
+
+        a.publish('permissions', 7)
+        assert _wait_for(lambda: events)
+        assert events[0].key == '7' and events[0].remote
+        assert not (tmp_path / 'dead-worker.sock').exists()
+        assert b.stats()['lag_ms']['max'] < 1000
+    finally:
+        a.stop()
+        b.stop()
+
+
+def test_permission_cache_is_evicted_by_other_workers(app, test_csr_user):
+    from src.utils.invalidation import invalidation_bus
+    from src.utils.permission_cache import permission_cache
+
+    hub = InProcessHub()
+    invalidation_bus.start(InProcessBackend(hub))
+    other_worker = InvalidationBus()
+    other_worker.start(InProcessBackend(hub))
+    user = test_csr_user
+    with app.app_context():
+        cached = permission_cache.get(user.id)
+        other_worker.publish('permissions', user.id)
+        assert permission_cache.get(user.id) is not cached
+
+
+def test_postgres_backend(app):
+    from src.extensions import db
+
+    with app.app_context():
+        if db.engine.url.get_backend_name() != 'postgresql':
+            pytest.skip('LISTEN/NOTIFY needs PostgreSQL')
+        dsn = db.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+        a, b = _workers(2, lambda: PostgresBackend(dsn, 'test_cache_invalidation'))
+        events = _recorder(b, 'lst_shift')
+        try:
+            time.sleep(0.5)  # Let the listeners connect
+            a.publish('lst_shift', 3)
+            assert _wait_for(lambda: events, timeout=5)
+            assert events[0].key == '3'
+        finally:
+            a.stop()
+            b.stop()
@@ -0,0 +1,82 @@
+"""Tests for LST auto-assignment (assigned_lst_user_id=-1) on POST /api/fuel-orders."""
+
+import threading
+import time
+import uuid
+from collections import Counter
+
+import pytest
+from src.models import FuelOrder, Role, User
+from src.services.fuel_order_service import LST_ACTIVE_STATUSES
+
+CONCURRENT_DISPATCHES = 50
+
+
+def _order_payload(aircraft, truck):
+    return {'tail_number': aircraft.tail_number, 'fuel_type': 'Jet-A', 'requested_amount': 100,
+            'assigned_lst_user_id': -1, 'assigned_truck_id': truck.id}
+
+
+def _active_counts(lst_ids):
+    counts = Counter({lst_id: 0 for lst_id in lst_ids})
+    for order in FuelOrder.query.filter(FuelOrder.assigned_lst_user_id.in_(lst_ids),
+                                        FuelOrder.status.in_(LST_ACTIVE_STATUSES)):
+        counts[order.assigned_lst_user_id] += 1
+    return counts
+
+
+def test_auto_assign_picks_an_active_lst(client, db, auth_headers, test_aircraft, test_fuel_truck, test_lst_user):
+    response = client.post('/api/fuel-orders', headers=auth_headers['admin'],
+                           json=_order_payload(test_aircraft, test_fuel_truck))
+    assert response.status_code == 201
+    lst_ids = [u.id for u in User.query.filter(User.is_active == True,
+                                               User.roles.any(Role.name == 'Line Service Technician'))]
+    assert response.get_json()['fuel_order']['assigned_lst_user_id'] in lst_ids
+
+
+def test_concurrent_dispatches_are_balanced(app, db, auth_headers, test_aircraft, test_fuel_truck, test_lst_user):
+    if db.engine.url.database in (None, '', ':memory:'):
+        pytest.skip('needs a database that accepts concurrent connections')
+
+    lst_role = Role.query.filter_by(name='Line Service Technician').first()
+    for _ in range(4):
+        name = f'lst-{uuid.uuid4().hex[:8]}'
+        user = User(username=name, email=f'{name}@example.com', name=name, is_active=True)
+        user.set_password('password')
+        user.roles.append(lst_role)
+        db.session.add(user)
+    db.session.commit()
+    lst_ids = [u.id for u in User.query.filter(User.is_active == True, User.roles.any(Role.id == lst_role.id))]
+    before = _active_counts(lst_ids)
+
+    payload = _order_payload(test_aircraft, test_fuel_truck)
+    headers = auth_headers['admin']
+    start = threading.Barrier(CONCURRENT_DISPATCHES)
+    latencies, statuses = [], []
+
+    def dispatch():
+        with app.app_context():
+            client = app.test_client()
+            start.wait()
+            started = time.perf_counter()
+            response = client.post('/api/fuel-orders', headers=headers, json=payload)
+            latencies.append(time.perf_counter() - started)
+            statuses.append(response.status_code)
+            db.session.remove()
+
+    threads = [threading.Thread(target=dispatch) for _ in range(CONCURRENT_DISPATCHES)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [201] * CONCURRENT_DISPATCHES
+    db.session.expire_all()
+    after = _active_counts(lst_ids)
+    assert sum(after.values()) - sum(before.values()) == CONCURRENT_DISPATCHES
+    # Least-busy assignment never widens the gap between LSTs beyond one order
+    assert max(after.values()) - min(after.values()) <= max(max(before.values()) - min(before.values()), 1)
+
+    latencies.sort()
+    p99 = latencies[int(0.99 * (len(latencies) - 1))]
+    assert p99 < 2.0
@@ -0,0 +1,129 @@
+"""Tests for the LST shift roster and the on-shift interval index."""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.models import LSTShift
+from src.utils import shift_index
+from src.utils.shift_index import IntervalIndex, ShiftIndex
+
+BASE = datetime(2026, 1, 1)
+
+
+def _random_shifts(n, n_users=200, days=60, seed=9):
+    rng = random.Random(seed)
+    intervals = []
+    for _ in range(n):
+        start = BASE + timedelta(minutes=rng.randrange(days * 24 * 60))
+        intervals.append((start, start + timedelta(hours=rng.choice([4, 8, 10, 12])), rng.randrange(n_users)))
+    return intervals
+
+
+def _brute_force(intervals, point):
+    return sorted(iv for iv in intervals if iv[0] <= point < iv[1])
+
+
+def test_interval_index_matches_brute_force():
+    intervals = _random_shifts(2000)
+    # Shared endpoints and zero-length intervals
+    intervals += [(BASE, BASE + timedelta(hours=8), 1), (BASE, BASE + timedelta(hours=8), 2), (BASE, BASE, 3)]
+    index = IntervalIndex(intervals)
+    rng = random.Random(4)
+    points = [BASE + timedelta(minutes=rng.randrange(-600, 61 * 24 * 60)) for _ in range(500)]
+    points += [iv[0] for iv in intervals[:50]] + [iv[1] for iv in intervals[:50]]
+    for point in points:
+        assert sorted(index.stab(point)) == _brute_force(intervals, point)
+    assert len(index) == len(intervals) - 1
+
+
+def test_working_intervals_exclude_breaks():
+    shift = LSTShift(user_id=7, start_time=BASE, end_time=BASE + timedelta(hours=8), breaks=[
+        {'start': (BASE + timedelta(hours=6)).isoformat(), 'end': (BASE + timedelta(hours=6, minutes=30)).isoformat()},
+        {'start': (BASE + timedelta(hours=3)).isoformat(), 'end': (BASE + timedelta(hours=4)).isoformat()},
+    ])
+    assert shift.working_intervals() == [
+        (BASE, BASE + timedelta(hours=3)),
+        (BASE + timedelta(hours=4), BASE + timedelta(hours=6)),
+        (BASE + timedelta(hours=6, minutes=30), BASE + timedelta(hours=8)),
+    ]
+
+    index = ShiftIndex()
+    index.load([shift, LSTShift(user_id=8, start_time=BASE + timedelta(hours=2), end_time=BASE + timedelta(hours=10),
+                                breaks=[])])
+    assert index.on_shift(BASE + timedelta(hours=1)) == {7}
+    assert index.on_shift(BASE + timedelta(hours=3, minutes=30)) == {8}
+    assert index.on_shift(BASE + timedelta(hours=5)) == {7, 8}
+    assert index.on_shift(BASE + timedelta(hours=8)) == {8}
+
+
+def test_roster_is_in_use_until_the_last_shift_ends(monkeypatch):
+    now = datetime.utcnow()
+    assert not ShiftIndex().has_roster
+
+    index = ShiftIndex()
+    index.load([LSTShift(user_id=7, start_time=now - timedelta(hours=8), end_time=now + timedelta(minutes=1),
+                         breaks=[])])
+    assert index.has_roster
+
+    class AnHourLater(datetime):
+        @classmethod
+        def utcnow(cls):
+            return now + timedelta(hours=1)
+
+    # Not reloaded since: the shift has ended, and with it the roster
+    monkeypatch.setattr(shift_index, 'datetime', AnHourLater)
+    assert index.on_shift() == set()
+    assert not index.has_roster
+
+
+def test_benchmark_5000_shifts():
+    intervals = _random_shifts(5000)
+    started = time.perf_counter()
+    index = IntervalIndex(intervals)
+    build = time.perf_counter() - started
+
+    rng = random.Random(2)
+    points = [BASE + timedelta(minutes=rng.randrange(60 * 24 * 60)) for _ in range(2000)]
+    started = time.perf_counter()
+    for point in points:
+        index.stab(point)
+    indexed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for point in points[:200]:
+        _brute_force(intervals, point)
+    scan = (time.perf_counter() - started) * len(points) / 200
+
+    # A roster change rebuilds the whole index
+    assert build < 0.2
+    assert indexed < 0.2
+    assert indexed * 5 < scan
+
+
+def test_shift_roster_endpoints(client, db, auth_headers, test_lst_user):
+    start = datetime.utcnow().replace(microsecond=0) - timedelta(hours=1)
+    response = client.post('/api/lst-shifts', headers=auth_headers['admin'], json={
+        'user_id': test_lst_user.id,
+        'start_time': start.isoformat(),
+        'end_time': (start + timedelta(hours=8)).isoformat(),
+        'breaks': [{'start': (start + timedelta(hours=4)).isoformat(),
+                    'end': (start + timedelta(hours=5)).isoformat()}],
+    })
+    assert response.status_code == 201
+    shift_id = response.get_json()['shift']['id']
+
+    on_shift = client.get('/api/lst-shifts/on-shift', headers=auth_headers['admin']).get_json()
+    assert test_lst_user.id in [u['id'] for u in on_shift['users']]
+    on_break = client.get(f'/api/lst-shifts/on-shift?at={(start + timedelta(hours=4, minutes=30)).isoformat()}',
+                          headers=auth_headers['admin']).get_json()
+    assert test_lst_user.id not in [u['id'] for u in on_break['users']]
+
+    overlapping = client.post('/api/lst-shifts', headers=auth_headers['admin'], json={
+        'user_id': test_lst_user.id,
+        'start_time': (start + timedelta(hours=7)).isoformat(),
+        'end_time': (start + timedelta(hours=9)).isoformat(),
+    })
+    assert overlapping.status_code == 409
+
+    assert client.delete(f'/api/lst-shifts/{shift_id}', headers=auth_headers['admin']).status_code == 200
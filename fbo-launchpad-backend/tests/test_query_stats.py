@@ -0,0 +1,50 @@
+"""Tests for the per-request SQL instrumentation and the max_queries fixture."""
+
+import logging
+
+from flask import Response
+from sqlalchemy import create_engine, text
+from src.utils.query_stats import query_stats, statement_shape
+
+
+def test_statement_shape_collapses_literals_and_in_lists():
+    assert statement_shape('SELECT * FROM users WHERE id IN (?, ?, ?) AND name = ?') == \
+        statement_shape('SELECT *\n  FROM users WHERE id IN (?) AND name = ?') == \
+        'SELECT * FROM users WHERE id IN (?) AND name = ?'
+    assert statement_shape("SELECT 1 FROM roles WHERE id = %(id_1)s AND name = 'x'::text") == \
+        'SELECT ? FROM roles WHERE id = ? AND name = ?::text'
+
+
+def test_capture_and_slow_query_log(tmp_path, monkeypatch, caplog):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    query_stats.attach(engine)
+    monkeypatch.setattr(query_stats, 'slow_seconds', 0.0)
+    try:
+        with caplog.at_level(logging.WARNING, logger='src.utils.query_stats'), query_stats.capture() as outer:
+            with engine.connect() as conn, query_stats.capture() as inner:
+                conn.execute(text('SELECT 1'))
+            with engine.connect() as conn:
+                conn.execute(text('SELECT 2'))
+        assert inner == ['SELECT 1']
+        assert outer == ['SELECT 1', 'SELECT 2']
+        assert 'Slow query' in caplog.text and 'no request' in caplog.text
+    finally:
+        engine.dispose()
+
+
+def test_request_headers_and_query_limit(client, auth_headers, max_queries):
+    with max_queries(6) as statements:
+        response = client.get('/api/users?limit=30', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    assert response.headers['X-DB-Queries'] == str(len(statements))
+    assert response.headers['Server-Timing'].startswith('db;dur=')
+
+
+def test_repeated_statements_are_reported(app, db, caplog):
+    with app.test_request_context('/api/orders'), \
+            caplog.at_level(logging.WARNING, logger='src.utils.query_stats'):
+        for user_id in range(query_stats.repeat_threshold):
+            db.session.execute(text('SELECT id FROM users WHERE id = :id'), {'id': user_id})
+        query_stats._after_request(Response())
+    assert 'Possible N+1' in caplog.text
+    assert f'{query_stats.repeat_threshold} x SELECT id FROM users WHERE id = ?' in caplog.text
@@ -0,0 +1,128 @@
+"""Tests for ramp spots, the spatial index and nearest-truck lookups."""
+
+import math
+import random
+import time
+from types import SimpleNamespace
+
+from src.services.ramp_spot_service import RampSpotService
+from src.utils.spatial_index import GridIndex, RampIndex
+
+
+def _spot(spot_id, x, y, code=None, zone=None, is_active=True):
+    return SimpleNamespace(id=spot_id, code=code or f'S{spot_id}', zone=zone, x=x, y=y, is_active=is_active)
+
+
+def _truck(truck_id, x, y, fuel_type='Jet-A', capacity=3000, is_active=True):
+    return SimpleNamespace(id=truck_id, truck_number=f'T{truck_id}', fuel_type=fuel_type, capacity=capacity,
+                           is_active=is_active, last_x=x, last_y=y)
+
+
+def _random_points(n, seed=3, extent=3000.0):
+    rng = random.Random(seed)
+    return [(i, rng.uniform(0, extent), rng.uniform(0, extent)) for i in range(n)]
+
+
+def test_grid_nearest_matches_brute_force():
+    points = _random_points(500)
+    grid = GridIndex(cell_size=50)
+    for key, x, y in points:
+        grid.upsert(key, x, y, key % 3)
+    rng = random.Random(11)
+    for _ in range(200):
+        qx, qy = rng.uniform(-500, 3500), rng.uniform(-500, 3500)
+        expected = sorted((math.hypot(x - qx, y - qy), key) for key, x, y in points if key % 3 == 0)[:4]
+        found = grid.nearest(qx, qy, k=4, accept=lambda payload: payload == 0)
+        assert [(round(d, 9), key) for d, key, _ in found] == [(round(d, 9), key) for d, key in expected]
+
+
+def test_grid_moves_and_removes_points():
+    grid = GridIndex(cell_size=50)
+    grid.upsert(1, 0, 0, 'a')
+    grid.upsert(2, 1000, 1000, 'b')
+    assert grid.nearest(990, 990)[0][1] == 2
+    grid.upsert(2, -1000, -1000, 'b')
+    assert grid.nearest(990, 990)[0][1] == 1
+    grid.remove(1)
+    assert [key for _, key, _ in grid.nearest(990, 990, k=5)] == [2]
+    assert grid.nearest(0, 0, max_distance=100) == []
+
+
+def test_ramp_index_filters_trucks_by_fuel_and_capacity():
+    index = RampIndex()
+    index.load(
+        [_spot(1, 0, 0, code='A1'), _spot(2, 900, 900, is_active=False)],
+        [_truck(1, 10, 0, fuel_type='100LL'), _truck(2, 200, 0, capacity=500), _truck(3, 400, 0),
+         _truck(4, 5, 5, is_active=False), _truck(5, None, None)]
+    )
+    assert index.get_spot_by_code('a1').id == 1
+    assert index.get_spot(2) is None
+    assert [t['id'] for t in index.nearest_trucks(0, 0, 'jet-a', limit=5)] == [2, 3]
+    assert [t['id'] for t in index.nearest_trucks(0, 0, 'Jet-A', min_capacity=1000)] == [3]
+
+    index.upsert_truck(_truck(3, 1, 1))
+    assert index.nearest_trucks(0, 0, 'Jet-A')[0]['id'] == 3
+    index.upsert_truck(_truck(3, 1, 1, is_active=False))
+    assert [t['id'] for t in index.nearest_trucks(0, 0, 'Jet-A', limit=5)] == [2]
+
+
+def test_benchmark_1000_spots():
+    points = _random_points(1000)
+    index = RampIndex()
+    index.load([_spot(key, x, y) for key, x, y in points],
+               [_truck(key, x, y, fuel_type='Jet-A' if key % 2 else '100LL') for key, x, y in points[:100]])
+    rng = random.Random(5)
+    queries = [(rng.uniform(0, 3000), rng.uniform(0, 3000)) for _ in range(1000)]
+
+    started = time.perf_counter()
+    for qx, qy in queries:
+        index.nearest_spots(qx, qy, 3)
+        index.nearest_trucks(qx, qy, 'Jet-A', min_capacity=1000)
+    indexed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for qx, qy in queries:
+        sorted(points, key=lambda p: math.hypot(p[1] - qx, p[2] - qy))[:3]
+    scan = time.perf_counter() - started
+
+    # 2,000 lookups against 1,000 spots and 100 trucks
+    assert indexed < 0.5
+    assert indexed < scan
+
+
+def test_import_spots_validates_whole_file():
+    summary, message, status = RampSpotService.import_spots([
+        {'code': 'A1', 'x': 0, 'y': 0},
+        {'code': 'a1', 'x': 1, 'y': 1},
+        {'code': 'B1', 'x': 'north', 'y': 1},
+    ])
+    assert status == 400
+    assert 'row 2: duplicate code' in message and 'row 3' in message
+
+
+def test_import_spots_upserts_by_code(app, db, tmp_path):
+    path = tmp_path / 'spots.csv'
+    path.write_text('code,x,y,zone\nQ1,0,0,North\nQ2,50,0,North\n')
+    summary, _, status = RampSpotService.import_spots(RampSpotService.read_spot_map(str(path)))
+    assert status == 200 and summary['created'] == 2
+
+    path.write_text('code,x,y,zone\nq1,5,0,North\n')
+    summary, _, status = RampSpotService.import_spots(RampSpotService.read_spot_map(str(path)),
+                                                      deactivate_missing=True)
+    assert (summary['updated'], summary['deactivated']) == (1, 1)
+
+
+def test_nearest_trucks_endpoint(client, db, auth_headers, test_fuel_truck):
+    created = client.post('/api/ramp-spots', headers=auth_headers['admin'], json={'code': 'N7', 'x': 100, 'y': 100})
+    assert created.status_code == 201
+    spot_id = created.get_json()['ramp_spot']['id']
+
+    moved = client.put(f'/api/fuel-trucks/{test_fuel_truck.id}/position', headers=auth_headers['admin'],
+                       json={'x': 130, 'y': 140})
+    assert moved.status_code == 200
+
+    response = client.get(f'/api/ramp-spots/{spot_id}/nearest-trucks?fuel_type=Jet-A', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    trucks = response.get_json()['trucks']
+    assert trucks[0]['id'] == test_fuel_truck.id
+    assert trucks[0]['distance'] == 50.0
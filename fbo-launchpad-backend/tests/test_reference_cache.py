@@ -0,0 +1,98 @@
+"""Tests for the serialized reference list cache."""
+
+import time
+
+from flask import Flask
+from src.utils.invalidation import ALL_ENTITIES, InvalidationEvent
+from src.utils.reference_cache import ReferenceListCache
+
+
+def _event(entity):
+    return InvalidationEvent(entity, None, 'other-worker', 1, time.time(), True)
+
+
+def _list_app(cache, rows):
+    app = Flask(__name__)
+    builds = []
+
+    @app.route('/trucks')
+    def trucks():
+        def build():
+            builds.append(1)
+            if rows is None:
+                return {'error': 'database unavailable'}, 500
+            return {'message': 'ok', 'fuel_trucks': list(rows)}, 200
+        return cache.response('fuel_truck', None, build)
+
+    return app, builds
+
+
+def test_serves_stored_body_until_the_table_changes():
+    cache = ReferenceListCache()
+    rows = [{'id': 1, 'truck_number': 'FT001'}]
+    app, builds = _list_app(cache, rows)
+    client = app.test_client()
+
+    first = client.get('/trucks')
+    second = client.get('/trucks')
+    assert len(builds) == 1
+    assert first.get_json() == second.get_json() == {'message': 'ok', 'fuel_trucks': rows}
+    assert first.headers['ETag'] == second.headers['ETag']
+
+    rows.append({'id': 2, 'truck_number': 'FT002'})
+    cache.invalidate(_event('aircraft'))
+    assert len(client.get('/trucks').get_json()['fuel_trucks']) == 1
+
+    cache.invalidate(_event('fuel_truck'))
+    third = client.get('/trucks')
+    assert len(builds) == 2
+    assert len(third.get_json()['fuel_trucks']) == 2
+    assert third.headers['ETag'] != first.headers['ETag']
+
+    cache.invalidate(_event(ALL_ENTITIES))
+    client.get('/trucks')
+    assert len(builds) == 3
+
+
+def test_if_none_match_gets_304():
+    cache = ReferenceListCache()
+    app, _ = _list_app(cache, [{'id': 1}])
+    client = app.test_client()
+
+    etag = client.get('/trucks').headers['ETag']
+    assert client.get('/trucks', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/trucks', headers={'If-None-Match': f'W/{etag}'}).status_code == 304
+    assert client.get('/trucks', headers={'If-None-Match': '"list-other"'}).status_code == 200
+
+
+def test_errors_and_lists_built_during_a_change_are_not_stored():
+    cache = ReferenceListCache()
+    app, builds = _list_app(cache, None)
+    client = app.test_client()
+
+    assert client.get('/trucks').status_code == 500
+    assert client.get('/trucks').status_code == 500
+    assert len(builds) == 2
+
+    builds = []
+
+    def racing_build():
+        builds.append(1)
+        # Another request commits a role change while this list is being built
+        cache.invalidate(_event('role'))
+        return {'roles': []}, 200
+
+    with app.test_request_context('/'):
+        cache.response('role', None, racing_build)
+        cache.response('role', None, racing_build)
+    assert len(builds) == 2
+
+
+def test_oldest_variants_are_dropped_when_full():
+    cache = ReferenceListCache()
+    cache.max_entries = 2
+    app = Flask(__name__)
+    with app.test_request_context('/'):
+        for variant in ('a', 'b', 'c'):
+            cache.response('customer', variant, lambda: ({'customers': []}, 200))
+    assert [key[1] for key in cache._entries] == ['b', 'c']
@@ -0,0 +1,69 @@
+"""Startup benchmark: import time of the app module and create_app time.
+
+Both run in a fresh interpreter, since this process has everything imported
+already. Run with ``pytest -s tests/test_startup.py`` to see the numbers;
+the budgets (seconds) can be tightened with STARTUP_IMPORT_BUDGET and
+STARTUP_CREATE_APP_BUDGET.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET = float(os.getenv('STARTUP_IMPORT_BUDGET', '5'))
+CREATE_APP_BUDGET = float(os.getenv('STARTUP_CREATE_APP_BUDGET', '2'))
+
+
+def _run(*args):
+    env = dict(os.environ, FLASK_ENV='testing', SQLALCHEMY_DATABASE_URI='sqlite://', PYTHONPATH=BACKEND_DIR)
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env=env, check=True,
+                          capture_output=True, text=True)
+
+
+def test_import_time():
+    stderr = _run('-X', 'importtime', '-c', 'import src.app').stderr
+    # "import time: self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+            _, total, name = line.split('|')
+            cumulative[name.strip()] = int(total) / 1e6
+    slowest = sorted(((t, n) for n, t in cumulative.items() if n.startswith('src')), reverse=True)[:10]
+    print('\nimport src.app: %.3fs; slowest src modules: %s' % (
+        cumulative['src.app'], ', '.join(f'{n} {t:.3f}s' for t, n in slowest)))
+    assert cumulative['src.app'] < IMPORT_BUDGET
+
+
+def test_create_app_time_and_lazy_spec():
+    script = textwrap.dedent("""
+        import json, time
+        from src.app import create_app
+        started = time.perf_counter()
+        app = create_app('testing')
+        create_app_seconds = time.perf_counter() - started
+        client = app.test_client()
+        started = time.perf_counter()
+        first = client.get('/api/swagger.json')
+        spec_seconds = time.perf_counter() - started
+        again = client.get('/api/swagger.json', headers={'If-None-Match': first.headers['ETag']})
+        print(json.dumps({
+            'create_app': create_app_seconds,
+            'first_spec': spec_seconds,
+            'status': first.status_code,
+            'paths': len(first.get_json()['paths']),
+            'revalidated': again.status_code,
+            'second_app_etag': create_app('testing').test_client().get('/api/swagger.json').headers['ETag'],
+            'etag': first.headers['ETag'],
+        }))
+    """)
+    result = json.loads(_run('-c', script).stdout.strip().splitlines()[-1])
+    print(f"\ncreate_app: {result['create_app']:.3f}s; first /api/swagger.json: {result['first_spec']:.3f}s")
+    assert result['create_app'] < CREATE_APP_BUDGET
+    assert result['status'] == 200 and result['paths'] > 0
+    assert result['revalidated'] == 304
+    # The document is deterministic, so every worker hands out the same ETag
+    assert result['second_app_etag'] == result['etag']
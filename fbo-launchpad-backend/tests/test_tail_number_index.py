@@ -0,0 +1,63 @@
+"""Tests for the in-memory tail number typeahead index."""
+
+import time
+from types import SimpleNamespace
+
+from flask import json
+from src.utils.tail_number_index import TailNumberIndex
+
+
+def _row(tail, aircraft_type='C172', fuel_type='100LL'):
+    return SimpleNamespace(tail_number=tail, aircraft_type=aircraft_type, fuel_type=fuel_type)
+
+
+def _index(*tails):
+    index = TailNumberIndex()
+    index.load([_row(t) for t in tails])
+    return index
+
+
+def test_suggest_prefix_sorted_and_case_insensitive():
+    index = _index('N456CD', 'N123AB', 'N12XY', 'G-ABCD')
+    assert [a['tail_number'] for a in index.suggest('n12')] == ['N123AB', 'N12XY']
+    assert index.suggest('zz') == []
+
+
+def test_suggest_limit():
+    index = _index(*[f'N{i:03d}' for i in range(100)])
+    assert len(index.suggest('N', limit=5)) == 5
+    assert [a['tail_number'] for a in index.suggest('N00', limit=3)] == ['N000', 'N001', 'N002']
+
+
+def test_upsert_and_remove():
+    index = _index('N123AB')
+    index.upsert('N123AA', 'B737', 'Jet A')
+    index.upsert('N123AB', 'PA28', '100LL')
+    assert index.suggest('N123') == [
+        {'tail_number': 'N123AA', 'aircraft_type': 'B737', 'fuel_type': 'Jet A'},
+        {'tail_number': 'N123AB', 'aircraft_type': 'PA28', 'fuel_type': '100LL'},
+    ]
+    index.remove('n123aa')
+    index.remove('N999')
+    assert [a['tail_number'] for a in index.suggest('N123')] == ['N123AB']
+    assert len(index) == 1
+
+
+def test_suggest_is_fast_on_large_fleet():
+    index = _index(*[f'N{i:05d}' for i in range(50000)])
+    start = time.perf_counter()
+    for i in range(1000):
+        index.suggest(f'N{i % 100:02d}', limit=10)
+    per_lookup = (time.perf_counter() - start) / 1000
+    assert per_lookup < 0.001
+
+
+def test_suggest_endpoint(client, auth_headers):
+    """GET /api/aircraft/suggest returns matching tail numbers."""
+    response = client.get('/api/aircraft/suggest?prefix=N', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    for aircraft in json.loads(response.data)['aircraft']:
+        assert aircraft['tail_number'].upper().startswith('N')
+
+    response = client.get('/api/aircraft/suggest', headers=auth_headers['admin'])
+    assert response.status_code == 400
@@ -0,0 +1,92 @@
+"""Tests for the paginated user list (GET /api/users) and its query count."""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from src.models import Role, User
+from src.services.user_service import UserService
+from src.utils.pagination import decode_cursor, encode_cursor
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture(scope='module')
+def many_users(app, db, test_roles):
+    roles = Role.query.all()
+    users = []
+    for i in range(30):
+        user = User(username=f'listing{i:02d}', email=f'listing{i:02d}@example.com', is_active=True)
+        user.set_password('password')
+        user.roles.extend(roles[:1 + i % len(roles)])
+        users.append(user)
+    db.session.add_all(users)
+    db.session.commit()
+    return users
+
+
+def test_roles_are_loaded_in_one_batched_query(db, many_users):
+    db.session.expire_all()
+    with count_queries(db.engine) as small:
+        page, _, _ = UserService.get_users({'q': 'listing', 'limit': 5})
+        [[role.name for role in user.role_list] for user in page['users']]
+    db.session.expire_all()
+    with count_queries(db.engine) as large:
+        page, _, _ = UserService.get_users({'q': 'listing', 'limit': 30})
+        roles = [[role.name for role in user.role_list] for user in page['users']]
+
+    assert len(page['users']) == 30
+    assert all(roles)
+    # One query for the users and one for the roles of the whole page
+    assert len(small) == len(large) == 2
+
+
+def test_cursor_pagination_walks_every_user_once(db, many_users):
+    seen, cursor = [], None
+    while True:
+        page, _, status = UserService.get_users({'q': 'listing', 'limit': 7, 'cursor': cursor})
+        assert status == 200
+        seen += [user.username for user in page['users']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert seen == sorted(user.username for user in many_users)
+
+
+def test_prefix_search_is_case_insensitive_and_escaped(db, many_users):
+    page, _, _ = UserService.get_users({'q': 'LISTING1'})
+    assert [user.username for user in page['users']] == [f'listing1{i}' for i in range(10)]
+    page, _, _ = UserService.get_users({'q': 'listing05@'})
+    assert [user.username for user in page['users']] == ['listing05']
+    page, _, _ = UserService.get_users({'q': 'listing_'})
+    assert page['users'] == []
+
+
+def test_invalid_cursor_and_limit(db):
+    assert UserService.get_users({'cursor': 'not-a-cursor'})[2] == 400
+    assert UserService.get_users({'limit': 'ten'})[2] == 400
+    assert decode_cursor(encode_cursor(['a b', 3]), 2) == ['a b', 3]
+
+
+def test_user_list_endpoint_returns_next_cursor(client, auth_headers, many_users):
+    response = client.get('/api/users?q=listing&limit=10', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data['users']) == 10
+    assert data['next_cursor']
+    assert data['users'][0]['roles']
+
+    response = client.get(f"/api/users?q=listing&limit=10&cursor={data['next_cursor']}", headers=auth_headers['admin'])
+    assert response.get_json()['users'][0]['name'] == 'listing10'